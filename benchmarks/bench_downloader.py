@@ -0,0 +1,93 @@
+"""
+Throughput of utils.downloader.download_file against a local HTTP server that throttles every connection.
+
+The server simulates a slow podcast CDN: each connection is limited to `--per-connection-mbps`.
+It can also ignore Range requests (`--no-ranges`) or drop every connection after
+`--drop-after-mb`, which exercises the fallback and the resume paths.
+
+Usage:
+    python benchmarks/bench_downloader.py --size-mb 64 --per-connection-mbps 80 --segments 1 4 8
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+import http.server
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils.downloader as downloader
+
+
+def make_handler(payload: bytes, bytes_per_second: float, ranges: bool, drop_after: int):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            start, end = 0, len(payload) - 1
+            range_header = self.headers.get("Range")
+            if ranges and range_header and range_header.startswith("bytes="):
+                first, _, last = range_header[6:].partition("-")
+                start, end = int(first), min(int(last) if last else end, end)
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+            else:
+                self.send_response(200)
+            if ranges:
+                self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", '"bench"')
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+
+            sent, started, block = 0, time.perf_counter(), 64 * 1024
+            try:
+                for offset in range(start, end + 1, block):
+                    if drop_after and sent >= drop_after:
+                        self.close_connection = True
+                        return
+                    chunk = payload[offset:min(offset + block, end + 1)]
+                    self.wfile.write(chunk)
+                    sent += len(chunk)
+                    ahead = sent / bytes_per_second - (time.perf_counter() - started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=float, default=64)
+    parser.add_argument("--per-connection-mbps", type=float, default=80)
+    parser.add_argument("--segments", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--no-ranges", action="store_true")
+    parser.add_argument("--drop-after-mb", type=float, default=0)
+    args = parser.parse_args()
+
+    payload = os.urandom(int(args.size_mb * 1024 * 1024))
+    handler = make_handler(payload, args.per_connection_mbps * 1e6 / 8, not args.no_ranges, int(args.drop_after_mb * 1024 * 1024))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/episode.mp3"
+
+    downloader.DOWNLOAD_MIN_SEGMENT_MB = 1
+    output_dir = tempfile.mkdtemp()
+    for segments in args.segments:
+        downloader.DOWNLOAD_SEGMENTS = segments
+        target = os.path.join(output_dir, f"episode_{segments}.mp3")
+        result = downloader.download_file(url, target)
+        with open(target, "rb") as f:
+            intact = f.read() == payload
+        print(f"segments={segments}: {result.seconds:.2f}s, {result.throughput_mbps:.1f} Mbit/s, intact={intact}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Login throughput and latency with bcrypt on the dedicated hashing pool vs. inline in sync handlers.
+
+The inline mode reproduces the previous /auth/login (sync handler calling bcrypt.checkpw on the shared
+threadpool). `--busy` long-running sync requests occupy shared threadpool slots meanwhile, like
+summarizations in progress.
+
+Usage:
+    python benchmarks/bench_login.py --requests 200 --concurrency 32 --rounds 10 --busy 30
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost (BCRYPT_ROUNDS)")
+    parser.add_argument("--workers", type=int, default=2, help="PASSWORD_HASH_WORKERS")
+    parser.add_argument("--busy", type=int, default=0, help="concurrent long-running sync requests")
+    parser.add_argument("--busy-seconds", type=float, default=2.0)
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+os.environ["PASSWORD_HASH_QUEUE_LIMIT"] = str(max(64, args.concurrency))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_login.db")
+
+import httpx
+from fastapi import FastAPI, Depends, HTTPException
+from sqlalchemy.orm import Session
+from database import init_db, SessionLocal, get_db, dispose_async_engine
+from models.user import UserLogin
+from schemas.schema import User
+from routers.auth import auth_router
+from service.auth_service import get_password_hash, verify_password, create_access_token, get_password_hash_stats
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(auth_router)
+
+    @app.post("/legacy/login")
+    def legacy_login(login_data: UserLogin, db: Session = Depends(get_db)):
+        user = db.query(User).filter(User.email == login_data.email).first()
+        if not user or not verify_password(login_data.password, user.password):
+            raise HTTPException(status_code=400, detail="Invalid credentials.")
+        return {"access_token": create_access_token(data={"userid": user.userid}), "token_type": "bearer"}
+
+    @app.get("/busy")
+    def busy():
+        time.sleep(args.busy_seconds)
+        return {}
+
+    return app
+
+
+def seed_users(count: int):
+    init_db()
+    db = SessionLocal()
+    emails = [f"bench{i}@example.com" for i in range(count)]
+    if db.query(User).filter(User.email == emails[0]).first() is None:
+        password_hash = get_password_hash("password")
+        db.add_all(User(email=email, password=password_hash) for email in emails)
+        db.commit()
+    db.close()
+    return emails
+
+
+async def run(app: FastAPI, path: str, emails):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        busy = [asyncio.create_task(client.get("/busy")) for _ in range(args.busy)]
+        await asyncio.sleep(0.05)
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies = []
+
+        async def one(i: int):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(path, json={"email": emails[i % len(emails)], "password": "password"})
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        wall = time.perf_counter() - start
+        await asyncio.gather(*busy)
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{path:<16} {args.requests / wall:8.1f} logins/s   p50 {statistics.median(latencies) * 1000:7.1f} ms   p95 {p95 * 1000:7.1f} ms")
+
+
+def main():
+    emails = seed_users(args.users)
+    app = build_app()
+    print(f"bcrypt cost {args.rounds}, {args.requests} logins, concurrency {args.concurrency}, "
+          f"{args.busy} busy request(s), {args.workers} hashing worker(s)")
+
+    async def run_all():
+        await run(app, "/legacy/login", emails)
+        await run(app, "/auth/login", emails)
+        await dispose_async_engine()
+
+    asyncio.run(run_all())
+    print("hashing pool:", get_password_hash_stats())
+
+
+if __name__ == "__main__":
+    main()
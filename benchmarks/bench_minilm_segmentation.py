@@ -0,0 +1,96 @@
+"""
+Compare the per-window MiniLM segmentation with the batched, vectorized implementation.
+
+Usage:
+    python benchmarks/bench_minilm_segmentation.py --segments 1500
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentence_transformers import util
+from utils.segmentation import initialize_miniLM, get_miniLM, minilm_topic_segmentation
+
+TOPICS = [
+    ["The central bank raised interest rates again.", "Inflation is still above target.", "Mortgage costs keep climbing for families.", "Bond markets reacted to the announcement."],
+    ["The team trained at altitude before the final.", "Their striker scored twice in the second half.", "The coach praised the defensive shape.", "Fans celebrated in the city square."],
+    ["The new model uses fewer parameters.", "Training took three weeks on a small cluster.", "Benchmarks improved on long documents.", "The weights were released under an open licence."],
+]
+
+
+def legacy_minilm_topic_segmentation(segments, window_size: int = 3, threshold: float = 0.7):
+    """Previous implementation: two single-item encode calls per boundary."""
+    if len(segments) < window_size * 2:
+        return [f"[{segments[0]['start']} - {segments[-1]['end']}]: " +
+                " ".join(seg["text"].strip().replace("\n", " ") for seg in segments)]
+
+    model = get_miniLM()
+    clusters = []
+    current_cluster = [segments[0]]
+    cur_start, cur_end = segments[0]["start"], segments[0]["end"]
+
+    for i in range(1, len(segments) - window_size):
+        prev_window = " ".join(segments[j]["text"].strip().replace("\n", " ") for j in range(i - window_size, i))
+        next_window = " ".join(segments[j]["text"].strip().replace("\n", " ") for j in range(i, i + window_size))
+        emb1 = model.encode(prev_window, convert_to_tensor=True)
+        emb2 = model.encode(next_window, convert_to_tensor=True)
+        similarity = util.cos_sim(emb1, emb2).item()
+
+        if similarity < threshold:
+            formatted = f"[{cur_start} - {cur_end}]: " + " ".join(
+                seg["text"].strip().replace("\n", " ") for seg in current_cluster)
+            clusters.append(formatted)
+            cur_start = segments[i]["start"]
+            current_cluster = []
+
+        current_cluster.append(segments[i])
+        cur_end = segments[i]["end"]
+
+    current_cluster.extend(segments[-window_size:])
+    formatted = f"[{cur_start} - {segments[-1]['end']}]: " + " ".join(
+        seg["text"].strip().replace("\n", " ") for seg in current_cluster)
+    clusters.append(formatted)
+    return clusters
+
+
+def make_segments(count: int):
+    random.seed(0)
+    segments, topic, t = [], 0, 0.0
+    for i in range(count):
+        if i % 40 == 0:
+            topic = random.randrange(len(TOPICS))
+        duration = random.uniform(2, 6)
+        segments.append({"id": i, "start": round(t, 2), "end": round(t + duration, 2), "text": " " + random.choice(TOPICS[topic])})
+        t += duration
+    return segments
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--segments", type=int, default=1500)
+    parser.add_argument("--threshold", type=float, default=0.7)
+    args = parser.parse_args()
+
+    initialize_miniLM()
+    segments = make_segments(args.segments)
+
+    start = time.time()
+    legacy = legacy_minilm_topic_segmentation(segments, threshold=args.threshold)
+    legacy_time = time.time() - start
+
+    start = time.time()
+    vectorized = minilm_topic_segmentation(segments, threshold=args.threshold)
+    vectorized_time = time.time() - start
+
+    print(f"segments:   {len(segments)}")
+    print(f"legacy:     {legacy_time:8.2f}s  clusters {len(legacy)}")
+    print(f"vectorized: {vectorized_time:8.2f}s  clusters {len(vectorized)}")
+    print(f"speedup:    {legacy_time / vectorized_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
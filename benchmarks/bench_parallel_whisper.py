@@ -0,0 +1,46 @@
+"""
+Compare single-process Whisper transcription with the parallel chunked path.
+
+Usage:
+    python benchmarks/bench_parallel_whisper.py path/to/episode.mp3 --model tiny --workers 4
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import whisper
+from utils.parallel_whisper import parallel_transcribe, shutdown_parallel_workers, SAMPLE_RATE
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("audio_path")
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--chunk-seconds", type=float, default=300)
+    args = parser.parse_args()
+
+    duration = len(whisper.load_audio(args.audio_path)) / SAMPLE_RATE
+    print(f"Audio duration: {duration:.1f}s, model: {args.model}, workers: {args.workers}")
+
+    model = whisper.load_model(args.model, device="cpu")
+    start = time.time()
+    serial = model.transcribe(args.audio_path, fp16=False)
+    serial_time = time.time() - start
+    del model
+
+    # First call pays for the worker model loads; time the second one
+    parallel_transcribe(args.audio_path, args.model, args.workers, chunk_seconds=args.chunk_seconds)
+    _, segments, parallel_time = parallel_transcribe(args.audio_path, args.model, args.workers, chunk_seconds=args.chunk_seconds)
+    shutdown_parallel_workers()
+
+    print(f"serial:   {serial_time:8.2f}s  RTF {serial_time / duration:.3f}  segments {len(serial['segments'])}")
+    print(f"parallel: {parallel_time:8.2f}s  RTF {parallel_time / duration:.3f}  segments {len(segments)}")
+    print(f"speedup:  {serial_time / parallel_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Insert throughput of save_podcast_summarization vs. the previous save_audio_info + save_summarization_heading.
+
+Each podcast is saved with `--sections` heading sections into a fresh SQLite database.
+
+Usage:
+    python benchmarks/bench_save_summarization.py --podcasts 500 --sections 12
+"""
+import os
+import sys
+import time
+import uuid
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_save.db")
+
+from database import init_db, SessionLocal
+from models.podcast import HeadingSection, TargetLanguage
+from schemas.schema import User, PodcastSchema, HeadingSectionSchema
+from service.persistence_service import save_podcast_summarization
+
+
+def legacy_save(db, userid, headings, overall):
+    """Previous implementation: commit + refresh for the podcast, one db.add per section, second commit."""
+    new_podcast = PodcastSchema(
+        title="Benchmark episode",
+        userid=userid,
+        thumbnail_url="https://example.com/thumb.jpg",
+        target_language=TargetLanguage.EN.value,
+        audio_path="uploads/bench.mp3",
+        duration=0,
+        summarized_content=overall,
+        podcast_url="https://example.com/feed.xml",
+        podcast_type="rss"
+    )
+    db.add(new_podcast)
+    db.commit()
+    db.refresh(new_podcast)
+
+    for section in headings:
+        db.add(HeadingSectionSchema(
+            id=str(uuid.uuid4()),
+            header=section.header,
+            title=section.title,
+            content=section.content,
+            start=section.start,
+            end=section.end,
+            podcast_id=new_podcast.id
+        ))
+    db.commit()
+
+
+def bulk_save(db, userid, headings, overall):
+    save_podcast_summarization(
+        db,
+        userid=userid,
+        podcast_type="rss",
+        podcast_url="https://example.com/feed.xml",
+        audio_path="uploads/bench.mp3",
+        title="Benchmark episode",
+        thumbnail_url="https://example.com/thumb.jpg",
+        target_language=TargetLanguage.EN,
+        overall_summarization=overall,
+        headings=headings,
+        duration=headings[-1].end
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--podcasts", type=int, default=500)
+    parser.add_argument("--sections", type=int, default=12)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    user = User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com", password="x")
+    db.add(user)
+    db.commit()
+
+    headings = [
+        HeadingSection(
+            header=f"Heading {i + 1}",
+            title=f"Topic {i + 1}",
+            start=i * 120.0,
+            end=(i + 1) * 120.0,
+            content="A few sentences summarizing this part of the episode. " * 6
+        )
+        for i in range(args.sections)
+    ]
+    overall = "Overall summary of the whole episode. " * 20
+
+    print(f"{args.podcasts} podcasts x {args.sections} sections")
+    for name, save in (("legacy", legacy_save), ("bulk", bulk_save)):
+        start = time.perf_counter()
+        for _ in range(args.podcasts):
+            save(db, user.userid, headings, overall)
+        elapsed = time.perf_counter() - start
+        rows = args.podcasts * (args.sections + 1)
+        print(f"{name:<7} {elapsed:7.2f}s   {args.podcasts / elapsed:8.1f} podcasts/s   {rows / elapsed:9.1f} rows/s")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
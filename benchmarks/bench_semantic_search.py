@@ -0,0 +1,56 @@
+"""
+Query latency of MemmapVectorIndex.search for a user's subset of a large embedding matrix.
+
+Fills a temporary matrix with `--rows` random normalized vectors, then scores a query against
+subsets of different sizes (the rows one user owns) and reports the median and p95 latency.
+
+Usage:
+    python benchmarks/bench_semantic_search.py --rows 100000 --dim 384 --queries 50
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.vector_index import MemmapVectorIndex
+
+
+def random_unit_vectors(rng, count, dim):
+    vectors = rng.standard_normal((count, dim), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    index = MemmapVectorIndex(os.path.join(tempfile.mkdtemp(), "bench.f32"), args.dim)
+    for start in range(0, args.rows, 10000):
+        index.append(random_unit_vectors(rng, min(10000, args.rows - start), args.dim))
+    print(f"Matrix: {len(index)} rows x {args.dim} ({len(index) * index.row_bytes / 1e6:.1f} MB)")
+
+    queries = random_unit_vectors(rng, args.queries, args.dim)
+    for subset in (100, 1000, 10000, args.rows):
+        if subset > args.rows:
+            continue
+        rows = np.sort(rng.choice(args.rows, size=subset, replace=False))
+        index.search(queries[0], rows, args.k)  # warm the page cache
+        latencies = []
+        for query in queries:
+            started = time.perf_counter()
+            index.search(query, rows, args.k)
+            latencies.append((time.perf_counter() - started) * 1000)
+        print(f"{subset:>8} rows: median {np.median(latencies):.2f} ms, p95 {np.percentile(latencies, 95):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
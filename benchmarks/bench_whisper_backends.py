@@ -0,0 +1,76 @@
+"""
+Real-time factor and memory of every transcription backend and model size on one audio file.
+
+Each (backend, model) pair runs in a fresh process so its memory is measured on its own:
+RSS after loading the model and peak RSS during transcription. RTF is transcription time
+divided by audio duration (lower is faster; 1.0 is real time).
+
+Usage:
+    python benchmarks/bench_whisper_backends.py path/to/episode.mp3 --models tiny base small --backends openai-whisper faster-whisper
+"""
+import os
+import sys
+import time
+import argparse
+import resource
+import multiprocessing
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.whisper import WHISPER_BACKENDS
+
+
+def run(audio_path: str, backend: str, model_name: str, threads: int, results) -> None:
+    import whisper
+    from utils.whisper import load_transcription_model, _resident_bytes
+    from utils.parallel_whisper import SAMPLE_RATE
+
+    audio = whisper.load_audio(audio_path)
+    start = time.time()
+    model = load_transcription_model(model_name, backend=backend, device="cpu", cpu_threads=threads)
+    load_time = time.time() - start
+    loaded_rss = _resident_bytes()
+
+    start = time.time()
+    result = model.transcribe(audio, fp16=False)
+    transcribe_time = time.time() - start
+    results.put({
+        "duration": len(audio) / SAMPLE_RATE,
+        "load_time": load_time,
+        "transcribe_time": transcribe_time,
+        "loaded_rss_mb": loaded_rss / 2**20,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "segments": len(result["segments"]),
+        "words": len(result["text"].split()),
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("audio_path")
+    parser.add_argument("--models", nargs="+", default=["tiny", "base", "small"])
+    parser.add_argument("--backends", nargs="+", default=list(WHISPER_BACKENDS), choices=WHISPER_BACKENDS)
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'backend':<16}{'model':<10}{'load s':>8}{'RTF':>8}{'RSS MB':>9}{'peak MB':>9}{'segments':>10}{'words':>8}")
+    for model_name in args.models:
+        for backend in args.backends:
+            results = context.Queue()
+            process = context.Process(target=run, args=(args.audio_path, backend, model_name, args.threads, results))
+            process.start()
+            process.join()
+            if process.exitcode != 0 or results.empty():
+                print(f"{backend:<16}{model_name:<10} failed (exit code {process.exitcode})")
+                continue
+            r = results.get()
+            print(
+                f"{backend:<16}{model_name:<10}{r['load_time']:>8.1f}{r['transcribe_time'] / r['duration']:>8.3f}"
+                f"{r['loaded_rss_mb']:>9.0f}{r['peak_rss_mb']:>9.0f}{r['segments']:>10}{r['words']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Bytes, wall time and file size of one YouTube episode downloaded in each YOUTUBE_AUDIO_MODE.
+
+Needs network access and ffmpeg. `mp3` is the previous behaviour (bestaudio + 192 kbps MP3 encode).
+
+Usage:
+    python benchmarks/bench_youtube_audio.py --url https://www.youtube.com/watch?v=... --modes native pcm16k mp3
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yt_dlp import YoutubeDL
+from utils.youtube import youtube_download_options, AUDIO_MODES
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--modes", nargs="+", default=list(AUDIO_MODES), choices=AUDIO_MODES)
+    args = parser.parse_args()
+
+    output_path = tempfile.mkdtemp()
+    for mode in args.modes:
+        downloaded = {"bytes": 0}
+
+        def on_progress(d):
+            if d.get('status') == 'finished':
+                downloaded["bytes"] += d.get('total_bytes') or d.get('downloaded_bytes') or 0
+
+        ydl_opts = youtube_download_options(os.path.join(output_path, f"{mode}.%(ext)s"), mode)
+        ydl_opts['progress_hooks'] = [on_progress]
+        ydl_opts['ignoreerrors'] = False
+
+        started = time.perf_counter()
+        with YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(args.url, download=True)
+        elapsed = time.perf_counter() - started
+
+        file_path = info['requested_downloads'][0]['filepath']
+        print(
+            f"{mode:>7}: format {info.get('format_id')} ({info.get('abr') or '?'} kbps), "
+            f"downloaded {downloaded['bytes'] / 1e6:.2f} MB, stored {os.path.getsize(file_path) / 1e6:.2f} MB "
+            f"as {os.path.splitext(file_path)[1]}, {elapsed:.1f}s total"
+        )
+
+
+if __name__ == "__main__":
+    main()
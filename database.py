@@ -1,15 +1,82 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL)
+# Optional override; by default derived from DATABASE_URL (sqlite -> aiosqlite, postgresql -> asyncpg)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def _is_sqlite(url) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _engine_options(url) -> dict:
+    if _is_sqlite(url) and make_url(url).database in (None, "", ":memory:"):
+        # In-memory SQLite uses a single-connection pool that takes no sizing options
+        return {}
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if _is_sqlite(url):
+        # Sessions are used from worker threads (jobs, streaming responses)
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
+
+def _configure_sqlite(engine) -> None:
+    """WAL lets readers run while a summary is being written; busy_timeout makes writers wait instead of failing."""
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+
+def _async_url(url: str):
+    parsed = make_url(url)
+    if parsed.drivername in ASYNC_DRIVERS.values():
+        return parsed
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise RuntimeError(f"No async driver configured for {parsed.get_backend_name()}; set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=driver)
+
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
+if _is_sqlite(DATABASE_URL):
+    _configure_sqlite(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The async engine is created on first use, so deployments without aiosqlite/asyncpg keep working
+_async_engine = None
+_async_session_factory = None
+
 Base = declarative_base()
 
 def init_db():
@@ -21,3 +88,30 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_async_engine():
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        url = ASYNC_DATABASE_URL or _async_url(DATABASE_URL)
+        options = _engine_options(url)
+        if _is_sqlite(url) and options:
+            # aiosqlite defaults to NullPool; keep connections (and their pragmas) across requests
+            options["poolclass"] = AsyncAdaptedQueuePool
+        _async_engine = create_async_engine(url, **options)
+        if _is_sqlite(url):
+            _configure_sqlite(_async_engine.sync_engine)
+        _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False, autoflush=False)
+    return _async_engine
+
+def AsyncSessionLocal() -> AsyncSession:
+    get_async_engine()
+    return _async_session_factory()
+
+async def get_async_db():
+    """Async counterpart of get_db, for endpoints that should not occupy a threadpool thread."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def dispose_async_engine():
+    if _async_engine is not None:
+        await _async_engine.dispose()
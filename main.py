@@ -4,8 +4,14 @@ from contextlib import asynccontextmanager
 from routers.auth import auth_router
 from routers.podcast import podcast_router
 from routers.user import user_router
-from database import init_db
-from utils.whisper import initialize_whisper_model
+from routers.metrics import metrics_router
+from database import init_db, dispose_async_engine, engine
+from service.search_service import init_search_index
+from utils.whisper import initialize_whisper_model, DEFAULT_WHISPER_MODEL
+from service.job_service import shutdown_job_workers
+from utils.parallel_whisper import shutdown_parallel_workers
+from service.auth_service import shutdown_password_hash_workers
+from service.storage_service import start_storage_sweeper, shutdown_storage_sweeper
 import signal
 import sys
 import os
@@ -25,13 +31,20 @@ signal.signal(signal.SIGINT, signal_handler)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    init_search_index(engine)
     try:
-        initialize_whisper_model(model_name="tiny")
+        initialize_whisper_model(model_name=DEFAULT_WHISPER_MODEL)
         # initialize_whisper_model(model_name="turbo")
     except Exception as e:
         print(f"Failed to initialize Whisper model: {e}")
+    start_storage_sweeper()
     
     yield
+    shutdown_storage_sweeper()
+    shutdown_job_workers()
+    shutdown_parallel_workers()
+    shutdown_password_hash_workers()
+    await dispose_async_engine()
 
 app = FastAPI(lifespan=lifespan)
 app.add_middleware(
@@ -40,11 +53,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  
     allow_headers=["*"],  
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 app.include_router(auth_router)
 app.include_router(podcast_router)
 app.include_router(user_router)
+app.include_router(metrics_router)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,37 @@
+"""Create transcript cache table
+
+Revision ID: 3c1d9a7e5b21
+Revises: f0b7204e2572
+Create Date: 2026-10-18 09:12:40.512093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3c1d9a7e5b21'
+down_revision = 'f0b7204e2572'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('transcript_cache',
+        sa.Column('source_key', sa.String(length=512), primary_key=True, nullable=False),
+        sa.Column('source_url', sa.Text(), nullable=False),
+        sa.Column('podcast_type', sa.String(length=10), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('thumbnail_url', sa.String(length=255), nullable=True),
+        sa.Column('audio_path', sa.String(length=255), nullable=False),
+        sa.Column('transcript', sa.Text(), nullable=False),
+        sa.Column('segments', sa.Text(), nullable=False),
+        sa.Column('duration', sa.Float(), nullable=True),
+        sa.Column('transcribe_time', sa.Float(), nullable=True),
+        sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('last_accessed_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False)
+    )
+    op.create_index(op.f('ix_transcript_cache_last_accessed_at'), 'transcript_cache', ['last_accessed_at'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_transcript_cache_last_accessed_at'), table_name='transcript_cache')
+    op.drop_table('transcript_cache')
@@ -0,0 +1,67 @@
+"""Create summary full-text search index
+
+Revision ID: 5d9c3b8e7f42
+Revises: 8b4e2f6a1d37
+Create Date: 2026-10-18 14:21:37.902115
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5d9c3b8e7f42'
+down_revision = '8b4e2f6a1d37'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE summary_search USING fts5(
+                owner, kind UNINDEXED, podcast_id UNINDEXED, section_id UNINDEXED, header UNINDEXED,
+                start_time UNINDEXED, end_time UNINDEXED, title, content,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+        """)
+        owner = "'u' || replace(p.userid, '-', '')"
+    elif dialect == 'postgresql':
+        op.execute("""
+            CREATE TABLE summary_search (
+                id BIGSERIAL PRIMARY KEY,
+                owner VARCHAR(36) NOT NULL,
+                kind VARCHAR(10) NOT NULL,
+                podcast_id VARCHAR(36) NOT NULL REFERENCES podcasts(id) ON DELETE CASCADE,
+                section_id VARCHAR(36),
+                header VARCHAR(255),
+                start_time DOUBLE PRECISION,
+                end_time DOUBLE PRECISION,
+                title TEXT,
+                content TEXT,
+                document tsvector GENERATED ALWAYS AS (
+                    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+                ) STORED
+            )
+        """)
+        op.execute("CREATE INDEX ix_summary_search_document ON summary_search USING GIN (document)")
+        op.execute("CREATE INDEX ix_summary_search_owner ON summary_search (owner)")
+        owner = "p.userid"
+    else:
+        return
+
+    # Index the summaries saved before this revision
+    op.execute(f"""
+        INSERT INTO summary_search (owner, kind, podcast_id, section_id, header, start_time, end_time, title, content)
+        SELECT {owner}, 'summary', p.id, NULL, NULL, NULL, NULL, p.title, coalesce(p.summarized_content, '')
+        FROM podcasts p
+    """)
+    op.execute(f"""
+        INSERT INTO summary_search (owner, kind, podcast_id, section_id, header, start_time, end_time, title, content)
+        SELECT {owner}, 'section', h.podcast_id, h.id, h.header, h.start, h."end", h.title, h.content
+        FROM heading_section h JOIN podcasts p ON p.id = h.podcast_id
+    """)
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name in ('sqlite', 'postgresql'):
+        op.execute("DROP TABLE IF EXISTS summary_search")
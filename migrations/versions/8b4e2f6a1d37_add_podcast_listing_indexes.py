@@ -0,0 +1,23 @@
+"""Add podcast listing indexes
+
+Revision ID: 8b4e2f6a1d37
+Revises: 3c1d9a7e5b21
+Create Date: 2026-10-18 14:02:11.384205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '8b4e2f6a1d37'
+down_revision = '3c1d9a7e5b21'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index('ix_podcasts_userid_created_at', 'podcasts', ['userid', 'created_at', 'id'], unique=False)
+    op.create_index('ix_heading_section_podcast_id', 'heading_section', ['podcast_id'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index('ix_heading_section_podcast_id', table_name='heading_section')
+    op.drop_index('ix_podcasts_userid_created_at', table_name='podcasts')
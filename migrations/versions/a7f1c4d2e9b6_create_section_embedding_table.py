@@ -0,0 +1,31 @@
+"""Create section embedding table
+
+Revision ID: a7f1c4d2e9b6
+Revises: 5d9c3b8e7f42
+Create Date: 2026-10-18 14:40:05.117630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a7f1c4d2e9b6'
+down_revision = '5d9c3b8e7f42'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('section_embedding',
+        sa.Column('row_index', sa.Integer(), primary_key=True, autoincrement=False, nullable=False),
+        sa.Column('model', sa.String(length=100), primary_key=True, nullable=False),
+        sa.Column('section_id', sa.String(length=36), sa.ForeignKey('heading_section.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('podcast_id', sa.String(length=36), nullable=False),
+        sa.Column('userid', sa.String(length=36), nullable=False)
+    )
+    op.create_index(op.f('ix_section_embedding_section_id'), 'section_embedding', ['section_id'], unique=False)
+    op.create_index('ix_section_embedding_userid_model', 'section_embedding', ['userid', 'model', 'row_index'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index('ix_section_embedding_userid_model', table_name='section_embedding')
+    op.drop_index(op.f('ix_section_embedding_section_id'), table_name='section_embedding')
+    op.drop_table('section_embedding')
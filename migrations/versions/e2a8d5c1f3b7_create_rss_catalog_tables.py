@@ -0,0 +1,46 @@
+"""Create RSS catalog tables
+
+Revision ID: e2a8d5c1f3b7
+Revises: a7f1c4d2e9b6
+Create Date: 2026-10-18 15:12:41.508311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e2a8d5c1f3b7'
+down_revision = 'a7f1c4d2e9b6'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('rss_feed',
+        sa.Column('id', sa.String(length=36), primary_key=True, nullable=False),
+        sa.Column('feed_url', sa.String(length=1024), nullable=False, unique=True),
+        sa.Column('title', sa.String(length=255), nullable=True),
+        sa.Column('image_url', sa.String(length=1024), nullable=True),
+        sa.Column('etag', sa.String(length=255), nullable=True),
+        sa.Column('last_modified', sa.String(length=64), nullable=True),
+        sa.Column('fetched_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('checked_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False)
+    )
+    op.create_table('rss_episode',
+        sa.Column('id', sa.String(length=36), primary_key=True, nullable=False),
+        sa.Column('feed_id', sa.String(length=36), sa.ForeignKey('rss_feed.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('guid', sa.String(length=1024), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('audio_url', sa.Text(), nullable=False),
+        sa.Column('audio_type', sa.String(length=64), nullable=True),
+        sa.Column('image_url', sa.String(length=1024), nullable=True),
+        sa.Column('published_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('duration', sa.String(length=32), nullable=True),
+        sa.UniqueConstraint('feed_id', 'guid', name='uq_rss_episode_feed_id_guid')
+    )
+    op.create_index('ix_rss_episode_feed_id_published_at', 'rss_episode', ['feed_id', 'published_at'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index('ix_rss_episode_feed_id_published_at', table_name='rss_episode')
+    op.drop_table('rss_episode')
+    op.drop_table('rss_feed')
@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from enum import Enum
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 
 class TargetLanguage(Enum):
@@ -11,6 +11,8 @@ class TargetLanguage(Enum):
 class SummarizePodcastURL(BaseModel):
     URL: str
     target_language: TargetLanguage
+    # RSS only: summarize this episode instead of the newest one
+    episode_guid: Optional[str] = None
 
 class HeadingSection(BaseModel):
     header: str
@@ -20,6 +22,15 @@ class HeadingSection(BaseModel):
     content: str
 
 
+class SummaryTokenUsage(BaseModel):
+    strategy: str
+    estimated_prompt_tokens: int
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    llm_calls: int = 0
+    cached: bool = False
+
+
 class PodcastSummarizationResponse(BaseModel):
     podcast_id: str
     detail_summarization: List[HeadingSection]
@@ -27,6 +38,7 @@ class PodcastSummarizationResponse(BaseModel):
     title: str
     overall_summarization: str
     created_at: datetime
+    token_usage: Optional[SummaryTokenUsage] = None
 
 class GetAllPodcastSummarizationResponse(BaseModel):
     podcast_id: str
@@ -44,4 +56,65 @@ class GetSinglePodcastSummarizationResponse(BaseModel):
     language: str
     created_at: datetime
     podcast_url: str
-    podcast_type: str
\ No newline at end of file
+    podcast_type: str
+
+class SummarySearchResult(BaseModel):
+    podcast_id: str
+    podcast_title: str
+    kind: str
+    header: Optional[str] = None
+    title: str
+    start: Optional[float] = None
+    end: Optional[float] = None
+    snippet: str
+    score: float
+
+class SemanticSearchResult(BaseModel):
+    podcast_id: str
+    podcast_title: str
+    header: str
+    title: str
+    content: str
+    start: float
+    end: float
+    score: float
+
+class RSSEpisode(BaseModel):
+    guid: str
+    title: str
+    audio_url: str
+    image_url: Optional[str] = None
+    published_at: Optional[datetime] = None
+    duration: Optional[str] = None
+
+class RSSFeedEpisodesResponse(BaseModel):
+    feed_url: str
+    title: Optional[str] = None
+    image_url: Optional[str] = None
+    fetched_at: Optional[datetime] = None
+    checked_at: Optional[datetime] = None
+    episodes: List[RSSEpisode]
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class JobStage(Enum):
+    QUEUED = "queued"
+    DOWNLOADING = "downloading"
+    TRANSCRIBING = "transcribing"
+    SUMMARIZING = "summarizing"
+    SAVING = "saving"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class SummarizeJobResponse(BaseModel):
+    job_id: str
+    status: JobStatus
+    stage: JobStage
+    created_at: datetime
+    updated_at: datetime
+    podcast_id: Optional[str] = None
+    error: Optional[str] = None
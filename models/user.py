@@ -21,3 +21,11 @@ class UserOut(UserBase):
 
     class Config:
         from_attribute = True
+
+
+class UserPrincipal(BaseModel):
+    """Authenticated user resolved by auth_middleware; carries no blob columns."""
+    userid: str
+    email: str
+
+    model_config = {"frozen": True}
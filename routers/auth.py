@@ -1,55 +1,83 @@
 # app/routers/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.orm import defer
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.user import UserCreate, UserLogin, UserOut
 from schemas.schema import User
-from service.auth_service import get_password_hash, verify_password, create_access_token
-from database import get_db
+from service.auth_service import hash_password_async, verify_password_async, password_needs_rehash, create_access_token, PasswordHashBusyError
+from database import get_async_db
 from email_validator import validate_email, EmailNotValidError
 
 auth_router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Handlers are async: bcrypt runs on the password hashing pool and the database is
+# reached through the async engine, so logins never wait for a shared threadpool thread.
+
+async def _find_user_by_email(db: AsyncSession, email: str):
+    return (await db.execute(
+        select(User).options(defer(User.profile_picture)).where(User.email == email)
+    )).scalar_one_or_none()
+
+def _password_hash_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please retry.",
+        headers={"Retry-After": "1"}
+    )
+
 @auth_router.post("/signup", response_model=UserOut)
-def signup(user_data: UserCreate, db: Session = Depends(get_db)):
-    # Validate email format
+async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    # Validate email format (may resolve the domain, so off the event loop)
     try:
-        valid = validate_email(user_data.email)
+        valid = await run_in_threadpool(validate_email, user_data.email)
     except EmailNotValidError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid email address"
         )
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == valid.email).first()
+    existing_user = await _find_user_by_email(db, valid.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered."
         )
     # Create user
+    try:
+        password_hash = await hash_password_async(user_data.password)
+    except PasswordHashBusyError:
+        raise _password_hash_busy()
     new_user = User(
         email=valid.email,
-        password=get_password_hash(user_data.password)
+        password=password_hash
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
 @auth_router.post("/login")
-def login(login_data: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == login_data.email).first()
-    if not user or not verify_password(login_data.password, user.password):
+async def login(login_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    user = await _find_user_by_email(db, login_data.email)
+    try:
+        valid = user is not None and await verify_password_async(login_data.password, user.password)
+    except PasswordHashBusyError:
+        raise _password_hash_busy()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid credentials."
         )
+    # Upgrade the stored hash when BCRYPT_ROUNDS changed; a busy pool just skips it until the next login
+    if password_needs_rehash(user.password):
+        try:
+            user.password = await hash_password_async(login_data.password)
+            await db.commit()
+        except PasswordHashBusyError:
+            pass
     # Credentials valid, create JWT
     access_token = create_access_token(data={"userid": user.userid})
     return {"access_token": access_token, "token_type": "bearer", "userid": user.userid}
-
-
-
-
-
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from database import get_db
+from utils.dependencies import auth_middleware
+from service.transcript_cache_service import get_transcript_cache_stats
+from service.GPT_service import get_summary_cache_stats
+from service.library_service import get_summarization_response_cache_stats
+from service.principal_service import get_principal_cache_stats
+from service.auth_service import get_password_hash_stats
+from service.semantic_search_service import get_section_embedding_stats
+from service.storage_service import get_storage_stats
+from service.pipeline_service import get_coalescing_stats
+from service.feed_service import get_feed_catalog_stats
+from utils.model_registry import model_registry
+from utils.youtube import get_youtube_download_stats
+from utils.downloader import get_download_stats
+
+
+metrics_router = APIRouter(prefix="/metrics", tags=["Metrics"], dependencies=[Depends(auth_middleware)])
+
+@metrics_router.get("/transcript-cache")
+def transcript_cache_metrics(db: Session = Depends(get_db)):
+    return get_transcript_cache_stats(db)
+
+@metrics_router.get("/summary-cache")
+def summary_cache_metrics():
+    return get_summary_cache_stats()
+
+@metrics_router.get("/summarization-cache")
+def summarization_response_cache_metrics():
+    return get_summarization_response_cache_stats()
+
+@metrics_router.get("/principal-cache")
+def principal_cache_metrics():
+    return get_principal_cache_stats()
+
+@metrics_router.get("/password-hashing")
+def password_hashing_metrics():
+    return get_password_hash_stats()
+
+@metrics_router.get("/section-embeddings")
+def section_embedding_metrics():
+    return get_section_embedding_stats()
+
+@metrics_router.get("/youtube-downloads")
+def youtube_download_metrics():
+    return get_youtube_download_stats()
+
+@metrics_router.get("/storage")
+def storage_metrics(db: Session = Depends(get_db)):
+    return get_storage_stats(db)
+
+@metrics_router.get("/request-coalescing")
+def request_coalescing_metrics():
+    return get_coalescing_stats()
+
+@metrics_router.get("/rss-feeds")
+def rss_feed_metrics(db: Session = Depends(get_db)):
+    return get_feed_catalog_stats(db)
+
+@metrics_router.get("/downloads")
+def download_metrics():
+    return get_download_stats()
+
+@metrics_router.get("/models")
+def model_metrics():
+    return model_registry.stats()
@@ -1,125 +1,205 @@
-from fastapi import APIRouter, UploadFile, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, HTTPException, Depends, Query, Response, Header
+from fastapi.responses import JSONResponse, StreamingResponse
 import os
+import json
 import shutil
-from database import get_db
-from typing import List
+from database import get_db, get_async_db, SessionLocal
+from typing import List, Optional
 from sqlalchemy.orm import Session
-from models.podcast import SummarizePodcastURL, PodcastSummarizationResponse, HeadingSection, GetAllPodcastSummarizationResponse, GetSinglePodcastSummarizationResponse
-from schemas.schema import User, PodcastSchema
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.podcast import SummarizePodcastURL, PodcastSummarizationResponse, GetAllPodcastSummarizationResponse, GetSinglePodcastSummarizationResponse, SummarizeJobResponse, JobStatus, SummarySearchResult, SemanticSearchResult, RSSFeedEpisodesResponse, RSSEpisode
+from models.user import UserPrincipal
 from utils.dependencies import auth_middleware
-from sqlalchemy.orm.exc import NoResultFound
-from service.podcast_service import download_audio, transcribe_audio, save_audio_info, save_summarization_heading
-from utils.audio import create_audio_name
-from service.GPT_service import generate_heading_summary, generate_summary_map_reduce
-from utils.GPT import parse_headings_and_overall
+from service.pipeline_service import summarize_podcast, stream_summarize_podcast, PipelineStageError
+from service.job_service import submit_summarize_job, get_summarize_job
+from service.search_service import search_summaries, SearchUnavailableError
+from service.semantic_search_service import semantic_search
+from service.feed_service import list_feed_episodes
+from service.library_service import (
+    list_summarizations, InvalidCursorError, SUMMARIZATIONS_PAGE_SIZE, SUMMARIZATIONS_MAX_PAGE_SIZE,
+    read_summarization
+)
+
+# Responses are per user and must be revalidated with the ETag before reuse
+SUMMARIZATION_CACHE_CONTROL = "private, no-cache"
 
 podcast_router = APIRouter(prefix="/podcast", tags=["Podcast"], dependencies=[Depends(auth_middleware)])
 
 @podcast_router.post("/summarize", response_model=PodcastSummarizationResponse)
-def summarizeVideoLink(request_data: SummarizePodcastURL, db: Session = Depends(get_db), user: User = Depends(auth_middleware)):
-    file_name = create_audio_name(userid=user.userid)
+def summarizeVideoLink(request_data: SummarizePodcastURL, db: Session = Depends(get_db), user: UserPrincipal = Depends(auth_middleware)):
     try:
-        audio_path, thumbnail_url, title, audio_type = download_audio(request_data.URL, 'uploads/', file_name)
-    except Exception as e: 
-        raise HTTPException(status_code=500, detail=f"Failed downloading audio: {str(e)}")
-    try: 
-        transcript, segments, transcribe_time = transcribe_audio(audio_path)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed transcribing audio: {str(e)}")
-    response_text = generate_heading_summary(segments, request_data.target_language.value)
-    # response_text = generate_summary_map_reduce(segments, request_data.target_language.value)
-
-    print ("GPT Response: ", response_text)
-
-    headings, overall = parse_headings_and_overall(response_text)
-
-    podcast_shcema = save_audio_info(audio_type ,request_data.URL, audio_path, title, thumbnail_url, user.userid, request_data.target_language, db, overall)
-    save_summarization_heading(headings, podcast_shcema.id, db)
-    
-    
-    test = PodcastSummarizationResponse(
-        podcast_id= podcast_shcema.id,
-        title = title,
-        thumbnail_url = thumbnail_url,
-        detail_summarization = headings,
-        overall_summarization = overall,
-        created_at= podcast_shcema.created_at
+        return summarize_podcast(request_data, user.userid, db)
+    except PipelineStageError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@podcast_router.post("/summarize/stream")
+def summarize_video_link_stream(request_data: SummarizePodcastURL, user: UserPrincipal = Depends(auth_middleware)):
+    """
+    Same pipeline as /summarize, streamed as server-sent events (stage, heading, overall, done or error).
+    """
+    userid = user.userid
+
+    def events():
+        # The stream outlives the request dependencies, so it owns its session
+        db = SessionLocal()
+        try:
+            for event, data in stream_summarize_podcast(request_data, userid, db):
+                yield _sse_event(event, data)
+        except PipelineStageError as e:
+            yield _sse_event("error", {"stage": e.stage.value, "detail": str(e)})
+        except Exception as e:
+            yield _sse_event("error", {"stage": None, "detail": f"Summarization failed: {str(e)}"})
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
-    return test
-        
 
-@podcast_router.get("/summarizations", response_model=List[GetAllPodcastSummarizationResponse])
-def get_all_summarization(
-    db: Session = Depends(get_db),
-    user: User = Depends(auth_middleware)
-):
-    podcasts = db.query(PodcastSchema).filter(PodcastSchema.userid == user.userid).all()
-    result = []
-
-    for podcast in podcasts:
-        # Convert HeadingSectionSchema -> HeadingSection (Pydantic)
-        headings = [
-            HeadingSection(
-                header=section.header,
-                title=section.title,
-                start=section.start,
-                end=section.end,
-                content=section.content
-            )
-            for section in podcast.sections
-        ]
 
-        response_item = GetAllPodcastSummarizationResponse(
-            podcast_id=podcast.id,
-            title=podcast.title,
-            thumbnail_url=podcast.thumbnail_url,
-            created_at= podcast.created_at,
-            language=podcast.target_language
-        )
+@podcast_router.post("/summarize/jobs", response_model=SummarizeJobResponse, status_code=202)
+def submit_summarize_job_route(request_data: SummarizePodcastURL, user: UserPrincipal = Depends(auth_middleware)):
+    job = submit_summarize_job(request_data, user.userid)
+    return job.to_response()
 
-        result.append(response_item)
 
-    return result
+@podcast_router.get("/summarize/jobs/{job_id}", response_model=SummarizeJobResponse)
+def get_summarize_job_status(job_id: str, user: UserPrincipal = Depends(auth_middleware)):
+    job = get_summarize_job(job_id, user.userid)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_response()
 
 
-@podcast_router.get("/summarizations/{podcast_id}", response_model=GetSinglePodcastSummarizationResponse)
-def get_single_summarization(
-    podcast_id: str,
+@podcast_router.get("/summarize/jobs/{job_id}/result", response_model=PodcastSummarizationResponse)
+def get_summarize_job_result(job_id: str, user: UserPrincipal = Depends(auth_middleware)):
+    job = get_summarize_job(job_id, user.userid)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is not finished yet (stage: {job.stage.value})")
+    return job.result
+
+
+@podcast_router.get("/summarizations", response_model=List[GetAllPodcastSummarizationResponse])
+async def get_all_summarization(
+    response: Response,
+    limit: int = Query(SUMMARIZATIONS_PAGE_SIZE, ge=1, le=SUMMARIZATIONS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    user: UserPrincipal = Depends(auth_middleware)
+):
+    """
+    Newest summarizations first, one page at a time. Pass the `X-Next-Cursor` response header
+    back as `cursor` to get the next page; the header is absent on the last page.
+    """
+    try:
+        page, next_cursor = await list_summarizations(db, user.userid, limit, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return page
+
+
+@podcast_router.get("/search", response_model=List[SummarySearchResult])
+async def search_summarizations(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+    user: UserPrincipal = Depends(auth_middleware)
+):
+    """
+    Ranked full-text search over the user's summaries. Section hits carry their start/end
+    timestamps; `snippet` highlights the matched words with <b></b>.
+    """
+    try:
+        return await search_summaries(db, user.userid, q, limit, offset)
+    except SearchUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@podcast_router.get("/semantic-search", response_model=List[SemanticSearchResult])
+def semantic_search_sections(
+    q: str = Query(..., min_length=1, max_length=500),
+    k: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db),
-    user: User = Depends(auth_middleware)
+    user: UserPrincipal = Depends(auth_middleware)
 ):
+    """
+    The user's heading sections closest in meaning to a natural-language query.
+    """
     try:
-        podcast = db.query(PodcastSchema).filter(
-            PodcastSchema.userid == user.userid,
-            PodcastSchema.id == podcast_id
-            ).one()
-    except NoResultFound:
-        raise HTTPException(status_code=404, detail="Podcast not found")
+        return semantic_search(db, user.userid, q, k)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Semantic search failed: {str(e)}")
+
 
-    # Convert HeadingSectionSchema -> HeadingSection (Pydantic)
-    headings = [
-        HeadingSection(
-            header=section.header,
-            title=section.title,
-            start=section.start,
-            end=section.end,
-            content=section.content
-        )
-        for section in podcast.sections
-    ]
-
-    response = GetSinglePodcastSummarizationResponse(
-        podcast_id=podcast.id,
-        title=podcast.title,
-        thumbnail_url=podcast.thumbnail_url,
-        detail_summarization = headings,
-        overall_summarization = podcast.summarized_content,    
-        created_at= podcast.created_at,
-        language= podcast.target_language,
-        podcast_url=podcast.podcast_url,
-        podcast_type=podcast.podcast_type
+@podcast_router.get("/feeds/episodes", response_model=RSSFeedEpisodesResponse)
+def get_feed_episodes(
+    url: str = Query(..., min_length=1),
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    refresh: bool = False,
+    db: Session = Depends(get_db),
+    user: UserPrincipal = Depends(auth_middleware)
+):
+    """
+    Newest episodes of an RSS feed from the feed catalog. Summarize one by sending its `guid` as
+    `episode_guid` to /summarize. `refresh=true` revalidates the feed even if it was checked recently.
+    """
+    try:
+        feed, episodes = list_feed_episodes(db, url, limit, offset, refresh)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    return RSSFeedEpisodesResponse(
+        feed_url=feed.feed_url,
+        title=feed.title,
+        image_url=feed.image_url,
+        fetched_at=feed.fetched_at,
+        checked_at=feed.checked_at,
+        episodes=[
+            RSSEpisode(
+                guid=episode.guid,
+                title=episode.title,
+                audio_url=episode.audio_url,
+                image_url=episode.image_url,
+                published_at=episode.published_at,
+                duration=episode.duration
+            )
+            for episode in episodes
+        ]
     )
 
-    return response
 
+@podcast_router.get("/summarizations/{podcast_id}", response_model=GetSinglePodcastSummarizationResponse)
+async def get_single_summarization(
+    podcast_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    user: UserPrincipal = Depends(auth_middleware)
+):
+    """
+    A single summarization with a strong ETag. Send it back in `If-None-Match` to get a 304
+    without the body; the sections are not loaded in that case.
+    """
+    serialized = await read_summarization(db, user.userid, podcast_id, if_none_match)
+    if serialized is None:
+        raise HTTPException(status_code=404, detail="Podcast not found")
+
+    headers = {"ETag": serialized.etag, "Cache-Control": SUMMARIZATION_CACHE_CONTROL}
+    if not serialized.body:
+        return Response(status_code=304, headers=headers)
+    return Response(content=serialized.body, media_type="application/json", headers=headers)
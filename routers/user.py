@@ -1,17 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.user import UserOut
 from schemas.schema import User
-from database import get_db
+from database import get_async_db
 from utils.dependencies import auth_middleware
 
 
 user_router = APIRouter(prefix="/user", tags=["User"], dependencies=[Depends(auth_middleware)])
 
 @user_router.get("/{userid}", response_model=UserOut)
-def get_user(userid: str, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.userid == userid).first()
+async def get_user(userid: str, db: AsyncSession = Depends(get_async_db)):
+    user = (await db.execute(select(User).where(User.userid == userid))).scalar_one_or_none()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,9 +1,16 @@
-from sqlalchemy import Column, String, Float, ForeignKey, Text, TIMESTAMP, LargeBinary
+from sqlalchemy import Column, String, Float, ForeignKey, Text, TIMESTAMP, LargeBinary, Integer, Index, UniqueConstraint
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
 import uuid
 
+# SQLite's CURRENT_TIMESTAMP has no fractional seconds; binding datetimes in the same format keeps
+# comparisons against server-generated values (keyset pagination cursors) exact
+SQLITE_TIMESTAMP = sqlite.DATETIME(
+    storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+)
+
 class User(Base):
     __tablename__ = "users"
 
@@ -29,11 +36,15 @@ class PodcastSchema(Base):
     target_language = Column(String(50), nullable=True)
     duration = Column(Float, nullable=True)
     podcast_url = Column(Text, nullable=False)
-    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+    created_at = Column(TIMESTAMP().with_variant(SQLITE_TIMESTAMP, "sqlite"), server_default=func.now(), nullable=False)
     podcast_type = Column(String(10), nullable=False)
     user = relationship("User", back_populates="podcasts")  
     sections = relationship("HeadingSectionSchema", back_populates="podcast", cascade="all, delete-orphan", passive_deletes=True)
 
+    __table_args__ = (
+        Index("ix_podcasts_userid_created_at", "userid", "created_at", "id"),
+    )
+
 
 class HeadingSectionSchema(Base):
     __tablename__ = "heading_section"
@@ -47,3 +58,78 @@ class HeadingSectionSchema(Base):
     podcast_id = Column(String(36), ForeignKey("podcasts.id", ondelete="CASCADE"), nullable=False)
 
     podcast = relationship("PodcastSchema", back_populates="sections")
+
+    __table_args__ = (
+        Index("ix_heading_section_podcast_id", "podcast_id"),
+    )
+
+
+class TranscriptCacheSchema(Base):
+    __tablename__ = "transcript_cache"
+
+    source_key = Column(String(512), primary_key=True)
+    source_url = Column(Text, nullable=False)
+    podcast_type = Column(String(10), nullable=False)
+    title = Column(String(255), nullable=False)
+    thumbnail_url = Column(String(255), nullable=True)
+    audio_path = Column(String(255), nullable=False)
+    transcript = Column(Text, nullable=False)
+    segments = Column(Text, nullable=False)
+    duration = Column(Float, nullable=True)
+    transcribe_time = Column(Float, nullable=True)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+    last_accessed_at = Column(TIMESTAMP, server_default=func.now(), nullable=False, index=True)
+
+
+class SectionEmbeddingSchema(Base):
+    __tablename__ = "section_embedding"
+
+    # Row of the section's vector in the embedding matrix file of `model`
+    row_index = Column(Integer, primary_key=True, autoincrement=False)
+    model = Column(String(100), primary_key=True)
+    section_id = Column(String(36), ForeignKey("heading_section.id", ondelete="CASCADE"), nullable=False, index=True)
+    podcast_id = Column(String(36), nullable=False)
+    userid = Column(String(36), nullable=False)
+
+    __table_args__ = (
+        Index("ix_section_embedding_userid_model", "userid", "model", "row_index"),
+    )
+
+
+class RSSFeedSchema(Base):
+    __tablename__ = "rss_feed"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    feed_url = Column(String(1024), unique=True, nullable=False)
+    title = Column(String(255), nullable=True)
+    image_url = Column(String(1024), nullable=True)
+    # Validators of the last full response, sent back as If-None-Match / If-Modified-Since
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    fetched_at = Column(TIMESTAMP, nullable=True)
+    checked_at = Column(TIMESTAMP, nullable=True)
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+
+    episodes = relationship("RSSEpisodeSchema", back_populates="feed", cascade="all, delete-orphan", passive_deletes=True)
+
+
+class RSSEpisodeSchema(Base):
+    __tablename__ = "rss_episode"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    feed_id = Column(String(36), ForeignKey("rss_feed.id", ondelete="CASCADE"), nullable=False)
+    guid = Column(String(1024), nullable=False)
+    title = Column(String(255), nullable=False)
+    audio_url = Column(Text, nullable=False)
+    audio_type = Column(String(64), nullable=True)
+    image_url = Column(String(1024), nullable=True)
+    published_at = Column(TIMESTAMP, nullable=True)
+    duration = Column(String(32), nullable=True)
+
+    feed = relationship("RSSFeedSchema", back_populates="episodes")
+
+    __table_args__ = (
+        UniqueConstraint("feed_id", "guid", name="uq_rss_episode_feed_id_guid"),
+        Index("ix_rss_episode_feed_id_published_at", "feed_id", "published_at"),
+    )
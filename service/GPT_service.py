@@ -1,18 +1,31 @@
 from openai import OpenAI
 import os
+import hashlib
+import asyncio
 from dotenv import load_dotenv
-from typing import List, Dict
-from langchain.chains.summarize import load_summarize_chain
+from typing import List, Dict, Tuple, Optional, Iterator
 from langchain_experimental.text_splitter import SemanticChunker
 from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
-from langchain.docstore.document import Document
 from utils.formatter import format_sections
 from utils.segmentation import get_embedder
+from utils.cache import TTLCache
+from utils.tokens import count_tokens
+from models.podcast import SummaryTokenUsage
+from service.map_reduce_service import map_reduce_summarize
 
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+SUMMARY_MODEL = "gpt-4o"
+HEADING_SUMMARY_TEMPERATURE = 0.3
+MAP_REDUCE_TEMPERATURE = 0.5
+MAP_REDUCE_CONCURRENCY = int(os.getenv("MAP_REDUCE_CONCURRENCY", 4))
+MAP_REDUCE_CONTEXT_TOKENS = int(os.getenv("MAP_REDUCE_CONTEXT_TOKENS", 100000))
+
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", 256))
+SUMMARY_CACHE_TTL_SECONDS = float(os.getenv("SUMMARY_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+_summary_cache = TTLCache(maxsize=SUMMARY_CACHE_MAX_ENTRIES, ttl=SUMMARY_CACHE_TTL_SECONDS)
+
 BASE_PODCAST_SUMMARY_PROMPT = """
 You are an assistant summarizing a podcast transcript composed of segments, each with a start time, end time, and spoken text.
 
@@ -50,6 +63,8 @@ Transcript:
 {transcript}
 """
 
+HEADING_SUMMARY_SYSTEM_PROMPT = "You are a helpful assistant that summarizes podcasts into structured sections. All outputs must be written in {language} only. Never use English if {language} is not English."
+
 
 
 MAP_PROMPT ="""
@@ -95,21 +110,45 @@ Here is the transcript:
 
 """
 
-def generate_heading_summary(
-    segments: List[Dict[str, str]],
-    target_language: str = "English",
-) -> str:
-    # Format transcript
+#==========================SUMMARY CACHE==========================
+def prompt_version(*templates: str) -> str:
+    """Fingerprint of the prompt templates, so editing any prompt constant invalidates cached summaries."""
+    return hashlib.sha256("\x00".join(templates).encode("utf-8")).hexdigest()[:16]
+
+
+def summary_cache_key(kind: str, transcript: str, language: str, model: str, temperature: float, *templates: str) -> str:
+    digest = hashlib.sha256()
+    for part in (kind, transcript, language, model, repr(temperature), prompt_version(*templates)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def get_summary_cache_stats() -> Dict[str, float]:
+    return _summary_cache.stats()
+
+
+def get_cached_summary(cache_key: str) -> Optional[str]:
+    return _summary_cache.get(cache_key)
+
+
+def cache_summary(cache_key: str, summary: str) -> None:
+    _summary_cache.set(cache_key, summary)
+#=================================================================
+
+def format_heading_transcript(segments: List[Dict[str, str]]) -> str:
+    """Format segments as `[start - end]: text` lines with timestamps in seconds."""
     transcript_lines = []
     for seg in segments:
         start = seg["start"]
         end = seg["end"]
         text = seg["text"].strip().replace("\n", " ")
         transcript_lines.append(f"[{start} - {end}]: {text}")
-    transcript = "\n".join(transcript_lines)
+    return "\n".join(transcript_lines)
 
+
+def heading_summary_messages(transcript: str, target_language: str) -> List[Dict[str, str]]:
     # Compose full prompt with language
-    # full_prompt = BASE_PODCAST_SUMMARY_PROMPT.strip() + f"\n\nLanguage: {target_language}\n\nHere is the transcript:\n{transcript}"
     prompt_template = PromptTemplate(
         input_variables=["transcript", "language"],
         template=BASE_PODCAST_SUMMARY_PROMPT.strip()
@@ -119,26 +158,113 @@ def generate_heading_summary(
     transcript=transcript,
     language=target_language
 )
+    return [
+        {"role": "system", "content": HEADING_SUMMARY_SYSTEM_PROMPT.format(language=target_language)},
+        {"role": "user", "content": rendered_prompt}
+    ]
+
+
+def heading_summary_cache_key(transcript: str, target_language: str) -> str:
+    return summary_cache_key(
+        "heading", transcript, target_language, SUMMARY_MODEL, HEADING_SUMMARY_TEMPERATURE,
+        BASE_PODCAST_SUMMARY_PROMPT, HEADING_SUMMARY_SYSTEM_PROMPT
+    )
+
+
+def request_heading_summary(
+    segments: List[Dict[str, str]],
+    target_language: str = "English",
+) -> Tuple[str, SummaryTokenUsage]:
+    """
+    Single-call heading summary, returning the raw LLM text and the tokens it used.
+    """
+    transcript = format_heading_transcript(segments)
+    messages = heading_summary_messages(transcript, target_language)
+    estimated_tokens = sum(count_tokens(message["content"], SUMMARY_MODEL) for message in messages)
+
+    cache_key = heading_summary_cache_key(transcript, target_language)
+    cached = get_cached_summary(cache_key)
+    if cached is not None:
+        return cached, SummaryTokenUsage(strategy="single", estimated_prompt_tokens=estimated_tokens, cached=True)
 
     # Call chat completion API
     response = client.chat.completions.create(
-        model="gpt-4o",
-        temperature=0.3,
-        messages=[
-            {"role": "system", "content": f"You are a helpful assistant that summarizes podcasts into structured sections. All outputs must be written in {target_language} only. Never use English if {target_language} is not English."},
-            {"role": "user", "content": rendered_prompt}
-        ]
+        model=SUMMARY_MODEL,
+        temperature=HEADING_SUMMARY_TEMPERATURE,
+        messages=messages
     )
 
-    return response.choices[0].message.content.strip()
+    summary = response.choices[0].message.content.strip()
+    cache_summary(cache_key, summary)
+    usage = SummaryTokenUsage(
+        strategy="single",
+        estimated_prompt_tokens=estimated_tokens,
+        prompt_tokens=response.usage.prompt_tokens if response.usage else 0,
+        completion_tokens=response.usage.completion_tokens if response.usage else 0,
+        llm_calls=1
+    )
+    return summary, usage
+
+
+def stream_heading_summary(
+    segments: List[Dict[str, str]],
+    target_language: str,
+    usage: SummaryTokenUsage,
+) -> Iterator[str]:
+    """
+    Streaming variant of request_heading_summary: yields the LLM text as it is generated.
+
+    A cached summary is yielded in one piece. The complete text is cached once the stream ends,
+    and `usage` is filled in place with the tokens reported at the end of the stream.
+    """
+    transcript = format_heading_transcript(segments)
+    messages = heading_summary_messages(transcript, target_language)
+    usage.strategy = "single"
+    usage.estimated_prompt_tokens = sum(count_tokens(message["content"], SUMMARY_MODEL) for message in messages)
+
+    cache_key = heading_summary_cache_key(transcript, target_language)
+    cached = get_cached_summary(cache_key)
+    if cached is not None:
+        usage.cached = True
+        yield cached
+        return
+
+    stream = client.chat.completions.create(
+        model=SUMMARY_MODEL,
+        temperature=HEADING_SUMMARY_TEMPERATURE,
+        messages=messages,
+        stream=True,
+        stream_options={"include_usage": True}
+    )
+
+    parts = []
+    for chunk in stream:
+        # The last chunk carries the usage and no choices
+        if chunk.usage:
+            usage.prompt_tokens = chunk.usage.prompt_tokens
+            usage.completion_tokens = chunk.usage.completion_tokens
+        if chunk.choices and chunk.choices[0].delta.content:
+            parts.append(chunk.choices[0].delta.content)
+            yield chunk.choices[0].delta.content
+    usage.llm_calls = 1
+
+    cache_summary(cache_key, "".join(parts).strip())
+
+
+def generate_heading_summary(
+    segments: List[Dict[str, str]],
+    target_language: str = "English",
+) -> str:
+    summary, _ = request_heading_summary(segments, target_language)
+    return summary
 
 def generate_summary_map_reduce(
     segments: List[Dict[str, str]],
     target_language: str,
 ) -> str:
     """
-    Generate a summary of the podcast transcript using GPT and LangChain. 
-    Using SemanticChunker for splitting text and map-reduce for final summary.
+    Generate a summary of the podcast transcript using GPT. 
+    Using SemanticChunker for splitting text and an async map-reduce for final summary.
     
     Args:
         segments: List of segments with start, end, and text
@@ -147,19 +273,17 @@ def generate_summary_map_reduce(
     Returns:
         Generated summary text
     """
-    from utils.segmentation import initialize_embedder
-
-    initialize_embedder()
     transcript = format_sections(segments)
-    
-    llm = ChatOpenAI(
-        model_name="gpt-4o",
-        temperature=0.5,
+    cache_key = summary_cache_key(
+        "map_reduce", transcript, target_language, SUMMARY_MODEL, MAP_REDUCE_TEMPERATURE,
+        BASE_PODCAST_SUMMARY_PROMPT, MAP_PROMPT, REDUCE_PROMPT
     )
-    
+    cached = get_cached_summary(cache_key)
+    if cached is not None:
+        return cached
+
+    # Shared embedder from the model registry; loaded once, on the first map-reduce request
     embedder = get_embedder()
-    if embedder is None:
-        raise ValueError("Embedder model not initialized. Call initialize_embedder() first.")
     # Split the text if it's too long
     text_splitter = SemanticChunker(
         embedder,
@@ -167,42 +291,33 @@ def generate_summary_map_reduce(
         breakpoint_threshold_type="percentile"
     )
     
-
-    prompt_template = BASE_PODCAST_SUMMARY_PROMPT.strip() + f"\n\nLanguage: {target_language}\n\nHere is the transcript:\n{{text}}"
-    prompt = PromptTemplate(template=prompt_template, input_variables=["text"])
-    
     # Split the transcript into chunks
     texts = text_splitter.split_text(transcript)
-    docs = [Document(page_content=t) for t in texts]
-    
-    # # Print number of chunks and their lengths
-    # print(f"Number of chunks: {len(docs)}")
-    # for i, doc in enumerate(docs):
-    #     print(f"\n--- Chunk {i + 1} (length: {len(doc.page_content)} characters) ---")
-    #     print(doc.page_content)
-
-
-    if len(docs) == 1:
-        # Use stuff chain for short documents
-        chain = load_summarize_chain(
-            llm, 
-            chain_type="stuff",
-            prompt=prompt
+
+    if len(texts) == 1:
+        # Short transcript: one call with the full summary prompt
+        response = client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            temperature=MAP_REDUCE_TEMPERATURE,
+            messages=[{"role": "user", "content": BASE_PODCAST_SUMMARY_PROMPT.strip().format(transcript=texts[0], language=target_language)}]
         )
+        output_text = response.choices[0].message.content.strip()
     else:
-        map_prompt_template = MAP_PROMPT.strip()
-        map_prompt = PromptTemplate(template=map_prompt_template, input_variables=["text"])
-        reduce_prompt_template = REDUCE_PROMPT.strip()
-        reduce_prompt = PromptTemplate(template=reduce_prompt_template, input_variables=["language","text"])
-        # Use map_reduce for longer documents
-        chain = load_summarize_chain(
-            llm,
-            chain_type="map_reduce",
-            map_prompt=map_prompt,
-            combine_prompt=reduce_prompt
-        )
-    
-    # Generate the summary
-    summary = chain.invoke({"input_documents": docs, "language": target_language})
-    
-    return summary["output_text"].strip()
\ No newline at end of file
+        # Longer transcript: concurrent map over the chunks, tree reduce if the map outputs overflow the context
+        result = asyncio.run(map_reduce_summarize(
+            texts,
+            map_prompt=MAP_PROMPT.strip(),
+            reduce_prompt=REDUCE_PROMPT.strip(),
+            target_language=target_language,
+            model=SUMMARY_MODEL,
+            temperature=MAP_REDUCE_TEMPERATURE,
+            concurrency=MAP_REDUCE_CONCURRENCY,
+            context_tokens=MAP_REDUCE_CONTEXT_TOKENS,
+        ))
+        for report in result.reports:
+            print(f"[map-reduce] {report.phase} #{report.index}: {report.latency:.2f}s, {report.prompt_tokens} prompt / {report.completion_tokens} completion tokens")
+        print(f"[map-reduce] {len(texts)} chunks in {result.wall_time:.2f}s, {result.prompt_tokens + result.completion_tokens} tokens total")
+        output_text = result.output_text
+
+    cache_summary(cache_key, output_text)
+    return output_text
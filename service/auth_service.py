@@ -2,20 +2,135 @@
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Union
+import asyncio
 import os
+import threading
+import time
 import bcrypt
 import pytz
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt work factor for new hashes; existing hashes with another cost are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+# Password hashing runs on its own pool so logins and summarizations do not starve each other
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", 64))
+
+
+class PasswordHashBusyError(RuntimeError):
+    """Raised when the password hashing queue is full."""
+
 
 def get_password_hash(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def verify_password(plain_password: str, hashed_password: Union[str, bytes]) -> bool:
+    # Older rows were stored as bytes
+    if isinstance(hashed_password, str):
+        hashed_password = hashed_password.encode('utf-8')
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password)
 
+def password_needs_rehash(hashed_password: Union[str, bytes]) -> bool:
+    """True if the hash was made with a bcrypt cost other than BCRYPT_ROUNDS."""
+    if isinstance(hashed_password, bytes):
+        hashed_password = hashed_password.decode('utf-8')
+    # $2b$<cost>$<salt+hash>
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+# ========================
+# Password hashing pool
+# ========================
+class PasswordHashPool:
+    """
+    Bounded worker pool for bcrypt.
+
+    At most `workers` hashes run at once and at most `queue_limit` more wait; further requests are
+    rejected with PasswordHashBusyError instead of piling up. Queue depth and timings are kept for /metrics.
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._max_queued = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_time = 0.0
+        self._run_time = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordHashBusyError("Too many concurrent password operations")
+        with self._lock:
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+        submitted_at = time.perf_counter()
+
+        def task() -> Any:
+            started_at = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._wait_time += started_at - submitted_at
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._run_time += time.perf_counter() - started_at
+                self._slots.release()
+
+        return await asyncio.wrap_future(self._executor.submit(task))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "bcrypt_rounds": BCRYPT_ROUNDS,
+                "queued": self._queued,
+                "running": self._running,
+                "max_queued": self._max_queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_seconds": self._wait_time / self._completed if self._completed else 0.0,
+                "avg_hash_seconds": self._run_time / self._completed if self._completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hash_pool = PasswordHashPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT)
+
+async def hash_password_async(password: str) -> str:
+    return await password_hash_pool.run(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: Union[str, bytes]) -> bool:
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+def get_password_hash_stats() -> Dict[str, Any]:
+    return password_hash_pool.stats()
+
+def shutdown_password_hash_workers() -> None:
+    password_hash_pool.shutdown()
+#=================================================================
+
 SECRET_KEY = os.getenv("SECRET_KEY", "YOUR_RANDOM_SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30)
@@ -0,0 +1,180 @@
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import requests
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from schemas.schema import RSSFeedSchema, RSSEpisodeSchema
+from service.transcript_cache_service import canonicalize_url
+from utils.RSS import parse_RSS_episodes
+
+# A feed checked less than this long ago is served from the catalog without any request
+FEED_REFRESH_SECONDS = int(os.getenv("FEED_REFRESH_SECONDS", 300))
+FEED_FETCH_TIMEOUT_SECONDS = float(os.getenv("FEED_FETCH_TIMEOUT_SECONDS", 20))
+
+# Keep-alive connections to feed hosts across refreshes
+_http = requests.Session()
+_stats_lock = threading.Lock()
+_stats = {"fresh_hits": 0, "not_modified": 0, "full_fetches": 0, "bytes_downloaded": 0, "stale_served": 0}
+
+
+class EpisodeNotFoundError(LookupError):
+    """Raised when a feed has no episode with the requested GUID."""
+
+
+def _utcnow() -> datetime:
+    # Same clock as the database's CURRENT_TIMESTAMP
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _count(key: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += amount
+
+
+# ========================
+# Feed refresh
+# ========================
+def _get_or_create_feed(db: Session, feed_url: str) -> RSSFeedSchema:
+    feed = db.query(RSSFeedSchema).filter(RSSFeedSchema.feed_url == feed_url).first()
+    if feed is not None:
+        return feed
+    try:
+        feed = RSSFeedSchema(feed_url=feed_url)
+        db.add(feed)
+        db.commit()
+        return feed
+    except IntegrityError:
+        # Another request added the same feed first
+        db.rollback()
+        return db.query(RSSFeedSchema).filter(RSSFeedSchema.feed_url == feed_url).one()
+
+
+def _store_episodes(db: Session, feed: RSSFeedSchema, episodes: List[Dict[str, Any]]) -> None:
+    existing = {episode.guid: episode for episode in feed.episodes}
+    for data in episodes:
+        data = dict(data, title=data["title"][:255])
+        episode = existing.get(data["guid"])
+        if episode is None:
+            episode = RSSEpisodeSchema(feed_id=feed.id, **data)
+            db.add(episode)
+            existing[data["guid"]] = episode
+        else:
+            for key, value in data.items():
+                setattr(episode, key, value)
+
+
+def refresh_feed(db: Session, feed_url: str, force: bool = False) -> RSSFeedSchema:
+    """
+    Bring the catalog entry of a feed up to date and return it.
+
+    Within FEED_REFRESH_SECONDS of the last check the catalog is used as is. Otherwise the feed is
+    revalidated with If-None-Match / If-Modified-Since, so an unchanged feed costs a 304 and no
+    parsing. If the feed cannot be fetched but was fetched before, the stored episodes are kept.
+    """
+    feed = _get_or_create_feed(db, canonicalize_url(feed_url))
+    now = _utcnow()
+    if not force and feed.checked_at is not None and now - feed.checked_at < timedelta(seconds=FEED_REFRESH_SECONDS):
+        _count("fresh_hits")
+        return feed
+
+    headers = {}
+    if feed.fetched_at is not None:
+        if feed.etag:
+            headers["If-None-Match"] = feed.etag
+        if feed.last_modified:
+            headers["If-Modified-Since"] = feed.last_modified
+    try:
+        response = _http.get(feed.feed_url, headers=headers, timeout=FEED_FETCH_TIMEOUT_SECONDS)
+        if response.status_code == 304:
+            _count("not_modified")
+            feed.checked_at = now
+            db.commit()
+            return feed
+        response.raise_for_status()
+        metadata, episodes = parse_RSS_episodes(response.content)
+    except Exception as e:
+        if feed.fetched_at is None:
+            raise RuntimeError(f"Failed fetching RSS feed: {str(e)}")
+        print(f"Failed refreshing {feed.feed_url}, serving the stored episodes: {e}")
+        _count("stale_served")
+        return feed
+
+    _count("full_fetches")
+    _count("bytes_downloaded", len(response.content))
+    try:
+        feed.title = metadata["title"]
+        feed.image_url = metadata["image_url"]
+        feed.etag = response.headers.get("ETag")
+        feed.last_modified = response.headers.get("Last-Modified")
+        feed.fetched_at = feed.checked_at = now
+        _store_episodes(db, feed, episodes)
+        db.commit()
+    except IntegrityError:
+        # A concurrent refresh stored the same new episodes first; its catalog entry is just as fresh
+        db.rollback()
+        db.refresh(feed)
+        return feed
+    except Exception as e:
+        db.rollback()
+        raise RuntimeError(f"Failed storing RSS feed: {str(e)}")
+    return feed
+
+
+# ========================
+# Catalog queries
+# ========================
+def list_feed_episodes(
+    db: Session,
+    feed_url: str,
+    limit: int = 50,
+    offset: int = 0,
+    force: bool = False,
+) -> Tuple[RSSFeedSchema, List[RSSEpisodeSchema]]:
+    """Newest episodes of a feed (refreshed first when stale)."""
+    feed = refresh_feed(db, feed_url, force)
+    episodes = (
+        db.query(RSSEpisodeSchema)
+        .filter(RSSEpisodeSchema.feed_id == feed.id)
+        .order_by(RSSEpisodeSchema.published_at.desc().nulls_last(), RSSEpisodeSchema.id)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    return feed, episodes
+
+
+def resolve_feed_episode(db: Session, feed_url: str, guid: Optional[str] = None) -> Tuple[str, str, str]:
+    """
+    Catalog counterpart of utils.RSS.resolve_RSS_episode: the episode with `guid`, or the newest one.
+
+    Returns:
+        Tuple of (audio_url, thumbnail_url, episode_title)
+    """
+    started = _utcnow()
+    feed = refresh_feed(db, feed_url)
+    for attempt in range(2):
+        query = db.query(RSSEpisodeSchema).filter(RSSEpisodeSchema.feed_id == feed.id)
+        if guid is not None:
+            episode = query.filter(RSSEpisodeSchema.guid == guid).first()
+        else:
+            episode = query.order_by(RSSEpisodeSchema.published_at.desc().nulls_last()).first()
+        if episode is not None:
+            return episode.audio_url, episode.image_url or feed.image_url or "", episode.title
+        if attempt == 0 and (feed.checked_at is None or feed.checked_at < started):
+            # The episode may have been published since the catalog was last checked
+            feed = refresh_feed(db, feed_url, force=True)
+
+    if guid is not None:
+        raise EpisodeNotFoundError(f"Episode '{guid}' not found in the RSS feed.")
+    raise ValueError("RSS feed is empty or invalid.")
+
+
+def get_feed_catalog_stats(db: Session) -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["feeds"] = db.query(RSSFeedSchema).count()
+    stats["episodes"] = db.query(RSSEpisodeSchema).count()
+    stats["refresh_seconds"] = FEED_REFRESH_SECONDS
+    return stats
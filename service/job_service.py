@@ -0,0 +1,116 @@
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+from database import SessionLocal
+from models.podcast import SummarizePodcastURL, PodcastSummarizationResponse, SummarizeJobResponse, JobStatus, JobStage
+from service.pipeline_service import summarize_podcast, PipelineStageError
+
+SUMMARIZE_WORKERS = int(os.getenv("SUMMARIZE_WORKERS", 2))
+SUMMARIZE_JOB_RETENTION_SECONDS = int(os.getenv("SUMMARIZE_JOB_RETENTION_SECONDS", 3600))
+
+# Jobs are kept in process memory, so they are only visible to the worker process that accepted them.
+_executor = ThreadPoolExecutor(max_workers=SUMMARIZE_WORKERS, thread_name_prefix="summarize-job")
+_jobs: Dict[str, "SummarizeJob"] = {}
+_jobs_lock = threading.Lock()
+
+
+class SummarizeJob:
+    def __init__(self, request_data: SummarizePodcastURL, userid: str):
+        now = datetime.now()
+        self.job_id = str(uuid.uuid4())
+        self.request_data = request_data
+        self.userid = userid
+        self.status = JobStatus.QUEUED
+        self.stage = JobStage.QUEUED
+        self.created_at = now
+        self.updated_at = now
+        self.finished_at: Optional[float] = None
+        self.result: Optional[PodcastSummarizationResponse] = None
+        self.error: Optional[str] = None
+
+    def set_stage(self, stage: JobStage) -> None:
+        self.stage = stage
+        self.updated_at = datetime.now()
+
+    def to_response(self) -> SummarizeJobResponse:
+        return SummarizeJobResponse(
+            job_id=self.job_id,
+            status=self.status,
+            stage=self.stage,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            podcast_id=self.result.podcast_id if self.result else None,
+            error=self.error
+        )
+
+
+def _run_job(job: SummarizeJob) -> None:
+    job.status = JobStatus.RUNNING
+    db = SessionLocal()
+    try:
+        job.result = summarize_podcast(job.request_data, job.userid, db, on_stage=job.set_stage)
+        job.status = JobStatus.COMPLETED
+        job.set_stage(JobStage.COMPLETED)
+    except PipelineStageError as e:
+        job.error = str(e)
+        job.status = JobStatus.FAILED
+        job.set_stage(JobStage.FAILED)
+    except Exception as e:
+        job.error = f"Summarization failed: {str(e)}"
+        job.status = JobStatus.FAILED
+        job.set_stage(JobStage.FAILED)
+    finally:
+        job.finished_at = time.time()
+        db.close()
+
+
+def _purge_finished_jobs() -> None:
+    cutoff = time.time() - SUMMARIZE_JOB_RETENTION_SECONDS
+    with _jobs_lock:
+        expired = [job_id for job_id, job in _jobs.items() if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del _jobs[job_id]
+
+
+# ========================
+# Job queue API
+# ========================
+def submit_summarize_job(request_data: SummarizePodcastURL, userid: str) -> SummarizeJob:
+    """
+    Queue a summarization job and return immediately.
+
+    Args:
+        request_data: The submitted podcast URL and target language
+        userid: Owner of the job
+
+    Returns:
+        The queued job
+    """
+    _purge_finished_jobs()
+    job = SummarizeJob(request_data, userid)
+    with _jobs_lock:
+        _jobs[job.job_id] = job
+    _executor.submit(_run_job, job)
+    return job
+
+
+def get_summarize_job(job_id: str, userid: str) -> Optional[SummarizeJob]:
+    """
+    Look up a job owned by the given user.
+
+    Returns:
+        The job, or None if it does not exist, has expired or belongs to another user
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None or job.userid != userid:
+        return None
+    return job
+
+
+def shutdown_job_workers() -> None:
+    _executor.shutdown(wait=False, cancel_futures=True)
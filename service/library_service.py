@@ -0,0 +1,195 @@
+import os
+import base64
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.podcast import GetAllPodcastSummarizationResponse, GetSinglePodcastSummarizationResponse, HeadingSection
+from schemas.schema import PodcastSchema, HeadingSectionSchema
+from utils.cache import TTLCache
+
+SUMMARIZATIONS_PAGE_SIZE = 50
+SUMMARIZATIONS_MAX_PAGE_SIZE = 200
+
+# Bump when the single summarization response changes shape, so clients drop their cached copies
+SUMMARIZATION_RESPONSE_VERSION = "1"
+SUMMARIZATION_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARIZATION_RESPONSE_CACHE_MAX_ENTRIES", 1024))
+SUMMARIZATION_RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("SUMMARIZATION_RESPONSE_CACHE_TTL_SECONDS", 3600))
+_response_cache = TTLCache(maxsize=SUMMARIZATION_RESPONSE_CACHE_MAX_ENTRIES, ttl=SUMMARIZATION_RESPONSE_CACHE_TTL_SECONDS)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+# ========================
+# Keyset cursors
+# ========================
+def encode_cursor(created_at: datetime, podcast_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{podcast_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, podcast_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), podcast_id
+    except Exception:
+        raise InvalidCursorError("Invalid pagination cursor")
+
+
+# ========================
+# Summarization listing
+# ========================
+async def list_summarizations(
+    db: AsyncSession,
+    userid: str,
+    limit: int = SUMMARIZATIONS_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> Tuple[List[GetAllPodcastSummarizationResponse], Optional[str]]:
+    """
+    One page of a user's summarizations, newest first.
+
+    Uses keyset pagination on (created_at, id), served by ix_podcasts_userid_created_at, and selects
+    only the listed columns, so the cost of a page does not grow with the size of the library.
+
+    Args:
+        db: Database session
+        userid: Owner of the summarizations
+        limit: Page size
+        cursor: Cursor returned with the previous page, or None for the first page
+
+    Returns:
+        The page and the cursor of the next page (None on the last page)
+    """
+    query = select(
+        PodcastSchema.id,
+        PodcastSchema.title,
+        PodcastSchema.thumbnail_url,
+        PodcastSchema.created_at,
+        PodcastSchema.target_language,
+    ).where(PodcastSchema.userid == userid)
+
+    if cursor:
+        created_at, podcast_id = decode_cursor(cursor)
+        query = query.where(or_(
+            PodcastSchema.created_at < created_at,
+            and_(PodcastSchema.created_at == created_at, PodcastSchema.id < podcast_id)
+        ))
+
+    # Fetch one extra row to know whether there is a next page
+    result = await db.execute(query.order_by(PodcastSchema.created_at.desc(), PodcastSchema.id.desc()).limit(limit + 1))
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    page = [
+        GetAllPodcastSummarizationResponse(
+            podcast_id=row.id,
+            title=row.title,
+            thumbnail_url=row.thumbnail_url,
+            created_at=row.created_at,
+            language=row.target_language
+        )
+        for row in rows
+    ]
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+    return page, next_cursor
+
+
+# ========================
+# Single summarization reads
+# ========================
+@dataclass
+class SerializedSummarization:
+    etag: str
+    body: bytes
+
+
+def summarization_etag(podcast_id: str, created_at: datetime) -> str:
+    """Strong ETag of a summarization. Summaries never change after creation, so id + creation time identify the content."""
+    raw = f"{podcast_id}|{created_at.isoformat()}|{SUMMARIZATION_RESPONSE_VERSION}"
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (RFC 9110: weak comparison, list of tags or `*`)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+async def read_summarization(
+    db: AsyncSession,
+    userid: str,
+    podcast_id: str,
+    if_none_match: Optional[str] = None,
+) -> Optional[SerializedSummarization]:
+    """
+    A user's summarization serialized as JSON, served from an in-process LRU after the first read.
+
+    On a cache miss the ETag is computed from a two-column lookup first, so a client whose copy
+    is current (`if_none_match`) is answered without loading the podcast row or its sections.
+
+    Returns:
+        None if the podcast does not exist or belongs to another user. Otherwise the ETag and the
+        JSON body, with an empty body when `if_none_match` matches the ETag.
+    """
+    cache_key = (userid, podcast_id)
+    cached = _response_cache.get(cache_key)
+    if cached is not None:
+        if etag_matches(if_none_match, cached.etag):
+            return SerializedSummarization(etag=cached.etag, body=b"")
+        return cached
+
+    result = await db.execute(select(PodcastSchema.id, PodcastSchema.created_at).where(
+        PodcastSchema.userid == userid,
+        PodcastSchema.id == podcast_id
+    ))
+    row = result.first()
+    if row is None:
+        return None
+    etag = summarization_etag(row.id, row.created_at)
+    if etag_matches(if_none_match, etag):
+        return SerializedSummarization(etag=etag, body=b"")
+
+    podcast = (await db.execute(select(PodcastSchema).where(PodcastSchema.id == row.id))).scalar_one()
+    sections = (await db.execute(select(HeadingSectionSchema).where(
+        HeadingSectionSchema.podcast_id == podcast.id
+    ).order_by(HeadingSectionSchema.start))).scalars().all()
+
+    # Convert HeadingSectionSchema -> HeadingSection (Pydantic)
+    headings = [
+        HeadingSection(
+            header=section.header,
+            title=section.title,
+            start=section.start,
+            end=section.end,
+            content=section.content
+        )
+        for section in sections
+    ]
+
+    response = GetSinglePodcastSummarizationResponse(
+        podcast_id=podcast.id,
+        title=podcast.title,
+        thumbnail_url=podcast.thumbnail_url,
+        detail_summarization=headings,
+        overall_summarization=podcast.summarized_content,
+        created_at=podcast.created_at,
+        language=podcast.target_language,
+        podcast_url=podcast.podcast_url,
+        podcast_type=podcast.podcast_type
+    )
+
+    serialized = SerializedSummarization(etag=etag, body=response.model_dump_json().encode("utf-8"))
+    _response_cache.set(cache_key, serialized)
+    return serialized
+
+
+def get_summarization_response_cache_stats() -> Dict[str, Any]:
+    return _response_cache.stats()
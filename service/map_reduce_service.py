@@ -0,0 +1,140 @@
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+from openai import AsyncOpenAI
+from utils.tokens import count_tokens
+
+
+@dataclass
+class ChunkReport:
+    phase: str
+    index: int
+    latency: float
+    prompt_tokens: int
+    completion_tokens: int
+
+
+@dataclass
+class MapReduceResult:
+    output_text: str
+    reports: List[ChunkReport] = field(default_factory=list)
+    wall_time: float = 0.0
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(report.prompt_tokens for report in self.reports)
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(report.completion_tokens for report in self.reports)
+
+
+async def _complete(
+    client: AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
+    prompt: str,
+    model: str,
+    temperature: float,
+    phase: str,
+    index: int,
+    system_prompt: Optional[str] = None,
+) -> Tuple[str, ChunkReport]:
+    messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+    messages.append({"role": "user", "content": prompt})
+    async with semaphore:
+        start = time.time()
+        response = await client.chat.completions.create(model=model, temperature=temperature, messages=messages)
+        latency = time.time() - start
+    usage = response.usage
+    report = ChunkReport(
+        phase=phase,
+        index=index,
+        latency=latency,
+        prompt_tokens=usage.prompt_tokens if usage else count_tokens(prompt, model),
+        completion_tokens=usage.completion_tokens if usage else 0,
+    )
+    return response.choices[0].message.content.strip(), report
+
+
+def _batch_by_tokens(texts: List[str], budget: int, model: str) -> List[List[str]]:
+    """Group consecutive texts so each group fits in `budget` tokens (a single oversized text gets its own group)."""
+    batches, current, current_tokens = [], [], 0
+    for text in texts:
+        tokens = count_tokens(text, model)
+        if current and current_tokens + tokens > budget:
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def map_reduce_summarize(
+    chunks: List[str],
+    map_prompt: str,
+    reduce_prompt: str,
+    target_language: str,
+    model: str,
+    temperature: float,
+    concurrency: int = 4,
+    context_tokens: int = 100000,
+    system_prompt: Optional[str] = None,
+) -> MapReduceResult:
+    """
+    Summarize transcript chunks concurrently, then reduce the chunk summaries into one answer.
+
+    The map phase sends every chunk to the API with at most `concurrency` requests in flight. If
+    the map outputs together exceed `context_tokens`, they are reduced as a tree: consecutive
+    summaries are batched under the budget and collapsed with `map_prompt` again, level by level,
+    until the remainder fits into a single `reduce_prompt` call.
+
+    Args:
+        chunks: Transcript chunks in time order
+        map_prompt: Template with a `{text}` placeholder, applied to every chunk
+        reduce_prompt: Template with `{text}` and `{language}` placeholders for the final call
+        target_language: Language passed to the reduce prompt
+        model: OpenAI chat model
+        temperature: Sampling temperature for every call
+        concurrency: Maximum number of requests in flight
+        context_tokens: Token budget for the text given to one reduce call
+        system_prompt: Optional system message sent with every call
+
+    Returns:
+        The final text with the latency and token usage of every call
+    """
+    start = time.time()
+    semaphore = asyncio.Semaphore(concurrency)
+    reports: List[ChunkReport] = []
+
+    async with AsyncOpenAI() as client:
+        mapped = await asyncio.gather(*(
+            _complete(client, semaphore, map_prompt.format(text=chunk), model, temperature, "map", i, system_prompt)
+            for i, chunk in enumerate(chunks)
+        ))
+        summaries = [text for text, _ in mapped]
+        reports.extend(report for _, report in mapped)
+
+        level = 0
+        while len(summaries) > 1 and count_tokens("\n\n".join(summaries), model) > context_tokens:
+            level += 1
+            batches = _batch_by_tokens(summaries, context_tokens, model)
+            if len(batches) == len(summaries):
+                # Every summary is already as large as the budget: collapsing further cannot help
+                break
+            collapsed = await asyncio.gather(*(
+                _complete(client, semaphore, map_prompt.format(text="\n\n".join(batch)), model, temperature, f"collapse-{level}", i, system_prompt)
+                for i, batch in enumerate(batches)
+            ))
+            summaries = [text for text, _ in collapsed]
+            reports.extend(report for _, report in collapsed)
+
+        output_text, report = await _complete(
+            client, semaphore, reduce_prompt.format(text="\n\n".join(summaries), language=target_language),
+            model, temperature, "reduce", 0, system_prompt
+        )
+        reports.append(report)
+
+    return MapReduceResult(output_text=output_text, reports=reports, wall_time=time.time() - start)
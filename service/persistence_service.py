@@ -0,0 +1,87 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from models.podcast import HeadingSection, TargetLanguage
+from schemas.schema import PodcastSchema, HeadingSectionSchema
+from service.search_service import index_podcast_summary
+
+
+@dataclass
+class SavedPodcast:
+    id: str
+    created_at: datetime
+    section_ids: List[str]
+
+
+def transcript_duration(segments: List[Dict[str, Any]]) -> float:
+    """Episode length in seconds, from the end of the last transcribed segment."""
+    return max((float(seg["end"]) for seg in segments), default=0.0)
+
+
+# ========================
+# Summarization persistence
+# ========================
+def save_podcast_summarization(
+    db: Session,
+    userid: str,
+    podcast_type: str,
+    podcast_url: str,
+    audio_path: str,
+    title: str,
+    thumbnail_url: str,
+    target_language: TargetLanguage,
+    overall_summarization: str,
+    headings: List[HeadingSection],
+    duration: float,
+) -> SavedPodcast:
+    """
+    Save a podcast and all of its heading sections in one transaction.
+
+    The podcast row is inserted with RETURNING (no refresh query), the sections with a single
+    executemany and the full-text index rows in the same transaction; either everything is
+    committed or nothing is.
+
+    Returns:
+        The id and server-generated creation time of the saved podcast
+    """
+    podcast_id = str(uuid.uuid4())
+    section_ids = [str(uuid.uuid4()) for _ in headings]
+    try:
+        created_at = db.execute(
+            insert(PodcastSchema).values(
+                id=podcast_id,
+                title=title,
+                userid=userid,
+                thumbnail_url=thumbnail_url,
+                target_language=target_language.value,
+                audio_path=audio_path,
+                duration=duration,
+                summarized_content=overall_summarization,
+                podcast_url=podcast_url,
+                podcast_type=podcast_type
+            ).returning(PodcastSchema.created_at)
+        ).scalar_one()
+
+        if headings:
+            db.execute(insert(HeadingSectionSchema), [
+                {
+                    "id": section_id,
+                    "header": section.header,
+                    "title": section.title,
+                    "content": section.content,
+                    "start": section.start,
+                    "end": section.end,
+                    "podcast_id": podcast_id,
+                }
+                for section, section_id in zip(headings, section_ids)
+            ])
+        index_podcast_summary(db, userid, podcast_id, title, overall_summarization, headings, section_ids)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise RuntimeError(f"Failed saving summarization: {str(e)}")
+
+    return SavedPodcast(id=podcast_id, created_at=created_at, section_ids=section_ids)
@@ -0,0 +1,355 @@
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from models.podcast import SummarizePodcastURL, PodcastSummarizationResponse, HeadingSection, SummaryTokenUsage, JobStage
+from service.podcast_service import resolve_source, download_source, transcribe_audio, stream_transcribe_audio, STREAMING_TRANSCRIPTION
+from service.persistence_service import save_podcast_summarization, transcript_duration
+from service.transcript_cache_service import get_cached_transcript, store_transcript, normalize_source_url
+from service.summary_planner import plan_summary, summarize_transcript
+from service.GPT_service import stream_heading_summary
+from service.semantic_search_service import index_section_embeddings
+from utils.audio import create_audio_name
+from utils.GPT import parse_headings_and_overall, HeadingStreamParser
+
+UPLOAD_DIR = 'uploads/'
+# audio_path of podcasts and transcript cache entries whose audio was evicted (the column is not nullable)
+EVICTED_AUDIO_PATH = ""
+# Identical in-flight requests (same episode and language) share one download, transcription and summary
+COALESCE_SUMMARIZE_REQUESTS = os.getenv("COALESCE_SUMMARIZE_REQUESTS", "true").lower() == "true"
+
+
+class PipelineStageError(RuntimeError):
+    """Raised when one stage of the summarization pipeline fails."""
+
+    def __init__(self, stage: JobStage, message: str):
+        super().__init__(message)
+        self.stage = stage
+
+
+@dataclass
+class PodcastTranscript:
+    audio_path: str
+    thumbnail_url: str
+    title: str
+    audio_type: str
+    segments: List[Dict[str, Any]]
+
+
+@dataclass
+class PodcastSummary:
+    """Everything summarize_podcast produces before saving, i.e. the part shared by identical requests."""
+    podcast: PodcastTranscript
+    headings: List[HeadingSection]
+    overall: str
+    usage: Optional[SummaryTokenUsage]
+
+
+# ========================
+# Pipeline stages
+# ========================
+def acquire_transcript(
+    request_data: SummarizePodcastURL,
+    userid: str,
+    db: Session,
+) -> Generator[JobStage, None, PodcastTranscript]:
+    """
+    Download and transcribe the submitted podcast, or reuse its cached transcript.
+
+    Yields every stage as it is entered and returns the transcript, so callers can either
+    report stages through a callback (run_stages) or forward them to a client as they happen.
+    """
+    yield JobStage.DOWNLOADING
+    try:
+        source = resolve_source(request_data.URL, db, request_data.episode_guid)
+    except Exception as e:
+        raise PipelineStageError(JobStage.DOWNLOADING, f"Failed downloading audio: {str(e)}")
+
+    cached = get_cached_transcript(db, source.cache_key)
+    if cached is not None:
+        # Same episode was already transcribed (for any user or language): go straight to summarization.
+        # Summarization only needs the segments, so a cached transcript whose audio is gone is still used.
+        audio_path = cached.audio_path if cached.audio_path and os.path.exists(cached.audio_path) else EVICTED_AUDIO_PATH
+        return PodcastTranscript(audio_path, cached.thumbnail_url, cached.title, cached.podcast_type, cached.segments)
+
+    file_name = create_audio_name(userid=userid)
+    if STREAMING_TRANSCRIPTION and source.audio_url:
+        # Overlap network and Whisper time: transcribe windows while the enclosure is still downloading
+        yield JobStage.TRANSCRIBING
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        audio_path = str(Path(UPLOAD_DIR) / f"{file_name}.mp3")
+        thumbnail_url, title, audio_type = source.thumbnail_url, source.title, source.podcast_type
+        try:
+            transcript, segments, transcribe_time = stream_transcribe_audio(source.audio_url, audio_path)
+        except Exception as e:
+            raise PipelineStageError(JobStage.TRANSCRIBING, f"Failed transcribing audio: {str(e)}")
+    else:
+        try:
+            audio_path, thumbnail_url, title, audio_type = download_source(source, UPLOAD_DIR, file_name)
+        except Exception as e:
+            raise PipelineStageError(JobStage.DOWNLOADING, f"Failed downloading audio: {str(e)}")
+
+        yield JobStage.TRANSCRIBING
+        try:
+            transcript, segments, transcribe_time = transcribe_audio(audio_path)
+        except Exception as e:
+            raise PipelineStageError(JobStage.TRANSCRIBING, f"Failed transcribing audio: {str(e)}")
+
+    store_transcript(db, source.cache_key, request_data.URL, audio_type, title, thumbnail_url, audio_path, transcript, segments, transcribe_time)
+    return PodcastTranscript(audio_path, thumbnail_url, title, audio_type, segments)
+
+
+def run_stages(steps: Generator[JobStage, None, Any], on_stage: Optional[Callable[[JobStage], None]] = None) -> Any:
+    """Drive a stage generator such as acquire_transcript to completion and return its result."""
+    while True:
+        try:
+            stage = next(steps)
+        except StopIteration as done:
+            return done.value
+        if on_stage is not None:
+            on_stage(stage)
+
+
+def save_summary(
+    request_data: SummarizePodcastURL,
+    userid: str,
+    db: Session,
+    podcast: PodcastTranscript,
+    headings: List[HeadingSection],
+    overall: str,
+    token_usage: Optional[SummaryTokenUsage] = None,
+) -> PodcastSummarizationResponse:
+    try:
+        saved = save_podcast_summarization(
+            db,
+            userid=userid,
+            podcast_type=podcast.audio_type,
+            podcast_url=request_data.URL,
+            audio_path=podcast.audio_path,
+            title=podcast.title,
+            thumbnail_url=podcast.thumbnail_url,
+            target_language=request_data.target_language,
+            overall_summarization=overall,
+            headings=headings,
+            duration=transcript_duration(podcast.segments)
+        )
+    except Exception as e:
+        raise PipelineStageError(JobStage.SAVING, str(e))
+
+    # The summary is already saved; a failed embedding only leaves it out of semantic search
+    try:
+        index_section_embeddings(db, userid, saved.id, headings, saved.section_ids)
+    except Exception as e:
+        db.rollback()
+        print(f"Failed embedding sections of {saved.id}: {e}")
+
+    return PodcastSummarizationResponse(
+        podcast_id=saved.id,
+        title=podcast.title,
+        thumbnail_url=podcast.thumbnail_url,
+        detail_summarization=headings,
+        overall_summarization=overall,
+        created_at=saved.created_at,
+        token_usage=token_usage
+    )
+
+
+# ========================
+# Summarization pipeline
+# ========================
+def summarize_podcast(
+    request_data: SummarizePodcastURL,
+    userid: str,
+    db: Session,
+    on_stage: Optional[Callable[[JobStage], None]] = None,
+) -> PodcastSummarizationResponse:
+    """
+    Run the full download -> transcribe -> summarize -> save pipeline for one podcast link.
+
+    Args:
+        request_data: The submitted podcast URL and target language
+        userid: Owner of the resulting summarization
+        db: Database session used to persist the result
+        on_stage: Optional callback notified when the pipeline enters a new stage
+
+    Returns:
+        The saved summarization
+    """
+    def enter(stage: JobStage) -> None:
+        if on_stage is not None:
+            on_stage(stage)
+
+    if COALESCE_SUMMARIZE_REQUESTS:
+        summary = _coalesced_summary(request_data, userid, db, enter)
+    else:
+        summary = _produce_summary(request_data, userid, db, enter)
+
+    # Every request gets its own podcast row, also when it followed another request
+    enter(JobStage.SAVING)
+    return save_summary(request_data, userid, db, summary.podcast, summary.headings, summary.overall, summary.usage)
+
+
+def _produce_summary(
+    request_data: SummarizePodcastURL,
+    userid: str,
+    db: Session,
+    enter: Callable[[JobStage], None],
+) -> PodcastSummary:
+    podcast = run_stages(acquire_transcript(request_data, userid, db), enter)
+
+    enter(JobStage.SUMMARIZING)
+    try:
+        summary = summarize_transcript(podcast.segments, request_data.target_language.value)
+        response_text = summary.text
+        # response_text = generate_summary_map_reduce(segments, request_data.target_language.value)
+    except Exception as e:
+        raise PipelineStageError(JobStage.SUMMARIZING, f"Failed summarizing transcript: {str(e)}")
+
+    print("GPT Response: ", response_text)
+
+    headings, overall = parse_headings_and_overall(response_text)
+    return PodcastSummary(podcast, headings, overall, summary.usage)
+
+
+def stream_summarize_podcast(
+    request_data: SummarizePodcastURL,
+    userid: str,
+    db: Session,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Streaming variant of summarize_podcast.
+
+    Yields (event, payload) pairs: `stage` when the pipeline enters a stage, `heading` for every
+    HeadingSection as soon as its block is complete in the LLM stream, `overall` with pieces of the
+    overall summary, and finally `done` with the saved summarization. Long transcripts that need a
+    hierarchical summary cannot be streamed, so their headings are all sent when the summary is ready.
+    """
+    podcast = yield from _stage_events(acquire_transcript(request_data, userid, db))
+    language = request_data.target_language.value
+
+    yield "stage", {"stage": JobStage.SUMMARIZING.value}
+    parser = HeadingStreamParser()
+    try:
+        plan = plan_summary(podcast.segments, language)
+        if plan.strategy == "single":
+            usage = SummaryTokenUsage(strategy=plan.strategy, estimated_prompt_tokens=plan.estimated_prompt_tokens)
+            deltas = stream_heading_summary(podcast.segments, language, usage)
+        else:
+            summary = summarize_transcript(podcast.segments, language, plan)
+            usage, deltas = summary.usage, [summary.text]
+
+        for delta in deltas:
+            headings, overall_delta = parser.feed(delta)
+            for heading in headings:
+                yield "heading", heading.model_dump()
+            if overall_delta:
+                yield "overall", {"delta": overall_delta}
+    except Exception as e:
+        raise PipelineStageError(JobStage.SUMMARIZING, f"Failed summarizing transcript: {str(e)}")
+
+    print("GPT Response: ", parser.text)
+
+    headings, overall = parser.finish()
+    # The last heading is only known to be complete at the end of the stream when there is no Overall
+    for heading in headings[parser.emitted:]:
+        yield "heading", heading.model_dump()
+
+    yield "stage", {"stage": JobStage.SAVING.value}
+    response = save_summary(request_data, userid, db, podcast, headings, overall, usage)
+    yield "done", response.model_dump(mode="json")
+
+
+def _stage_events(steps: Generator[JobStage, None, Any]) -> Generator[Tuple[str, Any], None, Any]:
+    """Like run_stages, but forwards every stage as a `stage` event."""
+    while True:
+        try:
+            stage = next(steps)
+        except StopIteration as done:
+            return done.value
+        yield "stage", {"stage": stage.value}
+
+
+# ========================
+# Request coalescing
+# ========================
+class _Flight:
+    """One in-flight _produce_summary call that identical requests wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[PodcastSummary] = None
+        self.error: Optional[PipelineStageError] = None
+        self.stage: Optional[JobStage] = None
+        self._listeners: List[Callable[[JobStage], None]] = []
+        self._lock = threading.Lock()
+
+    def enter(self, stage: JobStage) -> None:
+        with self._lock:
+            self.stage = stage
+            for listener in self._listeners:
+                listener(stage)
+
+    def follow(self, on_stage: Callable[[JobStage], None]) -> None:
+        """Report the leader's stages to a request, starting with the current one."""
+        with self._lock:
+            self._listeners.append(on_stage)
+            if self.stage is not None:
+                on_stage(self.stage)
+
+
+_flights: Dict[Tuple[str, Optional[str], str], _Flight] = {}
+_flights_lock = threading.Lock()
+_coalescing_stats = {"leaders": 0, "coalesced": 0}
+
+
+def _coalesced_summary(
+    request_data: SummarizePodcastURL,
+    userid: str,
+    db: Session,
+    enter: Callable[[JobStage], None],
+) -> PodcastSummary:
+    """
+    Single-flight wrapper around _produce_summary keyed on the normalized URL, RSS episode and target language.
+
+    The first request (leader) runs the pipeline; requests arriving while it runs (followers) wait
+    for its result, or its error, without running any stage themselves.
+    """
+    key = (normalize_source_url(request_data.URL), request_data.episode_guid, request_data.target_language.value)
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+            _coalescing_stats["leaders"] += 1
+        else:
+            _coalescing_stats["coalesced"] += 1
+    flight.follow(enter)
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise PipelineStageError(flight.error.stage, str(flight.error))
+        return flight.result
+
+    try:
+        flight.result = _produce_summary(request_data, userid, db, flight.enter)
+        return flight.result
+    except PipelineStageError as e:
+        flight.error = e
+        raise
+    except Exception as e:
+        flight.error = PipelineStageError(flight.stage or JobStage.DOWNLOADING, str(e))
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
+
+
+def get_coalescing_stats() -> Dict[str, int]:
+    with _flights_lock:
+        stats = dict(_coalescing_stats)
+        stats["in_flight"] = len(_flights)
+    return stats
@@ -8,24 +8,96 @@ from urllib.parse import urlparse, parse_qs
 from pathlib import Path
 from typing import Tuple
 from yt_dlp import YoutubeDL
+from dataclasses import dataclass
+from typing import Optional, Callable, Dict, Any
 from utils.youtube import download_single_youtube_video
-from utils.RSS import download_RSS
-from utils.whisper import get_whisper_model
-from models.podcast import TargetLanguage
+from utils.RSS import download_RSS, resolve_RSS_episode, download_RSS_audio
+from service.transcript_cache_service import normalize_source_url, normalize_enclosure_url
+from service.feed_service import resolve_feed_episode
+from utils.whisper import get_whisper_model, get_whisper_model_name
+from utils.parallel_whisper import parallel_transcribe
+from utils.streaming import stream_pcm_from_url, stream_transcribe
 from sqlalchemy.orm import Session
-from schemas.schema import PodcastSchema
-from typing import List
-from models.podcast import HeadingSection
-from schemas.schema import HeadingSectionSchema
-import uuid
+
+STREAMING_TRANSCRIPTION = os.getenv("STREAMING_TRANSCRIPTION", "false").lower() == "true"
+STREAM_WINDOW_SECONDS = float(os.getenv("STREAM_WINDOW_SECONDS", 30))
+# Decoded windows kept ready while Whisper works on earlier ones
+STREAM_BUFFER_WINDOWS = int(os.getenv("STREAM_BUFFER_WINDOWS", 4))
+WHISPER_PARALLEL_WORKERS = int(os.getenv("WHISPER_PARALLEL_WORKERS", 1))
+WHISPER_CHUNK_SECONDS = float(os.getenv("WHISPER_CHUNK_SECONDS", 300))
+
+def is_youtube_link(link: str) -> bool:
+    return "youtube.com" in link or "youtu.be" in link
+
+
+@dataclass
+class PodcastSource:
+    link: str
+    podcast_type: str
+    cache_key: str
+    audio_url: Optional[str] = None
+    title: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+
+
+# ========================
+# Source resolution
+# ========================
+def resolve_source(link: str, db: Optional[Session] = None, episode_guid: Optional[str] = None) -> PodcastSource:
+    """
+    Identify the episode behind a submitted link without downloading it.
+
+    YouTube links are keyed by video id. RSS links are keyed by the enclosure URL of the
+    episode they currently point to, so a feed that publishes a new episode gets a new key.
+    With a session, RSS feeds are resolved through the feed catalog (conditional GET) and
+    `episode_guid` picks an episode other than the newest.
+    """
+    try:
+        if is_youtube_link(link):
+            if episode_guid is not None:
+                raise ValueError("episode_guid only applies to RSS feeds.")
+            return PodcastSource(link=link, podcast_type='youtube', cache_key=normalize_source_url(link))
+        if db is not None:
+            audio_url, thumbnail_url, title = resolve_feed_episode(db, link, episode_guid)
+        elif episode_guid is None:
+            audio_url, thumbnail_url, title = resolve_RSS_episode(link)
+        else:
+            raise ValueError("Selecting an RSS episode needs the feed catalog.")
+        return PodcastSource(
+            link=link,
+            podcast_type='RSS',
+            cache_key=normalize_enclosure_url(audio_url),
+            audio_url=audio_url,
+            title=title,
+            thumbnail_url=thumbnail_url
+        )
+    except Exception as e:
+        raise RuntimeError(f"Download failed: {str(e)}")
+
 
 # ========================
 # Unified download handler
 # ========================
+def download_source(source: PodcastSource, output_path: str, file_name: str) -> Tuple[str, str, str, str]:
+    try:
+        os.makedirs(output_path, exist_ok=True)
+        if source.podcast_type == 'youtube':
+            return download_single_youtube_video(source.link, output_path, file_name)
+        if source.audio_url:
+            try:
+                audio_path = download_RSS_audio(source.audio_url, output_path, file_name)
+            except Exception as e:
+                raise RuntimeError(f"Download from RSS failed: {str(e)}")
+            return audio_path, source.thumbnail_url, source.title, source.podcast_type
+        return download_RSS(source.link, output_path, file_name)
+    except Exception as e:
+        raise RuntimeError(f"Download failed: {str(e)}")
+
+
 def download_audio(link: str, output_path: str, file_name: str) -> Tuple[str, str, str, str]:
     try:
         os.makedirs(output_path, exist_ok=True)
-        if "youtube.com" in link or "youtu.be" in link:
+        if is_youtube_link(link):
             return download_single_youtube_video(link, output_path, file_name)
         else:
             return download_RSS(link, output_path, file_name)
@@ -36,6 +108,8 @@ def transcribe_audio(audio_path: str) -> Tuple[str, list[str], float]:
     try:
         if not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        if WHISPER_PARALLEL_WORKERS > 1:
+            return parallel_transcribe(audio_path, get_whisper_model_name(), WHISPER_PARALLEL_WORKERS, chunk_seconds=WHISPER_CHUNK_SECONDS)
         start = time.time()
         model = get_whisper_model()
         result = model.transcribe(audio_path)
@@ -45,49 +119,37 @@ def transcribe_audio(audio_path: str) -> Tuple[str, list[str], float]:
         return transcript, segment, transcribe_time
     except Exception as e:
         raise RuntimeError(f"Transcription failed: {str(e)}")
-    
-def save_audio_info(
-    podcast_type: str,
-    podcast_url: str,
+
+def stream_transcribe_audio(
+    audio_url: str,
     audio_path: str,
-    title: str,
-    thumbnail_url: str,
-    userid: str,
-    targetLanguage: TargetLanguage, 
-    db: Session,
-    overallSummarization: str,
-) -> PodcastSchema:
-    new_podcast = PodcastSchema(
-        title=title,
-        userid=userid,
-        thumbnail_url=thumbnail_url,
-        target_language=targetLanguage.value,
-        audio_path=audio_path,
-        duration=0,
-        summarized_content= overallSummarization,
-        podcast_url = podcast_url,
-        podcast_type=podcast_type
-    )
-
-    db.add(new_podcast)
-    db.commit()
-    db.refresh(new_podcast)  
-
-    return new_podcast
-
-
-def save_summarization_heading(input: List[HeadingSection], podcast_id: str, db: Session):
-    for section in input:
-        new_section = HeadingSectionSchema(
-            id=str(uuid.uuid4()),
-            header=section.header,
-            title=section.title,
-            content=section.content,
-            start=section.start,
-            end=section.end,
-            podcast_id=podcast_id
-        )
-        db.add(new_section)
+    on_segment: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Tuple[str, list[str], float]:
+    """
+    Download and transcribe an audio URL at the same time.
+
+    Bytes are saved to `audio_path` and piped through ffmpeg while they arrive, and Whisper
+    transcribes each decoded window as soon as it is complete.
 
-    db.commit()
-    
+    Args:
+        audio_url: Direct URL of the audio file (e.g. an RSS enclosure)
+        audio_path: Local path that receives a copy of the audio
+        on_segment: Optional callback invoked with every segment as soon as it is transcribed
+
+    Returns:
+        Same (transcript, segments, transcribe_time) tuple as transcribe_audio
+    """
+    try:
+        start = time.time()
+        model = get_whisper_model()
+        segments = []
+        windows = stream_pcm_from_url(audio_url, tee_path=audio_path, window_seconds=STREAM_WINDOW_SECONDS, buffer_windows=STREAM_BUFFER_WINDOWS)
+        for segment in stream_transcribe(model, windows):
+            segments.append(segment)
+            if on_segment is not None:
+                on_segment(segment)
+        transcript = "".join(segment["text"] for segment in segments)
+        transcribe_time = time.time() - start
+        return transcript, segments, transcribe_time
+    except Exception as e:
+        raise RuntimeError(f"Transcription failed: {str(e)}")
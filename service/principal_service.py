@@ -0,0 +1,76 @@
+import os
+from typing import Any, Dict, Optional
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from models.user import UserPrincipal
+from schemas.schema import User
+from utils.cache import TTLCache
+
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", 10000))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+_principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_MAX_ENTRIES, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+
+_PENDING_INVALIDATIONS = "invalidated_principals"
+
+
+# ========================
+# Principal lookup
+# ========================
+async def get_principal(db: AsyncSession, userid: str) -> Optional[UserPrincipal]:
+    """
+    Resolve the user behind a token, from the TTL cache or a lookup that skips the profile picture.
+
+    Returns:
+        The principal, or None if the user does not exist (unknown users are not cached)
+    """
+    principal = _principal_cache.get(userid)
+    if principal is not None:
+        return principal
+
+    result = await db.execute(select(User.userid, User.email).where(User.userid == userid))
+    row = result.first()
+    if row is None:
+        return None
+    principal = UserPrincipal(userid=row.userid, email=row.email)
+    _principal_cache.set(userid, principal)
+    return principal
+
+
+def invalidate_principal(userid: str) -> None:
+    """Drop a cached principal; call after changing or deleting a user outside the ORM unit of work."""
+    _principal_cache.pop(userid)
+
+
+def clear_principal_cache() -> None:
+    _principal_cache.clear()
+
+
+def get_principal_cache_stats() -> Dict[str, Any]:
+    return _principal_cache.stats()
+
+
+# ========================
+# ORM invalidation hooks
+# ========================
+# Users changed or deleted through a session are invalidated at flush and again after commit, so a
+# request that re-caches the old row between the two cannot keep it for a whole TTL. Bulk
+# query().update()/delete() bypass these hooks and must call invalidate_principal.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper: Any, connection: Any, target: User) -> None:
+    invalidate_principal(target.userid)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(target.userid)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    for userid in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        invalidate_principal(userid)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
@@ -0,0 +1,221 @@
+import re
+from typing import Any, Dict, List
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from models.podcast import HeadingSection, SummarySearchResult
+
+SEARCH_SNIPPET_TOKENS = 16
+# Relative weight of titles vs. content when ranking
+SEARCH_TITLE_WEIGHT = 5.0
+
+_TOKEN_PATTERN = re.compile(r"\w+", flags=re.UNICODE)
+
+# One row per podcast overall summary (kind='summary') and per heading section (kind='section').
+# SQLite: FTS5 table; `owner` is an indexed token, so the per-user filter is a posting-list
+# intersection instead of a scan over every user's matches. remove_diacritics makes Vietnamese
+# queries match with or without accents.
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS summary_search USING fts5(
+        owner, kind UNINDEXED, podcast_id UNINDEXED, section_id UNINDEXED, header UNINDEXED,
+        start_time UNINDEXED, end_time UNINDEXED, title, content,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+]
+# PostgreSQL: plain table with a generated, weighted tsvector and a GIN index
+POSTGRES_SEARCH_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS summary_search (
+        id BIGSERIAL PRIMARY KEY,
+        owner VARCHAR(36) NOT NULL,
+        kind VARCHAR(10) NOT NULL,
+        podcast_id VARCHAR(36) NOT NULL REFERENCES podcasts(id) ON DELETE CASCADE,
+        section_id VARCHAR(36),
+        header VARCHAR(255),
+        start_time DOUBLE PRECISION,
+        end_time DOUBLE PRECISION,
+        title TEXT,
+        content TEXT,
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+        ) STORED
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_summary_search_document ON summary_search USING GIN (document)",
+    "CREATE INDEX IF NOT EXISTS ix_summary_search_owner ON summary_search (owner)",
+]
+
+SQLITE_SEARCH_QUERY = f"""
+    SELECT s.kind, s.podcast_id, s.header, s.start_time, s.end_time, s.title, p.title AS podcast_title,
+           snippet(summary_search, 8, '<b>', '</b>', '…', {SEARCH_SNIPPET_TOKENS}) AS snippet,
+           -bm25(summary_search, 0, 0, 0, 0, 0, 0, 0, {SEARCH_TITLE_WEIGHT}, 1.0) AS score
+    FROM summary_search s
+    JOIN podcasts p ON p.id = s.podcast_id
+    WHERE summary_search MATCH :match
+    ORDER BY score DESC
+    LIMIT :limit OFFSET :offset
+"""
+POSTGRES_SEARCH_QUERY = f"""
+    SELECT s.kind, s.podcast_id, s.header, s.start_time, s.end_time, s.title, p.title AS podcast_title,
+           ts_headline('simple', coalesce(s.content, ''), q,
+                       'StartSel=<b>, StopSel=</b>, MaxFragments=1, MaxWords={SEARCH_SNIPPET_TOKENS}, MinWords=6') AS snippet,
+           ts_rank(s.document, q) AS score
+    FROM summary_search s
+    JOIN podcasts p ON p.id = s.podcast_id,
+         to_tsquery('simple', :tsquery) q
+    WHERE s.owner = :owner AND s.document @@ q
+    ORDER BY score DESC
+    LIMIT :limit OFFSET :offset
+"""
+
+
+# Set by init_search_index; saves skip indexing while the index does not exist
+_search_index_ready = False
+
+
+class SearchUnavailableError(RuntimeError):
+    """Raised when the database has no full-text index (unsupported dialect or SQLite without FTS5)."""
+
+
+def _dialect(bind: Any) -> str:
+    return bind.dialect.name
+
+
+def _owner(dialect: str, userid: str) -> str:
+    # FTS5 would split a UUID on '-', so SQLite stores it as a single token
+    return "u" + userid.replace("-", "") if dialect == "sqlite" else userid
+
+
+def query_tokens(query: str) -> List[str]:
+    """Words of a free-text query; everything else (FTS operators, quotes) is dropped."""
+    return _TOKEN_PATTERN.findall(query.lower())
+
+
+# ========================
+# Index maintenance
+# ========================
+def init_search_index(engine: Engine) -> bool:
+    """
+    Create the full-text index if it does not exist and fill it from the saved summaries.
+
+    Returns:
+        False if full-text search is not available on this database
+    """
+    global _search_index_ready
+    dialect = _dialect(engine)
+    ddl = {"sqlite": SQLITE_SEARCH_DDL, "postgresql": POSTGRES_SEARCH_DDL}.get(dialect)
+    if ddl is None:
+        print(f"Full-text search is not supported on {dialect}")
+        return False
+    try:
+        with engine.begin() as connection:
+            for statement in ddl:
+                connection.execute(text(statement))
+            indexed = connection.execute(text("SELECT count(*) FROM summary_search")).scalar()
+            if not indexed:
+                backfill_search_index(connection, dialect)
+        _search_index_ready = True
+        return True
+    except Exception as e:
+        print(f"Full-text search is unavailable: {e}")
+        return False
+
+
+def backfill_search_index(connection: Any, dialect: str) -> None:
+    owner = "'u' || replace(p.userid, '-', '')" if dialect == "sqlite" else "p.userid"
+    connection.execute(text(f"""
+        INSERT INTO summary_search (owner, kind, podcast_id, section_id, header, start_time, end_time, title, content)
+        SELECT {owner}, 'summary', p.id, NULL, NULL, NULL, NULL, p.title, coalesce(p.summarized_content, '')
+        FROM podcasts p
+    """))
+    connection.execute(text(f"""
+        INSERT INTO summary_search (owner, kind, podcast_id, section_id, header, start_time, end_time, title, content)
+        SELECT {owner}, 'section', h.podcast_id, h.id, h.header, h.start, h."end", h.title, h.content
+        FROM heading_section h JOIN podcasts p ON p.id = h.podcast_id
+    """))
+
+
+def index_podcast_summary(
+    db: Session,
+    userid: str,
+    podcast_id: str,
+    title: str,
+    overall_summarization: str,
+    headings: List[HeadingSection],
+    section_ids: List[str],
+) -> None:
+    """Add one saved summary to the index, inside the caller's transaction."""
+    if not _search_index_ready:
+        return
+    dialect = _dialect(db.get_bind())
+    owner = _owner(dialect, userid)
+    rows = [{
+        "owner": owner, "kind": "summary", "podcast_id": podcast_id, "section_id": None, "header": None,
+        "start_time": None, "end_time": None, "title": title, "content": overall_summarization or "",
+    }]
+    rows.extend({
+        "owner": owner, "kind": "section", "podcast_id": podcast_id, "section_id": section_id, "header": section.header,
+        "start_time": section.start, "end_time": section.end, "title": section.title, "content": section.content,
+    } for section, section_id in zip(headings, section_ids))
+    db.execute(text("""
+        INSERT INTO summary_search (owner, kind, podcast_id, section_id, header, start_time, end_time, title, content)
+        VALUES (:owner, :kind, :podcast_id, :section_id, :header, :start_time, :end_time, :title, :content)
+    """), rows)
+
+
+# ========================
+# Search
+# ========================
+async def search_summaries(
+    db: AsyncSession,
+    userid: str,
+    query: str,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[SummarySearchResult]:
+    """
+    Ranked full-text search over a user's summaries and sections.
+
+    Every word must match (in a title or content, accents ignored on SQLite); the last word also
+    matches as a prefix, for search-as-you-type.
+    """
+    tokens = query_tokens(query)
+    if not tokens:
+        return []
+
+    dialect = _dialect(db.get_bind())
+    owner = _owner(dialect, userid)
+    try:
+        if dialect == "sqlite":
+            terms = " ".join(f'"{token}"' for token in tokens) + "*"
+            params: Dict[str, Any] = {"match": f'owner:"{owner}" AND {{title content}}: ({terms})'}
+            sql = SQLITE_SEARCH_QUERY
+        elif dialect == "postgresql":
+            params = {"tsquery": " & ".join(tokens) + ":*", "owner": owner}
+            sql = POSTGRES_SEARCH_QUERY
+        else:
+            raise SearchUnavailableError(f"Full-text search is not supported on {dialect}")
+        result = await db.execute(text(sql), {**params, "limit": limit, "offset": offset})
+    except SearchUnavailableError:
+        raise
+    except Exception as e:
+        raise SearchUnavailableError(f"Full-text search failed: {str(e)}")
+
+    return [
+        SummarySearchResult(
+            podcast_id=row.podcast_id,
+            podcast_title=row.podcast_title,
+            kind=row.kind,
+            header=row.header,
+            title=row.title,
+            start=row.start_time,
+            end=row.end_time,
+            snippet=row.snippet,
+            score=row.score
+        )
+        for row in result
+    ]
@@ -0,0 +1,178 @@
+import os
+import re
+from typing import Any, Dict, List
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from models.podcast import HeadingSection, SemanticSearchResult
+from schemas.schema import PodcastSchema, HeadingSectionSchema, SectionEmbeddingSchema
+from utils.cache import TTLCache
+from utils.segmentation import get_miniLM, get_miniLM_name
+from utils.vector_index import MemmapVectorIndex
+
+SECTION_EMBEDDINGS_ENABLED = os.getenv("SECTION_EMBEDDINGS_ENABLED", "true").lower() == "true"
+# One float32 matrix file per embedding model lives in this directory
+SECTION_EMBEDDINGS_DIR = os.getenv("SECTION_EMBEDDINGS_DIR", "data/embeddings")
+EMBEDDING_BATCH_SIZE = 64
+
+_indexes: Dict[str, MemmapVectorIndex] = {}
+# Row indices of each user's sections, so a query does not hit the database before scoring
+_user_rows = TTLCache(maxsize=1024, ttl=300)
+
+
+def _section_text(title: str, content: str) -> str:
+    return f"{title.strip()}. {content.strip()}"
+
+
+def _get_index(model_name: str, dim: int) -> MemmapVectorIndex:
+    index = _indexes.get(model_name)
+    if index is None:
+        file_name = re.sub(r"[^\w.-]", "_", model_name) + ".f32"
+        index = _indexes.setdefault(model_name, MemmapVectorIndex(os.path.join(SECTION_EMBEDDINGS_DIR, file_name), dim))
+    return index
+
+
+def _encode(texts: List[str]) -> np.ndarray:
+    model = get_miniLM()
+    return model.encode(texts, batch_size=EMBEDDING_BATCH_SIZE, convert_to_numpy=True, normalize_embeddings=True).astype(np.float32)
+
+
+# ========================
+# Indexing
+# ========================
+def index_section_embeddings(
+    db: Session,
+    userid: str,
+    podcast_id: str,
+    headings: List[HeadingSection],
+    section_ids: List[str],
+) -> int:
+    """
+    Embed the sections of a saved summary once and append them to the embedding matrix.
+
+    Returns:
+        Number of sections indexed
+    """
+    if not SECTION_EMBEDDINGS_ENABLED or not headings:
+        return 0
+    model_name = get_miniLM_name()
+    vectors = _encode([_section_text(section.title, section.content) for section in headings])
+    index = _get_index(model_name, vectors.shape[1])
+    start_row = index.append(vectors)
+
+    # Rows appended without a mapping (e.g. a crash here) are never returned by a search
+    db.execute(insert(SectionEmbeddingSchema), [
+        {"row_index": start_row + i, "model": model_name, "section_id": section_id, "podcast_id": podcast_id, "userid": userid}
+        for i, section_id in enumerate(section_ids)
+    ])
+    db.commit()
+    _user_rows.pop((userid, model_name))
+    return len(section_ids)
+
+
+def backfill_section_embeddings(db: Session, batch_size: int = 512) -> int:
+    """Embed every saved section that has no vector for the current model yet."""
+    model_name = get_miniLM_name()
+    indexed = select(SectionEmbeddingSchema.section_id).where(SectionEmbeddingSchema.model == model_name)
+    total = 0
+    while True:
+        rows = db.execute(
+            select(HeadingSectionSchema.id, HeadingSectionSchema.podcast_id, HeadingSectionSchema.title,
+                   HeadingSectionSchema.content, PodcastSchema.userid)
+            .join(PodcastSchema, PodcastSchema.id == HeadingSectionSchema.podcast_id)
+            .where(HeadingSectionSchema.id.not_in(indexed))
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return total
+        vectors = _encode([_section_text(row.title, row.content) for row in rows])
+        start_row = _get_index(model_name, vectors.shape[1]).append(vectors)
+        db.execute(insert(SectionEmbeddingSchema), [
+            {"row_index": start_row + i, "model": model_name, "section_id": row.id, "podcast_id": row.podcast_id, "userid": row.userid}
+            for i, row in enumerate(rows)
+        ])
+        db.commit()
+        total += len(rows)
+        print(f"Embedded {total} sections")
+        _user_rows.clear()
+
+
+# ========================
+# Search
+# ========================
+def _rows_for_user(db: Session, userid: str, model_name: str) -> np.ndarray:
+    rows = _user_rows.get((userid, model_name))
+    if rows is None:
+        rows = np.fromiter(
+            db.execute(
+                select(SectionEmbeddingSchema.row_index)
+                .where(SectionEmbeddingSchema.userid == userid, SectionEmbeddingSchema.model == model_name)
+            ).scalars(),
+            dtype=np.int64
+        )
+        _user_rows.set((userid, model_name), rows)
+    return rows
+
+
+def semantic_search(db: Session, userid: str, query: str, k: int = 10) -> List[SemanticSearchResult]:
+    """
+    Top-k sections of the user's library for a natural-language query (cosine similarity of MiniLM embeddings).
+    """
+    model_name = get_miniLM_name()
+    rows = _rows_for_user(db, userid, model_name)
+    if not len(rows) or not query.strip():
+        return []
+
+    query_vector = _encode([query.strip()])[0]
+    index = _get_index(model_name, query_vector.shape[0])
+    top_rows, scores = index.search(query_vector, rows, k)
+    if not len(top_rows):
+        return []
+
+    details: Dict[int, Any] = {
+        row.row_index: row
+        for row in db.execute(
+            select(SectionEmbeddingSchema.row_index, HeadingSectionSchema.podcast_id, HeadingSectionSchema.header,
+                   HeadingSectionSchema.title, HeadingSectionSchema.content, HeadingSectionSchema.start,
+                   HeadingSectionSchema.end, PodcastSchema.title.label("podcast_title"))
+            .join(HeadingSectionSchema, HeadingSectionSchema.id == SectionEmbeddingSchema.section_id)
+            .join(PodcastSchema, PodcastSchema.id == HeadingSectionSchema.podcast_id)
+            .where(SectionEmbeddingSchema.model == model_name, SectionEmbeddingSchema.row_index.in_(top_rows.tolist()))
+        )
+    }
+    return [
+        SemanticSearchResult(
+            podcast_id=details[row].podcast_id,
+            podcast_title=details[row].podcast_title,
+            header=details[row].header,
+            title=details[row].title,
+            content=details[row].content,
+            start=details[row].start,
+            end=details[row].end,
+            score=float(score)
+        )
+        for row, score in zip(top_rows.tolist(), scores)
+        if row in details
+    ]
+
+
+def get_section_embedding_stats() -> Dict[str, Any]:
+    return {
+        "enabled": SECTION_EMBEDDINGS_ENABLED,
+        "indexes": [
+            {"model": model_name, "path": index.path, "rows": len(index), "dim": index.dim,
+             "bytes": len(index) * index.row_bytes}
+            for model_name, index in _indexes.items()
+        ],
+        "user_rows_cache": _user_rows.stats(),
+    }
+
+
+if __name__ == "__main__":
+    # Embed sections saved before semantic search was enabled: python -m service.semantic_search_service
+    from database import SessionLocal
+    session = SessionLocal()
+    try:
+        print(f"Embedded {backfill_section_embeddings(session)} sections in total")
+    finally:
+        session.close()
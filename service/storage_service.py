@@ -0,0 +1,290 @@
+import os
+import time
+import shutil
+import threading
+import subprocess
+from dataclasses import dataclass
+from datetime import timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from database import SessionLocal
+from schemas.schema import PodcastSchema, TranscriptCacheSchema
+from service.pipeline_service import UPLOAD_DIR, EVICTED_AUDIO_PATH
+
+# Total bytes kept in UPLOAD_DIR; least recently used files are deleted above it (0 = no quota)
+STORAGE_QUOTA_MB = int(os.getenv("STORAGE_QUOTA_MB", 10240))
+# Files not used for this long are deleted regardless of the quota (0 = keep forever)
+STORAGE_MAX_AGE_DAYS = float(os.getenv("STORAGE_MAX_AGE_DAYS", 30))
+# Files younger than this may belong to a pipeline that is still running and are never touched
+STORAGE_GRACE_HOURS = float(os.getenv("STORAGE_GRACE_HOURS", 6))
+# Files not used for this long are re-encoded to low-bitrate mono Opus (0 = disabled)
+STORAGE_COMPACT_AFTER_DAYS = float(os.getenv("STORAGE_COMPACT_AFTER_DAYS", 0))
+STORAGE_COMPACT_BITRATE = os.getenv("STORAGE_COMPACT_BITRATE", "24k")
+STORAGE_SWEEP_INTERVAL_SECONDS = int(os.getenv("STORAGE_SWEEP_INTERVAL_SECONDS", 3600))
+
+COMPACT_SUFFIX = ".compact.ogg"
+
+_sweep_lock = threading.Lock()
+_stop_event = threading.Event()
+_sweeper: Optional[threading.Thread] = None
+_totals = {"sweeps": 0, "evicted_files": 0, "evicted_bytes": 0, "compacted_files": 0, "compacted_bytes_saved": 0}
+_last_sweep: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class StoredFile:
+    path: str
+    size: int
+    modified_at: float
+    last_used_at: float
+    # audio_path values (as stored) that point at this file; empty for orphans
+    references: Set[str]
+
+
+# ========================
+# Inventory
+# ========================
+def _normalize(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _referenced_paths(db: Session) -> Dict[str, Tuple[Set[str], float]]:
+    """Files referenced by a podcast or the transcript cache: their stored audio_path values and last cache access."""
+    references: Dict[str, Tuple[Set[str], float]] = {}
+
+    def add(path: str, accessed: float) -> None:
+        paths, last_accessed = references.setdefault(_normalize(path), (set(), 0.0))
+        paths.add(path)
+        references[_normalize(path)] = (paths, max(last_accessed, accessed))
+
+    for path in db.execute(select(PodcastSchema.audio_path).where(PodcastSchema.audio_path != EVICTED_AUDIO_PATH).distinct()).scalars():
+        add(path, 0.0)
+    for path, last_accessed_at in db.execute(
+        select(TranscriptCacheSchema.audio_path, TranscriptCacheSchema.last_accessed_at).where(TranscriptCacheSchema.audio_path != EVICTED_AUDIO_PATH)
+    ):
+        # last_accessed_at is naive UTC (CURRENT_TIMESTAMP); file mtimes are epoch seconds
+        add(path, last_accessed_at.replace(tzinfo=timezone.utc).timestamp() if last_accessed_at is not None else 0.0)
+    return references
+
+
+def scan_storage(db: Session, directory: str = UPLOAD_DIR) -> List[StoredFile]:
+    """Every file in the audio store, least recently used first."""
+    if not os.path.isdir(directory):
+        return []
+    references = _referenced_paths(db)
+    files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            paths, last_accessed = references.get(_normalize(entry.path), (set(), 0.0))
+            files.append(StoredFile(
+                path=entry.path,
+                size=stat.st_size,
+                modified_at=stat.st_mtime,
+                # A transcript cache hit counts as a use of its audio
+                last_used_at=max(stat.st_mtime, last_accessed),
+                references=paths
+            ))
+    files.sort(key=lambda stored: stored.last_used_at)
+    return files
+
+
+# ========================
+# Eviction and compaction
+# ========================
+def _delete(stored: StoredFile) -> bool:
+    try:
+        os.remove(stored.path)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        print(f"Failed deleting {stored.path}: {e}")
+        return False
+
+
+def _repoint(db: Session, stored: StoredFile, new_path) -> bool:
+    """Point every reference to a file at new_path(old audio_path) in one transaction."""
+    try:
+        for path in stored.references:
+            for table in (PodcastSchema, TranscriptCacheSchema):
+                db.execute(update(table).where(table.audio_path == path).values(audio_path=new_path(path)))
+        db.commit()
+        return True
+    except Exception as e:
+        db.rollback()
+        print(f"Failed repointing {stored.path}: {e}")
+        return False
+
+
+def _release(db: Session, stored: StoredFile) -> bool:
+    """Delete a file, first marking the podcasts and cache entries that use it as having no audio."""
+    if stored.references and not _repoint(db, stored, lambda path: EVICTED_AUDIO_PATH):
+        return False
+    # Unreferenced from here on: if the delete fails, the next sweep removes it as an orphan
+    return _delete(stored)
+
+
+def _compact(db: Session, stored: StoredFile) -> Optional[int]:
+    """Re-encode one file to mono Opus, repoint its references and return the bytes saved."""
+    base, _ = os.path.splitext(stored.path)
+    target = base + COMPACT_SUFFIX
+    try:
+        subprocess.run(
+            ["ffmpeg", "-loglevel", "error", "-y", "-i", stored.path, "-ac", "1", "-ar", "16000",
+             "-c:a", "libopus", "-b:a", STORAGE_COMPACT_BITRATE, "-application", "voip", target],
+            check=True, capture_output=True
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Failed compacting {stored.path}: {e}")
+        if os.path.exists(target):
+            os.remove(target)
+        return None
+
+    compact_size = os.path.getsize(target)
+    if compact_size >= stored.size:
+        os.remove(target)
+        return None
+    # Keep the old mtime so compaction does not count as a use
+    os.utime(target, (stored.last_used_at, stored.modified_at))
+    if not _repoint(db, stored, lambda path: os.path.splitext(path)[0] + COMPACT_SUFFIX):
+        os.remove(target)
+        return None
+    _delete(stored)
+    return stored.size - compact_size
+
+
+def sweep_storage(db: Session, now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Apply the storage policy to the audio store once.
+
+    In order: unreferenced files (failed or abandoned downloads) past the grace period are deleted,
+    files unused for STORAGE_MAX_AGE_DAYS are deleted, cold files are compacted when enabled, and
+    the least recently used files are deleted until the store fits STORAGE_QUOTA_MB. Saved
+    summaries never read their audio again; before a referenced file is deleted, its podcasts and
+    transcript cache entries get EVICTED_AUDIO_PATH in the same transaction, so no row keeps
+    pointing at a missing file and cached transcripts stay usable.
+    """
+    global _last_sweep
+    with _sweep_lock:
+        started = time.perf_counter()
+        now = now or time.time()
+        grace_cutoff = now - STORAGE_GRACE_HOURS * 3600
+        files = [stored for stored in scan_storage(db) if stored.modified_at < grace_cutoff]
+        result = {"scanned_files": len(files), "evicted_files": 0, "evicted_bytes": 0, "compacted_files": 0, "compacted_bytes_saved": 0}
+
+        def evict(stored: StoredFile, reason: str) -> bool:
+            if not _release(db, stored):
+                return False
+            result["evicted_files"] += 1
+            result["evicted_bytes"] += stored.size
+            print(f"Evicted {stored.path} ({stored.size / 1e6:.1f} MB, {reason})")
+            return True
+
+        kept = []
+        for stored in files:
+            if not stored.references:
+                evict(stored, "unreferenced")
+            elif STORAGE_MAX_AGE_DAYS and stored.last_used_at < now - STORAGE_MAX_AGE_DAYS * 86400:
+                evict(stored, "expired")
+            else:
+                kept.append(stored)
+
+        if STORAGE_COMPACT_AFTER_DAYS:
+            compact_cutoff = now - STORAGE_COMPACT_AFTER_DAYS * 86400
+            for stored in kept:
+                if stored.last_used_at < compact_cutoff and not stored.path.endswith(COMPACT_SUFFIX):
+                    saved = _compact(db, stored)
+                    if saved is not None:
+                        result["compacted_files"] += 1
+                        result["compacted_bytes_saved"] += saved
+                        stored.path = os.path.splitext(stored.path)[0] + COMPACT_SUFFIX
+                        stored.size -= saved
+                        stored.references = {os.path.splitext(path)[0] + COMPACT_SUFFIX for path in stored.references}
+
+        if STORAGE_QUOTA_MB:
+            # Files inside the grace period still take up space but are never evicted
+            used = sum(stored.size for stored in scan_storage(db))
+            quota = STORAGE_QUOTA_MB * 1024 * 1024
+            for stored in kept:
+                if used <= quota:
+                    break
+                if evict(stored, "over quota"):
+                    used -= stored.size
+
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        result["finished_at"] = now
+        _last_sweep = result
+        _totals["sweeps"] += 1
+        for key in ("evicted_files", "evicted_bytes", "compacted_files", "compacted_bytes_saved"):
+            _totals[key] += result[key]
+        return result
+
+
+# ========================
+# Periodic sweep
+# ========================
+def _sweep_loop() -> None:
+    while not _stop_event.wait(STORAGE_SWEEP_INTERVAL_SECONDS):
+        db = SessionLocal()
+        try:
+            sweep_storage(db)
+        except Exception as e:
+            print(f"Storage sweep failed: {e}")
+        finally:
+            db.close()
+
+
+def start_storage_sweeper() -> None:
+    global _sweeper
+    if not STORAGE_SWEEP_INTERVAL_SECONDS or (_sweeper is not None and _sweeper.is_alive()):
+        return
+    _stop_event.clear()
+    _sweeper = threading.Thread(target=_sweep_loop, name="storage-sweeper", daemon=True)
+    _sweeper.start()
+
+
+def shutdown_storage_sweeper() -> None:
+    global _sweeper
+    _stop_event.set()
+    if _sweeper is not None:
+        _sweeper.join(timeout=5)
+        _sweeper = None
+
+
+# ========================
+# Metrics
+# ========================
+def get_storage_stats(db: Session) -> Dict[str, Any]:
+    files = scan_storage(db)
+    referenced = [stored for stored in files if stored.references]
+    stats = {
+        "directory": UPLOAD_DIR,
+        "files": len(files),
+        "bytes": sum(stored.size for stored in files),
+        "referenced_files": len(referenced),
+        "referenced_bytes": sum(stored.size for stored in referenced),
+        "compacted_files": sum(1 for stored in files if stored.path.endswith(COMPACT_SUFFIX)),
+        "oldest_use": min((stored.last_used_at for stored in files), default=None),
+        "quota_bytes": STORAGE_QUOTA_MB * 1024 * 1024 or None,
+        "max_age_days": STORAGE_MAX_AGE_DAYS or None,
+        "compact_after_days": STORAGE_COMPACT_AFTER_DAYS or None,
+        "last_sweep": _last_sweep,
+        "totals": dict(_totals),
+    }
+    if os.path.isdir(UPLOAD_DIR):
+        disk = shutil.disk_usage(UPLOAD_DIR)
+        stats["disk"] = {"total_bytes": disk.total, "used_bytes": disk.used, "free_bytes": disk.free}
+    return stats
+
+
+if __name__ == "__main__":
+    # One sweep with the configured policy: python -m service.storage_service
+    session = SessionLocal()
+    try:
+        print(sweep_storage(session))
+    finally:
+        session.close()
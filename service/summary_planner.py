@@ -0,0 +1,139 @@
+import os
+import math
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from models.podcast import SummaryTokenUsage
+from service.GPT_service import (
+    SUMMARY_MODEL, MAP_REDUCE_TEMPERATURE, MAP_REDUCE_CONCURRENCY, MAP_REDUCE_CONTEXT_TOKENS,
+    MAP_PROMPT, REDUCE_PROMPT, HEADING_SUMMARY_SYSTEM_PROMPT, BASE_PODCAST_SUMMARY_PROMPT,
+    format_heading_transcript, heading_summary_messages, request_heading_summary,
+    summary_cache_key, get_cached_summary, cache_summary,
+)
+from service.map_reduce_service import map_reduce_summarize
+from utils.tokens import count_tokens
+
+# Above this many prompt tokens the single-call prompt is replaced by a hierarchical plan
+SUMMARY_SINGLE_CALL_MAX_TOKENS = int(os.getenv("SUMMARY_SINGLE_CALL_MAX_TOKENS", 30000))
+# Transcript tokens given to each section call of a hierarchical plan
+SUMMARY_SECTION_MAX_TOKENS = int(os.getenv("SUMMARY_SECTION_MAX_TOKENS", 8000))
+# Expected size of one section summary, used to estimate the reduce step
+SECTION_SUMMARY_TOKENS = 400
+
+
+@dataclass
+class SummaryPlan:
+    strategy: str
+    estimated_prompt_tokens: int
+    sections: List[str]
+    max_llm_calls: int
+    max_sequential_rounds: int
+
+
+@dataclass
+class SummaryResult:
+    text: str
+    plan: SummaryPlan
+    usage: SummaryTokenUsage
+    wall_time: float
+
+
+def _split_sections(segments: List[Dict[str, str]], max_tokens: int) -> List[str]:
+    """Cut the transcript into consecutive, time-ordered sections of at most `max_tokens` each."""
+    sections, lines, tokens = [], [], 0
+    for seg in segments:
+        line = format_heading_transcript([seg])
+        line_tokens = count_tokens(line, SUMMARY_MODEL) + 1
+        if lines and tokens + line_tokens > max_tokens:
+            sections.append("\n".join(lines))
+            lines, tokens = [], 0
+        lines.append(line)
+        tokens += line_tokens
+    if lines:
+        sections.append("\n".join(lines))
+    return sections
+
+
+def plan_summary(segments: List[Dict[str, str]], target_language: str) -> SummaryPlan:
+    """
+    Measure the single-call prompt with the local tokenizer and choose how to summarize.
+
+    Short transcripts keep the single GPT call. Longer ones are summarized section by section
+    (in parallel, time-ordered) and the section summaries are then summarized, which bounds both
+    the size of every prompt and the number of sequential LLM round trips.
+    """
+    transcript = format_heading_transcript(segments)
+    messages = heading_summary_messages(transcript, target_language)
+    single_tokens = sum(count_tokens(message["content"], SUMMARY_MODEL) for message in messages)
+    if single_tokens <= SUMMARY_SINGLE_CALL_MAX_TOKENS:
+        return SummaryPlan("single", single_tokens, [transcript], max_llm_calls=1, max_sequential_rounds=1)
+
+    sections = _split_sections(segments, SUMMARY_SECTION_MAX_TOKENS)
+    system_tokens = count_tokens(HEADING_SUMMARY_SYSTEM_PROMPT.format(language=target_language), SUMMARY_MODEL)
+    map_overhead = count_tokens(MAP_PROMPT.format(text=""), SUMMARY_MODEL) + system_tokens
+    reduce_overhead = count_tokens(REDUCE_PROMPT.format(text="", language=target_language), SUMMARY_MODEL) + system_tokens
+    estimated = sum(count_tokens(section, SUMMARY_MODEL) + map_overhead for section in sections)
+
+    # Simulate the tree reduce with the expected summary size to bound calls and rounds
+    calls, rounds = len(sections), math.ceil(len(sections) / MAP_REDUCE_CONCURRENCY)
+    summaries = len(sections)
+    per_batch = max(1, MAP_REDUCE_CONTEXT_TOKENS // SECTION_SUMMARY_TOKENS)
+    while summaries > 1 and summaries * SECTION_SUMMARY_TOKENS > MAP_REDUCE_CONTEXT_TOKENS and per_batch > 1:
+        batches = math.ceil(summaries / per_batch)
+        estimated += summaries * SECTION_SUMMARY_TOKENS + batches * map_overhead
+        calls += batches
+        rounds += math.ceil(batches / MAP_REDUCE_CONCURRENCY)
+        summaries = batches
+    estimated += summaries * SECTION_SUMMARY_TOKENS + reduce_overhead
+
+    return SummaryPlan("hierarchical", estimated, sections, max_llm_calls=calls + 1, max_sequential_rounds=rounds + 1)
+
+
+def summarize_transcript(segments: List[Dict[str, str]], target_language: str, plan: Optional[SummaryPlan] = None) -> SummaryResult:
+    """
+    Summarize a transcript with the plan chosen by plan_summary (or an already computed `plan`).
+
+    Returns:
+        The raw LLM text (same heading format for both strategies), the plan and the
+        estimated vs. actual token usage of this request
+    """
+    start = time.time()
+    plan = plan or plan_summary(segments, target_language)
+    print(f"[summary-plan] {plan.strategy}: ~{plan.estimated_prompt_tokens} prompt tokens, "
+          f"{len(plan.sections)} section(s), <= {plan.max_llm_calls} calls in <= {plan.max_sequential_rounds} round(s)")
+
+    if plan.strategy == "single":
+        text, usage = request_heading_summary(segments, target_language)
+        usage.estimated_prompt_tokens = plan.estimated_prompt_tokens
+        return SummaryResult(text, plan, usage, time.time() - start)
+
+    cache_key = summary_cache_key(
+        f"hierarchical:{SUMMARY_SECTION_MAX_TOKENS}", "\n".join(plan.sections), target_language, SUMMARY_MODEL,
+        MAP_REDUCE_TEMPERATURE, MAP_PROMPT, REDUCE_PROMPT, HEADING_SUMMARY_SYSTEM_PROMPT, BASE_PODCAST_SUMMARY_PROMPT
+    )
+    cached = get_cached_summary(cache_key)
+    if cached is not None:
+        usage = SummaryTokenUsage(strategy=plan.strategy, estimated_prompt_tokens=plan.estimated_prompt_tokens, cached=True)
+        return SummaryResult(cached, plan, usage, time.time() - start)
+
+    result = asyncio.run(map_reduce_summarize(
+        plan.sections,
+        map_prompt=MAP_PROMPT.strip(),
+        reduce_prompt=REDUCE_PROMPT.strip(),
+        target_language=target_language,
+        model=SUMMARY_MODEL,
+        temperature=MAP_REDUCE_TEMPERATURE,
+        concurrency=MAP_REDUCE_CONCURRENCY,
+        context_tokens=MAP_REDUCE_CONTEXT_TOKENS,
+        system_prompt=HEADING_SUMMARY_SYSTEM_PROMPT.format(language=target_language),
+    ))
+    cache_summary(cache_key, result.output_text)
+    usage = SummaryTokenUsage(
+        strategy=plan.strategy,
+        estimated_prompt_tokens=plan.estimated_prompt_tokens,
+        prompt_tokens=result.prompt_tokens,
+        completion_tokens=result.completion_tokens,
+        llm_calls=len(result.reports)
+    )
+    return SummaryResult(result.output_text, plan, usage, time.time() - start)
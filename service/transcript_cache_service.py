@@ -0,0 +1,142 @@
+import os
+import json
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from schemas.schema import TranscriptCacheSchema
+from utils.youtube import extract_youtube_video_id
+
+TRANSCRIPT_CACHE_MAX_ENTRIES = int(os.getenv("TRANSCRIPT_CACHE_MAX_ENTRIES", 500))
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+@dataclass
+class CachedTranscript:
+    source_key: str
+    podcast_type: str
+    title: str
+    thumbnail_url: str
+    audio_path: str
+    transcript: str
+    segments: List[Dict[str, Any]]
+    duration: Optional[float]
+
+
+# ========================
+# Source URL normalization
+# ========================
+def canonicalize_url(url: str) -> str:
+    """Lower-case scheme and host, drop fragments, default ports and utm_* tracking parameters."""
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = (parsed.hostname or "").lower()
+    if parsed.port and not ((scheme == "http" and parsed.port == 80) or (scheme == "https" and parsed.port == 443)):
+        netloc = f"{netloc}:{parsed.port}"
+    query = sorted((key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True) if not key.lower().startswith("utm_"))
+    return urlunparse((scheme, netloc, parsed.path or "/", "", urlencode(query), ""))
+
+
+def normalize_source_url(url: str) -> str:
+    """
+    Build a stable cache key for a submitted podcast link.
+
+    YouTube links collapse to their video id, so watch/short/share URLs of the same video share one key.
+    """
+    video_id = extract_youtube_video_id(url)
+    if video_id:
+        return f"youtube:{video_id}"
+    return f"url:{canonicalize_url(url)}"
+
+
+def normalize_enclosure_url(audio_url: str) -> str:
+    return f"rss:{canonicalize_url(audio_url)}"
+
+
+# ========================
+# Cache access
+# ========================
+def get_cached_transcript(db: Session, source_key: str) -> Optional[CachedTranscript]:
+    entry = db.query(TranscriptCacheSchema).filter(TranscriptCacheSchema.source_key == source_key).first()
+    if entry is None:
+        with _stats_lock:
+            _stats["misses"] += 1
+        return None
+
+    entry.hit_count = (entry.hit_count or 0) + 1
+    entry.last_accessed_at = func.now()
+    db.commit()
+    with _stats_lock:
+        _stats["hits"] += 1
+
+    return CachedTranscript(
+        source_key=entry.source_key,
+        podcast_type=entry.podcast_type,
+        title=entry.title,
+        thumbnail_url=entry.thumbnail_url,
+        audio_path=entry.audio_path,
+        transcript=entry.transcript,
+        segments=json.loads(entry.segments),
+        duration=entry.duration
+    )
+
+
+def store_transcript(
+    db: Session,
+    source_key: str,
+    source_url: str,
+    podcast_type: str,
+    title: str,
+    thumbnail_url: str,
+    audio_path: str,
+    transcript: str,
+    segments: List[Dict[str, Any]],
+    transcribe_time: float,
+) -> None:
+    """Insert or replace the cached transcript of a source, then evict the least recently used entries over the limit."""
+    db.merge(TranscriptCacheSchema(
+        source_key=source_key,
+        source_url=source_url,
+        podcast_type=podcast_type,
+        title=title,
+        thumbnail_url=thumbnail_url,
+        audio_path=audio_path,
+        transcript=transcript,
+        segments=json.dumps(segments, default=float),
+        duration=segments[-1]["end"] if segments else 0,
+        transcribe_time=transcribe_time,
+        hit_count=0
+    ))
+    db.commit()
+    evict_transcripts(db)
+
+
+def evict_transcripts(db: Session, max_entries: int = TRANSCRIPT_CACHE_MAX_ENTRIES) -> int:
+    overflow = db.query(TranscriptCacheSchema).count() - max_entries
+    if overflow <= 0:
+        return 0
+
+    stale_keys = [
+        key for (key,) in db.query(TranscriptCacheSchema.source_key)
+        .order_by(TranscriptCacheSchema.last_accessed_at.asc())
+        .limit(overflow)
+    ]
+    db.query(TranscriptCacheSchema).filter(TranscriptCacheSchema.source_key.in_(stale_keys)).delete(synchronize_session=False)
+    db.commit()
+    with _stats_lock:
+        _stats["evictions"] += len(stale_keys)
+    return len(stale_keys)
+
+
+def get_transcript_cache_stats(db: Session) -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    stats["entries"] = db.query(TranscriptCacheSchema).count()
+    stats["max_entries"] = TRANSCRIPT_CACHE_MAX_ENTRIES
+    return stats
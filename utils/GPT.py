@@ -2,28 +2,87 @@ import re
 from models.podcast import HeadingSection
 from typing import List, Tuple
 
+HEADING_PATTERN = re.compile(
+    r"Heading\s+(\d+)\s*-\s*(.*?)\s*-\s*([\d.]+)\s*-\s*([\d.]+)\s*\n"
+    r"(.*?)(?=(?:\n+Heading\s+\d+\s*-)|(?:\n+Overall\b)|\Z)",
+    flags=re.DOTALL
+)
+# Lookahead alternatives of HEADING_PATTERN that close a heading before the end of the text
+HEADING_TERMINATOR_PATTERN = re.compile(r"\n+(?:Heading\s+\d+\s*-|Overall\b)")
+OVERALL_PATTERN = re.compile(r"\bOverall\b\s*\n+(.*)", flags=re.DOTALL)
+
+
+def _to_heading_section(number: str, title: str, start: str, end: str, content: str) -> HeadingSection:
+    return HeadingSection(
+        header=f"Heading {number}",
+        title=title.strip(),
+        start=float(start),
+        end=float(end),
+        content=content.strip()
+    )
+
 
 def parse_headings_and_overall(text: str) -> Tuple[List[HeadingSection], str]:
     # Cập nhật regex để match chính xác phần heading
-    heading_pattern = (
-        r"Heading\s+(\d+)\s*-\s*(.*?)\s*-\s*([\d.]+)\s*-\s*([\d.]+)\s*\n"
-        r"(.*?)(?=(?:\n+Heading\s+\d+\s*-)|(?:\n+Overall\b)|\Z)"
-    )
-    heading_matches = re.findall(heading_pattern, text, flags=re.DOTALL)
+    heading_matches = HEADING_PATTERN.findall(text)
 
     heading_sections = [
-        HeadingSection(
-            header=f"Heading {number}",
-            title=title.strip(),
-            start=float(start),
-            end=float(end),
-            content=content.strip()
-        )
+        _to_heading_section(number, title, start, end, content)
         for number, title, start, end, content in heading_matches
     ]
 
     # Parse phần Overall (cho phép 1 hoặc nhiều dòng trắng)
-    overall_match = re.search(r"\bOverall\b\s*\n+(.*)", text, flags=re.DOTALL)
+    overall_match = OVERALL_PATTERN.search(text)
     overall_summary = overall_match.group(1).strip() if overall_match else ""
 
     return heading_sections, overall_summary
+
+
+class HeadingStreamParser:
+    """
+    Incremental counterpart of parse_headings_and_overall for streamed LLM output.
+
+    feed() returns every heading whose block is complete (the next `Heading n -` or `Overall`
+    line has arrived) and the new part of the overall summary. A heading is only emitted once
+    more text can no longer change it, so the emitted headings are the same as the ones
+    parse_headings_and_overall returns for the full text; finish() returns exactly that result.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.emitted = 0
+        self._offset = 0
+        self._overall_start = None
+        self._overall_sent = 0
+
+    def feed(self, delta: str) -> Tuple[List[HeadingSection], str]:
+        self.text += delta
+        return self._complete_headings(), self._overall_delta()
+
+    def finish(self) -> Tuple[List[HeadingSection], str]:
+        return parse_headings_and_overall(self.text)
+
+    def _complete_headings(self) -> List[HeadingSection]:
+        headings = []
+        # Matches never overlap, so scanning can resume after the last emitted heading
+        for match in HEADING_PATTERN.finditer(self.text, self._offset):
+            terminator = HEADING_TERMINATOR_PATTERN.match(self.text, match.end())
+            # The block is closed only once its terminator is followed by more text (`\b`, `\s*-` are settled)
+            if terminator is None or terminator.end() >= len(self.text):
+                break
+            headings.append(_to_heading_section(*match.groups()))
+            self._offset = match.end()
+        self.emitted += len(headings)
+        return headings
+
+    def _overall_delta(self) -> str:
+        if self._overall_start is None:
+            match = OVERALL_PATTERN.search(self.text)
+            # Wait for the first non-blank character so the `\s*\n+` separator is complete
+            if match is None or not match.group(1).strip():
+                return ""
+            self._overall_start = match.start(1) + len(match.group(1)) - len(match.group(1).lstrip())
+            self._overall_sent = self._overall_start
+        delta = self.text[self._overall_sent:]
+        self._overall_sent = len(self.text)
+        return delta
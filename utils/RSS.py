@@ -1,37 +1,101 @@
 import re
-import requests
 import feedparser
+from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Dict, List, Optional, Tuple
+from utils.downloader import download_file
 
 
 # ========================
-# Download podcast from RSS
+# Resolve latest episode from RSS
 # ========================
-def download_RSS(rss_url: str, local_path: str, file_name: str) -> Tuple[str, str, str]:
-    try:
-        feed = feedparser.parse(rss_url)
-        if 'feed' not in feed or not feed.entries:
-            raise ValueError("RSS feed is empty or invalid.")
+def resolve_RSS_episode(rss_url: str) -> Tuple[str, str, str]:
+    """
+    Find the latest episode of an RSS feed.
+
+    Returns:
+        Tuple of (audio_url, thumbnail_url, episode_title)
+    """
+    feed = feedparser.parse(rss_url)
+    if 'feed' not in feed or not feed.entries:
+        raise ValueError("RSS feed is empty or invalid.")
+
+    episode = feed.entries[0]
+    episode_title = episode.get('title', 'Untitled Episode')
+    thumbnail_url = feed['feed'].get('image', {}).get('href', '')
+
+    audio_url = next((link.href for link in episode.links if link.type == 'audio/mpeg'), None)
+    if not audio_url:
+        raise ValueError("No audio/mpeg URL found in RSS.")
+
+    return audio_url, thumbnail_url, episode_title
+
+
+# ========================
+# Parse all episodes of a feed
+# ========================
+def find_enclosure(entry) -> Optional[Tuple[str, str]]:
+    """(url, MIME type) of an entry's audio enclosure, preferring audio/mpeg."""
+    candidates = [
+        (link.get('href'), link.get('type') or '')
+        for link in entry.get('links', [])
+        if link.get('href') and (link.get('rel') == 'enclosure' or (link.get('type') or '').startswith('audio/'))
+    ]
+    audio = [candidate for candidate in candidates if candidate[1].startswith('audio/')]
+    preferred = [candidate for candidate in audio if candidate[1] == 'audio/mpeg']
+    return (preferred or audio or candidates or [None])[0]
 
-        episode = feed.entries[0]
-        episode_title = episode.get('title', 'Untitled Episode')
-        thumbnail_url = feed['feed'].get('image', {}).get('href', '')
 
-        audio_url = next((link.href for link in episode.links if link.type == 'audio/mpeg'), None)
-        if not audio_url:
-            raise ValueError("No audio/mpeg URL found in RSS.")
+def parse_RSS_episodes(content: bytes) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Parse a feed document into its metadata and every episode that has an audio enclosure.
 
-        audio_path = Path(local_path) / f"{file_name}.mp3"
+    Returns:
+        Tuple of (feed dict with title and image_url, list of episode dicts in feed order)
+    """
+    feed = feedparser.parse(content)
+    if 'feed' not in feed or (feed.bozo and not feed.entries):
+        raise ValueError("RSS feed is empty or invalid.")
 
-        with requests.get(audio_url, stream=True) as r:
-            r.raise_for_status()
-            with open(audio_path, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
+    feed_image = feed['feed'].get('image', {}).get('href', '')
+    episodes = []
+    for entry in feed.entries:
+        enclosure = find_enclosure(entry)
+        if enclosure is None:
+            continue
+        audio_url, audio_type = enclosure
+        published = entry.get('published_parsed') or entry.get('updated_parsed')
+        episodes.append({
+            # Feeds without <guid> are identified by their enclosure
+            'guid': entry.get('id') or audio_url,
+            'title': entry.get('title', 'Untitled Episode'),
+            'audio_url': audio_url,
+            'audio_type': audio_type or None,
+            'image_url': entry.get('image', {}).get('href') or feed_image,
+            'published_at': datetime(*published[:6]) if published else None,
+            'duration': entry.get('itunes_duration'),
+        })
+    return {'title': feed['feed'].get('title'), 'image_url': feed_image}, episodes
 
-        return str(audio_path), thumbnail_url, episode_title, 'RSS'
+
+# ========================
+# Download RSS enclosure
+# ========================
+def download_RSS_audio(audio_url: str, local_path: str, file_name: str) -> str:
+    audio_path = Path(local_path) / f"{file_name}.mp3"
+    download_file(audio_url, str(audio_path))
+    return str(audio_path)
+
+
+# ========================
+# Download podcast from RSS
+# ========================
+def download_RSS(rss_url: str, local_path: str, file_name: str) -> Tuple[str, str, str, str]:
+    try:
+        audio_url, thumbnail_url, episode_title = resolve_RSS_episode(rss_url)
+        audio_path = download_RSS_audio(audio_url, local_path, file_name)
+        return audio_path, thumbnail_url, episode_title, 'RSS'
 
     except Exception as e:
         raise RuntimeError(f"Download from RSS failed: {str(e)}")
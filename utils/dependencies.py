@@ -2,15 +2,16 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from schemas.schema import User
-from database import get_db
+from models.user import UserPrincipal
+from database import get_async_db
 from service.auth_service import SECRET_KEY, ALGORITHM
+from service.principal_service import get_principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def auth_middleware(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def auth_middleware(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> UserPrincipal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -24,7 +25,8 @@ def auth_middleware(token: str = Depends(oauth2_scheme), db: Session = Depends(g
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.userid == userid).first()
+    # Cached for PRINCIPAL_CACHE_TTL_SECONDS; never loads the profile picture
+    user = await get_principal(db, userid)
     if user is None:
         raise credentials_exception
     return user
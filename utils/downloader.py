@@ -0,0 +1,303 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import fcntl
+except ImportError:  # Windows: part files are only locked within the process
+    fcntl = None
+
+# Parallel Range requests per download (1 = a single connection)
+DOWNLOAD_SEGMENTS = int(os.getenv("DOWNLOAD_SEGMENTS", 4))
+# Files are never split into segments smaller than this
+DOWNLOAD_MIN_SEGMENT_MB = float(os.getenv("DOWNLOAD_MIN_SEGMENT_MB", 4))
+DOWNLOAD_BUFFER_KB = int(os.getenv("DOWNLOAD_BUFFER_KB", 1024))
+DOWNLOAD_RETRIES = int(os.getenv("DOWNLOAD_RETRIES", 3))
+DOWNLOAD_TIMEOUT_SECONDS = float(os.getenv("DOWNLOAD_TIMEOUT_SECONDS", 30))
+# Resume state is saved after at least this many new bytes per segment
+CHECKPOINT_BYTES = 8 * 1024 * 1024
+
+# One connection pool for all enclosure downloads, sized for several parallel downloads
+http_session = requests.Session()
+http_session.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=max(DOWNLOAD_SEGMENTS, 1) * 4))
+http_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=max(DOWNLOAD_SEGMENTS, 1) * 4))
+
+_stats_lock = threading.Lock()
+_stats = {"downloads": 0, "ranged_downloads": 0, "bytes": 0, "resumed_bytes": 0, "seconds": 0.0, "retries": 0}
+_last_download: Optional[Dict[str, Any]] = None
+# One lock per part file: concurrent downloads of the same URL would otherwise write (and move) the same file
+_part_locks: Dict[str, threading.Lock] = {}
+_part_locks_lock = threading.Lock()
+
+
+class RangeNotSupportedError(RuntimeError):
+    """Raised when a server answers a Range request with the full body."""
+
+
+@dataclass
+class DownloadResult:
+    path: str
+    bytes: int
+    seconds: float
+    segments: int
+    resumed_bytes: int
+
+    @property
+    def throughput_mbps(self) -> float:
+        return (self.bytes - self.resumed_bytes) * 8 / 1e6 / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class _RemoteFile:
+    url: str
+    size: Optional[int]
+    ranges: bool
+    validator: Optional[str]
+
+
+# ========================
+# Probe
+# ========================
+def _probe(url: str) -> _RemoteFile:
+    """Follow redirects once and find the size, Range support and validator of a file."""
+    with http_session.get(url, headers={"Range": "bytes=0-0"}, stream=True, timeout=DOWNLOAD_TIMEOUT_SECONDS) as r:
+        r.raise_for_status()
+        validator = r.headers.get("ETag") or r.headers.get("Last-Modified")
+        content_range = r.headers.get("Content-Range", "")
+        if r.status_code == 206 and "/" in content_range and not content_range.endswith("/*"):
+            return _RemoteFile(r.url, int(content_range.rsplit("/", 1)[1]), True, validator)
+        length = r.headers.get("Content-Length")
+        return _RemoteFile(r.url, int(length) if length and length.isdigit() else None, False, validator)
+
+
+# ========================
+# Resume state
+# ========================
+def _part_paths(output_dir: str, url: str) -> Tuple[str, str]:
+    # Partial files are named after the URL, so a retried submission of the same episode resumes them
+    key = hashlib.sha1(url.encode()).hexdigest()[:20]
+    part_path = os.path.join(output_dir, f"download_{key}.part")
+    return part_path, part_path + ".json"
+
+
+@contextmanager
+def _locked_part(part_path: str) -> Iterator[None]:
+    """Hold the part file of a URL for a whole download, across threads and processes."""
+    with _part_locks_lock:
+        lock = _part_locks.setdefault(part_path, threading.Lock())
+    with lock, open(part_path + ".lock", "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _load_state(state_path: str, remote: _RemoteFile) -> Optional[List[List[int]]]:
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if state.get("size") != remote.size or state.get("validator") != remote.validator:
+        return None
+    return state.get("segments")
+
+
+def _save_state(state_path: str, remote: _RemoteFile, segments: List[List[int]]) -> None:
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"url": remote.url, "size": remote.size, "validator": remote.validator, "segments": segments}, f)
+    os.replace(tmp_path, state_path)
+
+
+def _split(size: int) -> List[List[int]]:
+    """[start, end (inclusive), bytes done] for each segment."""
+    count = max(1, min(DOWNLOAD_SEGMENTS, size // max(1, int(DOWNLOAD_MIN_SEGMENT_MB * 1024 * 1024))))
+    step = -(-size // count)
+    return [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
+
+
+# ========================
+# Ranged download
+# ========================
+def _fetch_segment(remote: _RemoteFile, part_path: str, segment: List[int], checkpoint, lock: threading.Lock) -> None:
+    start, end, _ = segment
+    attempt = 0
+    while segment[2] < end - start + 1:
+        offset = start + segment[2]
+        try:
+            headers = {"Range": f"bytes={offset}-{end}"}
+            # A file that changed since the probe comes back whole (200) instead of being mixed with the old one
+            if remote.validator and not remote.validator.startswith("W/"):
+                headers["If-Range"] = remote.validator
+            with http_session.get(remote.url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT_SECONDS) as r:
+                if r.status_code != 206:
+                    r.raise_for_status()
+                    raise RangeNotSupportedError(f"Expected 206 for a Range request, got {r.status_code} (ranges unsupported or file changed)")
+                with open(part_path, "r+b") as f:
+                    f.seek(offset)
+                    unsaved = 0
+                    for chunk in r.iter_content(chunk_size=DOWNLOAD_BUFFER_KB * 1024):
+                        chunk = chunk[:end - start + 1 - segment[2]]
+                        f.write(chunk)
+                        with lock:
+                            segment[2] += len(chunk)
+                        unsaved += len(chunk)
+                        if unsaved >= CHECKPOINT_BYTES:
+                            f.flush()
+                            checkpoint()
+                            unsaved = 0
+                    f.flush()
+            if segment[2] < end - start + 1:
+                raise ConnectionError("Connection closed before the end of the range")
+        except RangeNotSupportedError:
+            raise
+        except Exception as e:
+            attempt += 1
+            if attempt > DOWNLOAD_RETRIES:
+                raise
+            with _stats_lock:
+                _stats["retries"] += 1
+            print(f"Segment {start}-{end} failed at byte {start + segment[2]} ({e}), retrying")
+            time.sleep(min(2 ** attempt, 10))
+
+
+def _ranged_download(remote: _RemoteFile, part_path: str, state_path: str) -> Tuple[int, int]:
+    """Download into a preallocated part file with parallel Range requests; returns (segments, resumed bytes)."""
+    segments = _load_state(state_path, remote) if os.path.exists(part_path) else None
+    if segments is None:
+        segments = _split(remote.size)
+        with open(part_path, "wb") as f:
+            f.truncate(remote.size)
+    resumed = sum(done for _, _, done in segments)
+
+    lock = threading.Lock()
+
+    def checkpoint() -> None:
+        with lock:
+            snapshot = [list(segment) for segment in segments]
+            _save_state(state_path, remote, snapshot)
+
+    checkpoint()
+    errors = []
+
+    def run(segment: List[int]) -> None:
+        try:
+            _fetch_segment(remote, part_path, segment, checkpoint, lock)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(segment,), daemon=True) for segment in segments if segment[2] <= segment[1] - segment[0]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Keep what was downloaded so the next attempt resumes
+    checkpoint()
+    if errors:
+        raise errors[0]
+    return len(segments), resumed
+
+
+# ========================
+# Single-connection download
+# ========================
+def _stream_download(remote: _RemoteFile, part_path: str) -> int:
+    """Plain GET for servers without Range support (restarts from zero on failure); returns bytes."""
+    attempt = 0
+    while True:
+        try:
+            size = 0
+            with http_session.get(remote.url, stream=True, timeout=DOWNLOAD_TIMEOUT_SECONDS) as r:
+                r.raise_for_status()
+                # The file may have changed since the probe, so check against this response's length
+                length = r.headers.get("Content-Length")
+                expected = int(length) if length and length.isdigit() and "Content-Encoding" not in r.headers else None
+                with open(part_path, "wb") as f:
+                    for chunk in r.iter_content(chunk_size=DOWNLOAD_BUFFER_KB * 1024):
+                        f.write(chunk)
+                        size += len(chunk)
+            if expected is not None and size != expected:
+                raise ConnectionError(f"Got {size} of {expected} bytes")
+            return size
+        except Exception as e:
+            attempt += 1
+            if attempt > DOWNLOAD_RETRIES:
+                raise
+            with _stats_lock:
+                _stats["retries"] += 1
+            print(f"Download of {remote.url} failed ({e}), retrying")
+            time.sleep(min(2 ** attempt, 10))
+
+
+# ========================
+# Public API
+# ========================
+def download_file(url: str, target_path: str) -> DownloadResult:
+    """
+    Download a URL to `target_path` over the shared connection pool.
+
+    Servers that support Range requests are downloaded in up to DOWNLOAD_SEGMENTS parallel
+    segments into a partial file next to the target; each segment retries from where it stopped,
+    and a later call for the same URL resumes the partial file if the remote file is unchanged.
+    Other servers are downloaded over one connection. Concurrent calls for the same URL run one
+    after the other, since they share the partial file.
+    """
+    global _last_download
+    output_dir = os.path.dirname(target_path) or "."
+    os.makedirs(output_dir, exist_ok=True)
+    part_path, state_path = _part_paths(output_dir, url)
+
+    started = time.perf_counter()
+    with _locked_part(part_path):
+        remote = _probe(url)
+        segments, resumed = 1, 0
+        ranged = remote.ranges and remote.size and DOWNLOAD_SEGMENTS > 0
+        if ranged:
+            try:
+                segments, resumed = _ranged_download(remote, part_path, state_path)
+            except RangeNotSupportedError as e:
+                print(f"{e}; downloading {remote.url} over one connection")
+                ranged, segments, resumed = False, 1, 0
+        if not ranged:
+            _stream_download(remote, part_path)
+        os.replace(part_path, target_path)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+
+    result = DownloadResult(target_path, os.path.getsize(target_path), time.perf_counter() - started, segments, resumed)
+    print(
+        f"Downloaded {result.bytes / 1e6:.1f} MB in {result.seconds:.2f}s "
+        f"({result.throughput_mbps:.1f} Mbit/s, {segments} segment(s), {resumed / 1e6:.1f} MB resumed)"
+    )
+    with _stats_lock:
+        _stats["downloads"] += 1
+        _stats["ranged_downloads"] += 1 if ranged else 0
+        _stats["bytes"] += result.bytes - resumed
+        _stats["resumed_bytes"] += resumed
+        _stats["seconds"] += result.seconds
+        _last_download = {
+            "bytes": result.bytes, "seconds": round(result.seconds, 3), "segments": segments,
+            "resumed_bytes": resumed, "throughput_mbps": round(result.throughput_mbps, 2)
+        }
+    return result
+
+
+def get_download_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+        stats["last_download"] = _last_download
+    stats["throughput_mbps"] = round(stats["bytes"] * 8 / 1e6 / stats["seconds"], 2) if stats["seconds"] else 0.0
+    stats["seconds"] = round(stats["seconds"], 3)
+    stats["segments"] = DOWNLOAD_SEGMENTS
+    return stats
@@ -0,0 +1,135 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List
+
+MODEL_RAM_BUDGET_MB = float(os.getenv("MODEL_RAM_BUDGET_MB", 0))
+
+
+def estimate_model_memory(model: Any) -> int:
+    """
+    Best-effort size in bytes of a loaded model's parameters and buffers.
+
+    Works for torch modules (Whisper, SentenceTransformer) and for wrappers that keep one in
+    `client` / `_client` (HuggingFaceEmbeddings). Models that measure themselves (e.g. the
+    CTranslate2 Whisper backend) expose `memory_bytes`. Remote models such as ChatOllama count as 0.
+    """
+    if getattr(model, "memory_bytes", None):
+        return int(model.memory_bytes)
+    for candidate in (model, getattr(model, "client", None), getattr(model, "_client", None)):
+        if candidate is not None and hasattr(candidate, "parameters") and hasattr(candidate, "buffers"):
+            try:
+                tensors = list(candidate.parameters()) + list(candidate.buffers())
+                return sum(t.numel() * t.element_size() for t in tensors)
+            except Exception:
+                return 0
+    return 0
+
+
+class _ModelEntry:
+    def __init__(self, model: Any, load_time: float, memory_bytes: int):
+        self.model = model
+        self.load_time = load_time
+        self.memory_bytes = memory_bytes
+        self.loaded_at = time.time()
+        self.last_used_at = self.loaded_at
+        self.use_count = 0
+
+
+class ModelRegistry:
+    """
+    Process-wide store of loaded models.
+
+    Each model is loaded once, on first use, and shared by every request. When the summed
+    footprint of loaded models exceeds the RAM budget, the least recently used models are
+    dropped (callers still holding a reference keep using it until they finish).
+
+    Args:
+        budget_bytes: RAM budget for all loaded models, or 0 for no limit
+    """
+
+    def __init__(self, budget_bytes: int = 0):
+        self.budget_bytes = budget_bytes
+        self._entries: "OrderedDict[str, _ModelEntry]" = OrderedDict()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+    def get_or_load(self, name: str, loader: Callable[[], Any]) -> Any:
+        model = self._use(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+        with load_lock:
+            # Another request may have loaded it while we waited
+            model = self._use(name)
+            if model is not None:
+                return model
+
+            print(f"Loading model {name}...")
+            start = time.time()
+            model = loader()
+            load_time = time.time() - start
+            entry = _ModelEntry(model, load_time, estimate_model_memory(model))
+            entry.use_count = 1
+            print(f"Model {name} loaded in {load_time:.2f} seconds ({entry.memory_bytes / 2**20:.1f} MB)")
+
+            with self._lock:
+                self._entries[name] = entry
+                self._evict_over_budget(keep=name)
+            return model
+
+    def _use(self, name: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            entry.use_count += 1
+            entry.last_used_at = time.time()
+            self._entries.move_to_end(name)
+            return entry.model
+
+    def _evict_over_budget(self, keep: str) -> None:
+        if not self.budget_bytes:
+            return
+        while sum(e.memory_bytes for e in self._entries.values()) > self.budget_bytes:
+            victim = next((name for name in self._entries if name != keep), None)
+            if victim is None:
+                return
+            print(f"Evicting model {victim} to stay within the model RAM budget")
+            del self._entries[victim]
+            self._evictions += 1
+
+    def is_loaded(self, name: str) -> bool:
+        with self._lock:
+            return name in self._entries
+
+    def unload(self, name: str) -> None:
+        with self._lock:
+            self._entries.pop(name, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            models: List[Dict[str, Any]] = [
+                {
+                    "name": name,
+                    "load_time": entry.load_time,
+                    "memory_bytes": entry.memory_bytes,
+                    "use_count": entry.use_count,
+                    "loaded_at": entry.loaded_at,
+                    "last_used_at": entry.last_used_at,
+                }
+                for name, entry in self._entries.items()
+            ]
+            return {
+                "budget_bytes": self.budget_bytes,
+                "used_bytes": sum(model["memory_bytes"] for model in models),
+                "evictions": self._evictions,
+                "models": models,
+            }
+
+
+model_registry = ModelRegistry(budget_bytes=int(MODEL_RAM_BUDGET_MB * 2**20))
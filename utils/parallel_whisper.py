@@ -0,0 +1,156 @@
+import os
+import time
+import threading
+import multiprocessing
+import numpy as np
+import torch
+import whisper
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+from utils.whisper import load_transcription_model
+
+SAMPLE_RATE = 16000
+
+# One Whisper model per worker process, loaded by the pool initializer
+_worker_model = None
+
+_pool = None
+_pool_config = None
+_pool_lock = threading.Lock()
+
+
+#==========================SILENCE-AWARE SPLITTING==========================
+def find_silence_cuts(
+    audio: np.ndarray,
+    chunk_seconds: float = 300,
+    search_seconds: float = 10,
+    frame_ms: int = 30,
+) -> List[int]:
+    """
+    Pick split points roughly every `chunk_seconds`, snapped to the quietest frame nearby.
+
+    Args:
+        audio: 16 kHz mono float32 samples
+        chunk_seconds: Target chunk length
+        search_seconds: How far around each target position to look for silence
+        frame_ms: Frame length used for the RMS energy
+
+    Returns:
+        Sample indices of the cuts, excluding 0 and len(audio)
+    """
+    frame = int(SAMPLE_RATE * frame_ms / 1000)
+    n_frames = len(audio) // frame
+    if n_frames == 0 or len(audio) <= chunk_seconds * SAMPLE_RATE:
+        return []
+
+    energy = np.sqrt(np.mean(audio[:n_frames * frame].reshape(n_frames, frame) ** 2, axis=1))
+    frames_per_chunk = int(chunk_seconds * 1000 / frame_ms)
+    search = int(search_seconds * 1000 / frame_ms)
+
+    cuts = []
+    for target in range(frames_per_chunk, n_frames - search, frames_per_chunk):
+        lo, hi = max(target - search, 0), min(target + search, n_frames)
+        quietest = lo + int(np.argmin(energy[lo:hi]))
+        cuts.append(quietest * frame + frame // 2)
+    return cuts
+#===========================================================================
+
+
+#==========================WORKER PROCESS==========================
+def _init_worker(model_name: str, threads: int) -> None:
+    global _worker_model
+    torch.set_num_threads(threads)
+    _worker_model = load_transcription_model(model_name, device="cpu", cpu_threads=threads)
+
+
+def _transcribe_chunk(audio: np.ndarray, offset: float, keep_start: float, keep_end: float) -> List[Dict[str, Any]]:
+    """
+    Transcribe one chunk and return the segments that belong to it, in absolute time.
+
+    Chunks overlap their neighbours; a segment is kept only by the chunk that owns its midpoint.
+    """
+    result = _worker_model.transcribe(audio, fp16=False)
+    segments = []
+    for seg in result["segments"]:
+        seg = dict(seg)
+        seg["start"] = seg["start"] + offset
+        seg["end"] = seg["end"] + offset
+        midpoint = (seg["start"] + seg["end"]) / 2
+        if keep_start <= midpoint < keep_end:
+            segments.append(seg)
+    return segments
+#==================================================================
+
+
+def _get_pool(model_name: str, workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_config
+    with _pool_lock:
+        if _pool is None or _pool_config != (model_name, workers):
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_name, threads),
+            )
+            _pool_config = (model_name, workers)
+        return _pool
+
+
+def shutdown_parallel_workers() -> None:
+    global _pool, _pool_config
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool, _pool_config = None, None
+
+
+def parallel_transcribe(
+    audio_path: str,
+    model_name: str,
+    workers: int,
+    chunk_seconds: float = 300,
+    overlap_seconds: float = 1.0,
+) -> Tuple[str, List[Dict[str, Any]], float]:
+    """
+    Transcribe an audio file by splitting it at silences and running the chunks in a process pool.
+
+    Args:
+        audio_path: Path to the audio file
+        model_name: Whisper model loaded by every worker
+        workers: Number of worker processes
+        chunk_seconds: Target chunk length
+        overlap_seconds: Extra audio given to each side of a chunk so words at the cut are not lost
+
+    Returns:
+        Same (transcript, segments, transcribe_time) tuple as a single model.transcribe() call
+    """
+    start = time.time()
+    audio = whisper.load_audio(audio_path)
+    duration = len(audio) / SAMPLE_RATE
+    bounds = [0] + find_silence_cuts(audio, chunk_seconds) + [len(audio)]
+
+    pool = _get_pool(model_name, workers)
+    futures = []
+    for begin, end in zip(bounds[:-1], bounds[1:]):
+        padded_begin = max(0, begin - int(overlap_seconds * SAMPLE_RATE))
+        padded_end = min(len(audio), end + int(overlap_seconds * SAMPLE_RATE))
+        keep_end = end / SAMPLE_RATE if end < len(audio) else duration + 1
+        futures.append(pool.submit(
+            _transcribe_chunk,
+            audio[padded_begin:padded_end],
+            padded_begin / SAMPLE_RATE,
+            begin / SAMPLE_RATE,
+            keep_end,
+        ))
+
+    segments = []
+    for future in futures:
+        segments.extend(future.result())
+    for index, seg in enumerate(segments):
+        seg["id"] = index
+
+    transcript = "".join(seg["text"] for seg in segments)
+    return transcript, segments, time.time() - start
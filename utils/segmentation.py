@@ -1,86 +1,80 @@
 import re
+import asyncio
 from models.podcast import HeadingSection
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterable
 from langchain_ollama import ChatOllama
 from langchain_ollama import ChatOllama
 from typing import Optional
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import SentenceTransformer
 from langchain_huggingface import HuggingFaceEmbeddings
 import torch
+import numpy as np
+from utils.model_registry import model_registry
 
-_Embedder = None
+# Models are shared through the model registry and loaded on first use
+_mini_llm_name = "tinyllama"
 
-_LLM = None
+_minilm_name = "all-MiniLM-L6-v2"
 
-_MiniLM = None
+_embedder_name = "all-MiniLM-L6-v2"
 #==========================INITIALIZE MODELS==========================
 def initialize_mini_llm(model_name: str = "tinyllama") -> None:
-    global _LLM
+    global _mini_llm_name
     try:
-        print(f"Loading Mini LLM model: {model_name}...")
-        _LLM = ChatOllama(model=model_name)
-        print("Mini LLM model loaded successfully.")
+        model_registry.get_or_load(f"mini_llm:{model_name}", lambda: ChatOllama(model=model_name))
+        _mini_llm_name = model_name
     except Exception as e:
         print(f"Error loading Mini LLM model: {e}")
         raise
 
 def get_mini_llm() -> Optional[ChatOllama]:
-    global _LLM
-    if _LLM is None:
-        raise ValueError("Mini LLM model not initialized. Call initialize_mini_llm() first.")
-    return _LLM
+    model_name = _mini_llm_name
+    return model_registry.get_or_load(f"mini_llm:{model_name}", lambda: ChatOllama(model=model_name))
 
 def initialize_miniLM(model_name: str = "all-MiniLM-L6-v2") -> None:
 
-    global _MiniLM
+    global _minilm_name
     try:
-        print(f"Loading MiniLM model: {model_name}...")
-        _MiniLM = SentenceTransformer(model_name)
-        print("MiniLM model loaded successfully.")
+        model_registry.get_or_load(f"minilm:{model_name}", lambda: SentenceTransformer(model_name))
+        _minilm_name = model_name
     except Exception as e:
         print(f"Error loading MiniLM model: {e}")
         raise
 
 def get_miniLM() -> Optional[SentenceTransformer]:
 
-    global _MiniLM
-    if _MiniLM is None:
-        raise ValueError("MiniLM model not initialized. Call initialize_miniLM() first.")
-    return _MiniLM
+    model_name = _minilm_name
+    return model_registry.get_or_load(f"minilm:{model_name}", lambda: SentenceTransformer(model_name))
 
-def initialize_embedder(model_name: str = "all-MiniLM-L6-v2") -> None:
-    global _Embedder
+def get_miniLM_name() -> str:
+    return _minilm_name
+
+def _load_embedder(model_name: str) -> HuggingFaceEmbeddings:
     device = "cuda" if torch.cuda.is_available() else "cpu"
+    return HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": device}
+    )
+
+def initialize_embedder(model_name: str = "all-MiniLM-L6-v2") -> None:
+    global _embedder_name
     try:
-        print(f"Loading Embedder model: {model_name}...")
-        _Embedder = HuggingFaceEmbeddings(
-            model_name=model_name,
-            model_kwargs={"device": device}
-        )
-        print("Embedder model loaded successfully.")
+        model_registry.get_or_load(f"embedder:{model_name}", lambda: _load_embedder(model_name))
+        _embedder_name = model_name
     except Exception as e:
         print(f"Error loading Embedder model: {e}")
         raise
 
 def get_embedder() -> Optional[HuggingFaceEmbeddings]:
-    global _Embedder
-    if _Embedder is None:
-        raise ValueError("Embedder model not initialized. Call initialize_embedder() first.")
-    return _Embedder
+    model_name = _embedder_name
+    return model_registry.get_or_load(f"embedder:{model_name}", lambda: _load_embedder(model_name))
 #=====================================================================
 
 
 #==========================UTILITY FUNCTIONS==========================
 
-def are_same_topic(sent1: str, sent2: str) -> bool:
-    """
-    check if two sentences are about the same topic using Mini LLM model.
-    - sent1: str - first sentence
-    - sent2: str - second sentence
-    """
-
-    
-    prompt = f"""
+def _same_topic_prompt(sent1: str, sent2: str) -> str:
+    return f"""
 Are the following two sentences about the same topic?
 
 Sentence 1: "{sent1}"
@@ -88,33 +82,45 @@ Sentence 2: "{sent2}"
 
 Answer with only "Yes" or "No".
 """
+
+
+def are_same_topic(sent1: str, sent2: str) -> bool:
+    """
+    check if two sentences are about the same topic using Mini LLM model.
+    - sent1: str - first sentence
+    - sent2: str - second sentence
+    """
     model = get_mini_llm()
-    response = model.invoke(input=prompt)
+    response = model.invoke(input=_same_topic_prompt(sent1, sent2))
 
 
     answer = response.content.strip().lower()
     return "yes" in answer
+
+
+async def are_same_topic_async(sent1: str, sent2: str) -> bool:
+    """
+    Async variant of are_same_topic, using the non-blocking ainvoke API.
+    """
+    model = get_mini_llm()
+    response = await model.ainvoke(input=_same_topic_prompt(sent1, sent2))
+    answer = response.content.strip().lower()
+    return "yes" in answer
 #======================================================================
 
 #==========================TRANSCRIPT SEGMENTATION===================
-def llm_topic_segmentation(segments: List[Dict[str, str]]) -> List[str]:
+def _build_topic_clusters(segments: List[Dict[str, str]], decisions: Iterable[bool]) -> List[str]:
     """
-    Cluster segments into topics based on their content.
-    - segments: List[Dict[str, str]] - list of segments with start, end, and text
-
-    OUTPUT:
-    - List[str] - list of formatted strings for each segment, each with start, end, and content.
+    Group segments into clusters given, for every segment, whether it continues the previous topic.
     """
-
     clusters, current_cluster = [], []
-    pre_transcript = segments[0]["text"].strip().replace("\n", " ")
     cur_start, cur_end = segments[0]["start"], segments[0]["end"]
 
-    for seg in segments:
+    for seg, same_topic in zip(segments, decisions):
         
         text = seg["text"].strip().replace("\n", " ")
 
-        if are_same_topic(pre_transcript, text):
+        if same_topic:
             current_cluster.append(text)
         else:
             joined = " ".join(current_cluster)
@@ -122,7 +128,6 @@ def llm_topic_segmentation(segments: List[Dict[str, str]]) -> List[str]:
             cur_start = seg["start"]
             current_cluster = [text]
         
-        pre_transcript = text
         cur_end = seg["end"]
         
     joined = " ".join(current_cluster)
@@ -130,14 +135,96 @@ def llm_topic_segmentation(segments: List[Dict[str, str]]) -> List[str]:
     return clusters
 
 
+def _topic_pairs(segments: List[Dict[str, str]]) -> List[Tuple[str, str]]:
+    """(previous text, text) for every segment; the first segment is compared with itself."""
+    texts = [seg["text"].strip().replace("\n", " ") for seg in segments]
+    return [(texts[i - 1] if i > 0 else texts[0], texts[i]) for i in range(len(texts))]
+
+
+def llm_topic_segmentation(segments: List[Dict[str, str]]) -> List[str]:
+    """
+    Cluster segments into topics based on their content.
+    - segments: List[Dict[str, str]] - list of segments with start, end, and text
+
+    OUTPUT:
+    - List[str] - list of formatted strings for each segment, each with start, end, and content.
+    """
+    decisions = (are_same_topic(prev, text) for prev, text in _topic_pairs(segments))
+    return _build_topic_clusters(segments, decisions)
+
+
+async def llm_topic_segmentation_async(
+    segments: List[Dict[str, str]],
+    max_concurrency: int = 8,
+    prefilter: bool = False,
+    same_threshold: float = 0.8,
+    different_threshold: float = 0.2
+) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Concurrent variant of llm_topic_segmentation.
+
+    Every pairwise check is independent, so they are issued through ainvoke with at most
+    `max_concurrency` in flight and the clusters are built afterwards in segment order. By default
+    the clusters are identical to llm_topic_segmentation for the same LLM answers.
+
+    prefilter=True trades that exactness for fewer LLM calls: adjacent segments are first compared
+    with MiniLM embeddings, pairs at or above `same_threshold` are treated as the same topic, pairs
+    at or below `different_threshold` as a topic change, and only the ambiguous pairs in between
+    are sent to the LLM. The embedding decisions can differ from what the LLM would have answered.
+
+    OUTPUT:
+    - List[str] - same clusters format as llm_topic_segmentation
+    - Dict[str, int] - pairs, llm_calls, llm_calls_avoided, prefilter_decisions, prefilter_same, prefilter_different
+    """
+    pairs = _topic_pairs(segments)
+    decisions: List[Optional[bool]] = [None] * len(pairs)
+    stats = {"pairs": len(pairs), "llm_calls": 0, "llm_calls_avoided": 0, "prefilter_decisions": 0, "prefilter_same": 0, "prefilter_different": 0}
+
+    if prefilter:
+        model = get_miniLM()
+        embeddings = model.encode([text for _, text in pairs], batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+        previous = np.vstack([embeddings[:1], embeddings[:-1]])
+        similarities = np.einsum("ij,ij->i", previous, embeddings)
+        for i, similarity in enumerate(similarities):
+            if similarity >= same_threshold:
+                decisions[i] = True
+                stats["prefilter_same"] += 1
+            elif similarity <= different_threshold:
+                decisions[i] = False
+                stats["prefilter_different"] += 1
+        stats["prefilter_decisions"] = stats["prefilter_same"] + stats["prefilter_different"]
+        print(
+            f"Topic prefilter decided {stats['prefilter_decisions']} of {len(pairs)} pairs without the LLM "
+            f"({stats['prefilter_same']} same, {stats['prefilter_different']} different)"
+        )
+
+    pending = [i for i, decision in enumerate(decisions) if decision is None]
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def decide(i: int) -> None:
+        async with semaphore:
+            decisions[i] = await are_same_topic_async(*pairs[i])
+
+    await asyncio.gather(*(decide(i) for i in pending))
+
+    stats["llm_calls"] = len(pending)
+    stats["llm_calls_avoided"] = len(pairs) - len(pending)
+    return _build_topic_clusters(segments, decisions), stats
+
+
 def minilm_topic_segmentation(
     segments: List[Dict[str, str]],
     window_size: int = 3,
-    threshold: float = 0.7
+    threshold: float = 0.7,
+    batch_size: int = 64
 ) -> List[str]:
     """
     Cluster segments into topics using MiniLM embeddings and cosine similarity between sliding windows.
 
+    Every segment is encoded once in a single batched call. A window embedding is the mean of its
+    segment embeddings (computed from a cumulative sum), and all boundary similarities are computed
+    in one vectorized cosine.
+
     OUTPUT:
     - List[str] - list of formatted strings for each segment, each with start, end, and content.
     """
@@ -146,25 +233,16 @@ def minilm_topic_segmentation(
                 " ".join(seg["text"].strip().replace("\n", " ") for seg in segments)]
 
     model = get_miniLM()
+    texts = [seg["text"].strip().replace("\n", " ") for seg in segments]
+    embeddings = model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+    similarities = window_similarities(embeddings, window_size)
+
     clusters = []
     current_cluster = [segments[0]]
     cur_start, cur_end = segments[0]["start"], segments[0]["end"]
 
     for i in range(1, len(segments) - window_size):
-        # Create sliding windows
-        prev_window = " ".join(segments[j]["text"].strip().replace("\n", " ")
-                               for j in range(i - window_size, i))
-        
-        next_window = " ".join(segments[j]["text"].strip().replace("\n", " ")
-                               for j in range(i, i + window_size))
-
-        # Encode windows
-        emb1 = model.encode(prev_window, convert_to_tensor=True)
-        emb2 = model.encode(next_window, convert_to_tensor=True)
-
-        similarity = util.cos_sim(emb1, emb2).item()
-
-        if similarity < threshold:
+        if similarities[i] < threshold:
             # End current cluster and start a new one
             formatted = f"[{cur_start} - {cur_end}]: " + " ".join(
                 seg["text"].strip().replace("\n", " ") for seg in current_cluster)
@@ -185,6 +263,37 @@ def minilm_topic_segmentation(
 
     return clusters
 
+
+def window_similarities(embeddings: np.ndarray, window_size: int) -> np.ndarray:
+    """
+    Cosine similarity between the window before and the window starting at every index.
+
+    - embeddings: np.ndarray - (N, D) segment embeddings
+    - window_size: int - number of segments per window
+
+    OUTPUT:
+    - np.ndarray - (N,) similarities; index i compares mean(emb[i-w:i]) with mean(emb[i:i+w]).
+      The previous window is truncated at the start of the episode and entries without a full
+      next window are NaN.
+    """
+    n = embeddings.shape[0]
+    cumsum = np.zeros((n + 1, embeddings.shape[1]), dtype=np.float64)
+    np.cumsum(embeddings, axis=0, out=cumsum[1:])
+
+    idx = np.arange(n)
+    prev_lo = np.maximum(idx - window_size, 0)
+    prev_count = np.maximum(idx - prev_lo, 1)[:, None]
+    prev_mean = (cumsum[idx] - cumsum[prev_lo]) / prev_count
+
+    next_hi = np.minimum(idx + window_size, n)
+    next_mean = (cumsum[next_hi] - cumsum[idx]) / window_size
+
+    dot = np.einsum("ij,ij->i", prev_mean, next_mean)
+    norms = np.linalg.norm(prev_mean, axis=1) * np.linalg.norm(next_mean, axis=1)
+    similarities = dot / np.maximum(norms, 1e-12)
+    similarities[idx + window_size > n] = np.nan
+    return similarities
+
 #=====================================================================
 
 
@@ -0,0 +1,175 @@
+import queue
+import subprocess
+import threading
+import numpy as np
+from typing import Any, Dict, Iterator, Optional
+from utils.downloader import http_session, DOWNLOAD_TIMEOUT_SECONDS
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2  # s16le
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+# ========================
+# Download -> ffmpeg -> PCM
+# ========================
+def stream_pcm_from_url(
+    audio_url: str,
+    tee_path: Optional[str] = None,
+    window_seconds: float = 30,
+    buffer_windows: int = 4,
+) -> Iterator[np.ndarray]:
+    """
+    Download an audio file and decode it to 16 kHz mono PCM while the download is still running.
+
+    ffmpeg's output is drained by a reader thread into a queue of up to `buffer_windows` windows,
+    so downloading and decoding continue while the consumer works on earlier windows (e.g. runs
+    Whisper on them) and only pause once that many windows are waiting.
+
+    Args:
+        audio_url: URL of the audio file
+        tee_path: Optional local path that receives a copy of the downloaded bytes
+        window_seconds: Length of each yielded window
+        buffer_windows: Decoded windows kept ready ahead of the consumer
+
+    Yields:
+        float32 arrays of at most `window_seconds` of audio, in order
+    """
+    process = subprocess.Popen(
+        ["ffmpeg", "-loglevel", "error", "-i", "pipe:0", "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    download_error = []
+    ffmpeg_errors = []
+    windows: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize=max(1, buffer_windows))
+    stop = threading.Event()
+
+    def feed() -> None:
+        tee = open(tee_path, 'wb') if tee_path else None
+        try:
+            with http_session.get(audio_url, stream=True, timeout=DOWNLOAD_TIMEOUT_SECONDS) as r:
+                r.raise_for_status()
+                for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if stop.is_set():
+                        break
+                    if tee:
+                        tee.write(chunk)
+                    try:
+                        process.stdin.write(chunk)
+                    except BrokenPipeError:
+                        # ffmpeg exited early; its exit code and stderr are reported instead
+                        break
+        except Exception as e:
+            download_error.append(e)
+        finally:
+            if tee:
+                tee.close()
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    def put(window: Optional[np.ndarray]) -> None:
+        while not stop.is_set():
+            try:
+                windows.put(window, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def read() -> None:
+        window_bytes = int(window_seconds * SAMPLE_RATE) * BYTES_PER_SAMPLE
+        try:
+            while True:
+                data = process.stdout.read(window_bytes)
+                if not data:
+                    break
+                data = data[:len(data) - len(data) % BYTES_PER_SAMPLE]
+                put(np.frombuffer(data, np.int16).astype(np.float32) / 32768.0)
+        finally:
+            put(None)
+
+    def read_errors() -> None:
+        ffmpeg_errors.append(process.stderr.read())
+
+    threads = [threading.Thread(target=target, daemon=True) for target in (feed, read, read_errors)]
+    for thread in threads:
+        thread.start()
+
+    finished = False
+    try:
+        while True:
+            window = windows.get()
+            if window is None:
+                break
+            yield window
+        finished = True
+    finally:
+        stop.set()
+        if not finished and process.poll() is None:
+            # The consumer stopped early: unblock the threads instead of finishing the download
+            process.kill()
+        for thread in threads:
+            thread.join()
+        process.stdout.close()
+        process.stderr.close()
+        process.wait()
+
+    if process.returncode != 0:
+        detail = b"".join(ffmpeg_errors).decode(errors="replace").strip()
+        message = f"ffmpeg exited with code {process.returncode}"
+        if detail:
+            message += f": {detail[-500:]}"
+        if download_error:
+            message += f" (download: {str(download_error[0])})"
+        raise RuntimeError(message)
+    if download_error:
+        raise RuntimeError(f"Streaming download failed: {str(download_error[0])}")
+
+
+# ========================
+# Incremental transcription
+# ========================
+def stream_transcribe(model: Any, windows: Iterator[np.ndarray]) -> Iterator[Dict[str, Any]]:
+    """
+    Transcribe consecutive PCM windows and yield Whisper segments with absolute timestamps.
+
+    The last segment of a window may be cut mid-sentence, so its audio is carried over and
+    re-transcribed at the start of the next window instead of being yielded.
+    """
+    carry = np.zeros(0, dtype=np.float32)
+    offset = 0.0
+    next_id = 0
+    prompt = None
+
+    windows = iter(windows)
+    window = next(windows, None)
+    while window is not None:
+        audio = np.concatenate([carry, window]) if carry.size else window
+
+        result = model.transcribe(audio, initial_prompt=prompt)
+        segments = result["segments"]
+        # Only needed to decide whether to carry the last segment; it was decoded during transcription
+        following = next(windows, None)
+
+        keep = segments
+        carry = np.zeros(0, dtype=np.float32)
+        if following is not None and len(segments) > 1:
+            keep = segments[:-1]
+            cut = int(segments[-1]["start"] * SAMPLE_RATE)
+            carry = audio[cut:]
+
+        for seg in keep:
+            seg = dict(seg)
+            seg["id"] = next_id
+            seg["start"] = seg["start"] + offset
+            seg["end"] = seg["end"] + offset
+            next_id += 1
+            yield seg
+
+        if keep:
+            prompt = " ".join(seg["text"].strip() for seg in keep)[-200:]
+        offset += (audio.size - carry.size) / SAMPLE_RATE
+        window = following
@@ -0,0 +1,26 @@
+import tiktoken
+from functools import lru_cache
+from typing import Optional
+
+# Rough average for English/Vietnamese text with GPT-4o tokenizers, used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str) -> Optional["tiktoken.Encoding"]:
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # tiktoken downloads its BPE files on first use; offline nodes fall back to an estimate
+        print(f"Tokenizer for {model} unavailable, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Count tokens locally with the tokenizer of the given OpenAI model."""
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(encoding.encode(text, disallowed_special=()))
@@ -0,0 +1,106 @@
+import os
+import threading
+from typing import Tuple
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within the process
+    fcntl = None
+
+
+class MemmapVectorIndex:
+    """
+    Append-only float32 matrix on disk, read through a memory map.
+
+    Rows are only ever appended, so a row index stays valid forever and can be stored in the
+    database. Vectors are expected to be L2-normalized, which makes the dot product the cosine
+    similarity. Searches only touch the requested rows, so filtering by user is a row subset.
+
+    Args:
+        path: File holding the raw row-major float32 matrix
+        dim: Number of columns (embedding size)
+    """
+
+    def __init__(self, path: str, dim: int):
+        self.path = path
+        self.dim = dim
+        self.row_bytes = dim * np.dtype(np.float32).itemsize
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._mapped_size = -1
+
+    def __len__(self) -> int:
+        return os.path.getsize(self.path) // self.row_bytes if os.path.exists(self.path) else 0
+
+    def append(self, vectors: np.ndarray) -> int:
+        """
+        Append rows to the file.
+
+        Returns:
+            Row index of the first appended vector
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock, open(self.path, "ab") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                if size % self.row_bytes:
+                    # A previous append was interrupted; drop the partial row
+                    f.truncate(size - size % self.row_bytes)
+                    size -= size % self.row_bytes
+                f.write(vectors.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        return size // self.row_bytes
+
+    def matrix(self) -> np.ndarray:
+        """Read-only (rows, dim) view of the file, remapped when it has grown."""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        size -= size % self.row_bytes
+        with self._lock:
+            if size != self._mapped_size:
+                self._matrix = (
+                    np.memmap(self.path, dtype=np.float32, mode="r", shape=(size // self.row_bytes, self.dim))
+                    if size else np.empty((0, self.dim), dtype=np.float32)
+                )
+                self._mapped_size = size
+            return self._matrix
+
+    def search(self, query: np.ndarray, rows: np.ndarray, k: int, chunk_rows: int = 65536) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k rows among `rows` by dot product with `query`.
+
+        Rows are scored in chunks so memory stays bounded for large subsets.
+
+        Returns:
+            (row indices, scores), best first
+        """
+        matrix = self.matrix()
+        rows = rows[rows < matrix.shape[0]]
+        if not len(rows) or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, len(rows), chunk_rows):
+            chunk = rows[start:start + chunk_rows]
+            scores = matrix[chunk] @ query
+            if len(scores) > k:
+                top = np.argpartition(scores, -k)[-k:]
+                chunk, scores = chunk[top], scores[top]
+            best_rows = np.concatenate([best_rows, chunk])
+            best_scores = np.concatenate([best_scores, scores])
+            if len(best_scores) > k:
+                top = np.argpartition(best_scores, -k)[-k:]
+                best_rows, best_scores = best_rows[top], best_scores[top]
+
+        order = np.argsort(-best_scores)
+        return best_rows[order], best_scores[order]
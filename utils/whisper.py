@@ -1,11 +1,89 @@
 import os
-import time
 import whisper
 from typing import Dict, Any, Optional, Tuple
 import torch
+from utils.model_registry import model_registry
 
-# Global variable to store the loaded model
-_whisper_model = None
+# Name of the model used by get_whisper_model(); the model itself lives in the model registry
+DEFAULT_WHISPER_MODEL = os.getenv("WHISPER_MODEL", "tiny")
+# openai-whisper (PyTorch, float32 on CPU) or faster-whisper (CTranslate2, quantized)
+WHISPER_BACKEND = os.getenv("WHISPER_BACKEND", "openai-whisper").lower()
+# CTranslate2 compute type for faster-whisper: int8, int8_float32, float32, float16 (GPU)...
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", 0))
+WHISPER_BACKENDS = ("openai-whisper", "faster-whisper")
+_whisper_model_name = None
+
+
+def _resident_bytes() -> int:
+    """Resident set size of this process (Linux only, 0 elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class FasterWhisperModel:
+    """
+    faster-whisper model behind the openai-whisper `transcribe()` interface.
+
+    Returns the same {"text", "segments", "language"} result with the same segment keys, so
+    the single, parallel and streaming transcription paths work with either backend.
+    """
+
+    def __init__(self, model_name: str, device: str = "cpu", compute_type: str = WHISPER_COMPUTE_TYPE, cpu_threads: int = WHISPER_CPU_THREADS):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise RuntimeError("WHISPER_BACKEND=faster-whisper needs the faster-whisper package (pip install faster-whisper)")
+        before = _resident_bytes()
+        self.model = WhisperModel(model_name, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+        # CTranslate2 weights are not torch tensors, so the registry cannot size them itself
+        self.memory_bytes = max(_resident_bytes() - before, 0)
+
+    def transcribe(self, audio: Any, initial_prompt: Optional[str] = None, fp16: Optional[bool] = None, **kwargs) -> Dict[str, Any]:
+        # Greedy decoding with temperature fallback, like openai-whisper's transcribe() defaults
+        kwargs.setdefault("beam_size", 1)
+        segments, info = self.model.transcribe(audio, initial_prompt=initial_prompt, **kwargs)
+        result_segments = [
+            {
+                "id": index,
+                "seek": segment.seek,
+                "start": float(segment.start),
+                "end": float(segment.end),
+                "text": segment.text,
+                "tokens": list(segment.tokens),
+                "temperature": segment.temperature,
+                "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob,
+            }
+            # segments is a generator: decoding happens while iterating
+            for index, segment in enumerate(segments)
+        ]
+        return {
+            "text": "".join(segment["text"] for segment in result_segments),
+            "segments": result_segments,
+            "language": info.language,
+        }
+
+
+def load_transcription_model(model_name: str, backend: str = WHISPER_BACKEND, device: Optional[str] = None, cpu_threads: int = WHISPER_CPU_THREADS) -> Any:
+    """Load a Whisper model with the given backend; both expose openai-whisper's transcribe()."""
+    if backend not in WHISPER_BACKENDS:
+        raise ValueError(f"Unknown WHISPER_BACKEND '{backend}', expected one of {', '.join(WHISPER_BACKENDS)}")
+    device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+    if backend == "faster-whisper":
+        return FasterWhisperModel(model_name, device=device, cpu_threads=cpu_threads)
+    return whisper.load_model(model_name, device=device)
+
+
+def _registry_name(model_name: str) -> str:
+    return f"whisper:{model_name}" if WHISPER_BACKEND == "openai-whisper" else f"{WHISPER_BACKEND}:{model_name}"
+
+def _load_whisper_model(model_name: str) -> Any:
+    return load_transcription_model(model_name)
 
 def initialize_whisper_model(model_name: str = "base") -> None:
     """
@@ -14,24 +92,29 @@ def initialize_whisper_model(model_name: str = "base") -> None:
     Args:
         model_name: The name of the Whisper model to load (default: "base")
     """
-    global _whisper_model
-    device = "cuda" if torch.cuda.is_available() else "cpu"
+    global _whisper_model_name
     try:
-        print(f"Loading Whisper model: {model_name}...")
-        start_time = time.time()
-        _whisper_model = whisper.load_model(model_name, device=device)
-        end_time = time.time()
-        print(f"Whisper model loaded in {end_time - start_time:.2f} seconds")
+        model_registry.get_or_load(_registry_name(model_name), lambda: _load_whisper_model(model_name))
+        _whisper_model_name = model_name
     except Exception as e:
         print(f"Error loading Whisper model: {e}")
         raise
 
 def get_whisper_model() -> Optional[Any]:
     """
-    Get the loaded Whisper model.
+    Get the Whisper model, loading it on first use.
     
     Returns:
-        The loaded Whisper model or None if not initialized
+        The Whisper model selected by initialize_whisper_model (or WHISPER_MODEL)
     """
-    return _whisper_model
+    model_name = get_whisper_model_name()
+    return model_registry.get_or_load(_registry_name(model_name), lambda: _load_whisper_model(model_name))
 
+def get_whisper_model_name() -> str:
+    """
+    Get the name of the Whisper model in use.
+
+    Returns:
+        The model name passed to initialize_whisper_model, or WHISPER_MODEL if not initialized
+    """
+    return _whisper_model_name or DEFAULT_WHISPER_MODEL
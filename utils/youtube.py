@@ -1,21 +1,49 @@
 import os
+import time
+import threading
 from urllib.parse import urlparse, parse_qs
-from typing import Tuple
+from typing import Any, Dict, Tuple, Optional
 from yt_dlp import YoutubeDL
 
+# native: keep the downloaded container (Opus/AAC), pcm16k: decode to 16 kHz mono WAV, mp3: legacy 192 kbps MP3
+YOUTUBE_AUDIO_MODE = os.getenv("YOUTUBE_AUDIO_MODE", "native").lower()
+# Smallest audio-only stream at or above this bitrate is downloaded (kbps); speech needs far less than bestaudio
+YOUTUBE_AUDIO_MIN_ABR = int(os.getenv("YOUTUBE_AUDIO_MIN_ABR", "32"))
+# Typical libmp3lame speed (x realtime) at 192 kbps, used to estimate the encode time a fast path skips
+MP3_ENCODE_SPEED = 60.0
+AUDIO_MODES = ("native", "pcm16k", "mp3")
+
+_download_stats = {"downloads": 0, "bytes_downloaded": 0, "bytes_saved": 0, "seconds_saved": 0.0, "postprocess_seconds": 0.0}
+_download_stats_lock = threading.Lock()
+
 
 # ========================
-# Get YouTube Thumbnail URL
+# Extract YouTube video id
 # ========================
-def get_youtube_thumbnail_url(video_url: str) -> str:
+def extract_youtube_video_id(video_url: str) -> Optional[str]:
     parsed_url = urlparse(video_url)
-    video_id = None
+    hostname = (parsed_url.hostname or "").lower()
 
-    if parsed_url.hostname in ["www.youtube.com", "youtube.com"]:
+    if hostname in ["www.youtube.com", "youtube.com", "m.youtube.com", "music.youtube.com"]:
         query = parse_qs(parsed_url.query)
         video_id = query.get("v", [None])[0]
-    elif parsed_url.hostname == "youtu.be":
-        video_id = parsed_url.path.lstrip("/")
+        if video_id:
+            return video_id
+        # /shorts/<id>, /embed/<id>, /live/<id>
+        parts = [part for part in parsed_url.path.split("/") if part]
+        if len(parts) >= 2 and parts[0] in ["shorts", "embed", "live", "v"]:
+            return parts[1]
+    elif hostname == "youtu.be":
+        return parsed_url.path.lstrip("/").split("/")[0] or None
+
+    return None
+
+
+# ========================
+# Get YouTube Thumbnail URL
+# ========================
+def get_youtube_thumbnail_url(video_url: str) -> str:
+    video_id = extract_youtube_video_id(video_url)
 
     if video_id:
         return f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
@@ -26,31 +54,122 @@ def get_youtube_thumbnail_url(video_url: str) -> str:
 # ========================
 # Download YouTube video
 # ========================
-def download_single_youtube_video(video_url: str, output_path: str, file_name: str) -> Tuple[str, str, str]:
+def youtube_download_options(target_path: str, mode: str = YOUTUBE_AUDIO_MODE) -> Dict[str, Any]:
+    """yt-dlp options for one audio mode (see YOUTUBE_AUDIO_MODE)."""
+    if mode not in AUDIO_MODES:
+        raise ValueError(f"Unknown YOUTUBE_AUDIO_MODE '{mode}', expected one of {', '.join(AUDIO_MODES)}")
+
+    ydl_opts = {
+        'outtmpl': target_path,
+        'ignoreerrors': True,
+        'no_warnings': True,
+    }
+    if mode == 'mp3':
+        ydl_opts['format'] = 'bestaudio/best'
+        ydl_opts['postprocessors'] = [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'mp3',
+            'preferredquality': '192',
+        }]
+        return ydl_opts
+
+    # Lowest-bitrate audio-only stream that is still good enough for Whisper (unknown bitrates allowed)
+    ydl_opts['format'] = f'bestaudio[abr>=?{YOUTUBE_AUDIO_MIN_ABR}]/bestaudio/best'
+    ydl_opts['format_sort'] = ['+abr', '+size']
+    if mode == 'pcm16k':
+        # Whisper's own input format: nothing left to resample when it loads the file
+        ydl_opts['postprocessors'] = [{'key': 'FFmpegExtractAudio', 'preferredcodec': 'wav'}]
+        ydl_opts['postprocessor_args'] = {'extractaudio': ['-ar', '16000', '-ac', '1']}
+    return ydl_opts
+
+
+def _largest_audio_size(info: Dict[str, Any]) -> int:
+    """Size of the biggest audio-only format, i.e. what `bestaudio` would have downloaded."""
+    sizes = [
+        f.get('filesize') or f.get('filesize_approx') or 0
+        for f in info.get('formats') or []
+        if f.get('vcodec') == 'none'
+    ]
+    return int(max(sizes, default=0))
+
+
+def _downloaded_path(info: Dict[str, Any], output_path: str, file_name: str, mode: str) -> str:
+    downloads = info.get('requested_downloads') or []
+    if downloads and downloads[0].get('filepath'):
+        return downloads[0]['filepath']
+    ext = {'mp3': 'mp3', 'pcm16k': 'wav'}.get(mode) or info.get('ext') or 'webm'
+    return os.path.join(output_path, f"{file_name}.{ext}")
+
+
+def download_single_youtube_video(video_url: str, output_path: str, file_name: str) -> Tuple[str, str, str, str]:
     try:
         os.makedirs(output_path, exist_ok=True)
 
         target_path = os.path.join(output_path, file_name + '.%(ext)s')
+        mode = YOUTUBE_AUDIO_MODE
+        ydl_opts = youtube_download_options(target_path, mode)
+
+        downloaded = {"bytes": 0, "seconds": 0.0, "postprocess_seconds": 0.0}
+        postprocess_started = {}
+
+        def on_progress(d):
+            if d.get('status') == 'finished':
+                downloaded["bytes"] += d.get('total_bytes') or d.get('downloaded_bytes') or 0
+                downloaded["seconds"] += d.get('elapsed') or 0.0
 
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'outtmpl': target_path,
-            'ignoreerrors': True,
-            'no_warnings': True,
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }],
-        }
+        def on_postprocess(d):
+            if d.get('status') == 'started':
+                postprocess_started[d.get('postprocessor')] = time.perf_counter()
+            elif d.get('status') == 'finished' and d.get('postprocessor') in postprocess_started:
+                downloaded["postprocess_seconds"] += time.perf_counter() - postprocess_started.pop(d.get('postprocessor'))
+
+        ydl_opts['progress_hooks'] = [on_progress]
+        ydl_opts['postprocessor_hooks'] = [on_postprocess]
 
         with YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(video_url, download=True)
             if not info:
                 raise RuntimeError("Failed to extract video info.")
             title = info.get('title') or file_name
-            video_path = os.path.join(output_path, f"{file_name}.mp3")
+            video_path = _downloaded_path(info, output_path, file_name, mode)
             thumbnail_url = get_youtube_thumbnail_url(video_url)
-            return video_path, thumbnail_url, title, 'youtube'
+
+        _record_download(info, mode, downloaded)
+        return video_path, thumbnail_url, title, 'youtube'
     except Exception as e:
         raise RuntimeError(f"Download from YouTube failed: {str(e)}")
+
+
+def _record_download(info: Dict[str, Any], mode: str, downloaded: Dict[str, float]) -> None:
+    """Log and accumulate what the fast path saved compared to bestaudio + MP3 encoding."""
+    bytes_saved = seconds_saved = 0.0
+    if mode != 'mp3':
+        bytes_saved = max(_largest_audio_size(info) - downloaded["bytes"], 0)
+        if downloaded["bytes"] and downloaded["seconds"]:
+            # At this download's throughput, the bigger stream would have taken that much longer
+            seconds_saved += bytes_saved / (downloaded["bytes"] / downloaded["seconds"])
+        seconds_saved += (info.get('duration') or 0) / MP3_ENCODE_SPEED - downloaded["postprocess_seconds"]
+        seconds_saved = max(seconds_saved, 0.0)
+
+    print(
+        f"YouTube audio ({mode}, format {info.get('format_id')}, {info.get('abr') or '?'} kbps): "
+        f"downloaded {downloaded['bytes'] / 1e6:.2f} MB in {downloaded['seconds']:.1f}s, "
+        f"postprocessing {downloaded['postprocess_seconds']:.1f}s, "
+        f"saved ~{bytes_saved / 1e6:.2f} MB and ~{seconds_saved:.1f}s"
+    )
+    with _download_stats_lock:
+        _download_stats["downloads"] += 1
+        _download_stats["bytes_downloaded"] += int(downloaded["bytes"])
+        _download_stats["bytes_saved"] += int(bytes_saved)
+        _download_stats["seconds_saved"] += seconds_saved
+        _download_stats["postprocess_seconds"] += downloaded["postprocess_seconds"]
+
+
+def get_youtube_download_stats() -> Dict[str, Any]:
+    with _download_stats_lock:
+        stats = dict(_download_stats)
+    stats["mode"] = YOUTUBE_AUDIO_MODE
+    stats["min_abr_kbps"] = YOUTUBE_AUDIO_MIN_ABR
+    stats["seconds_saved"] = round(stats["seconds_saved"], 2)
+    stats["postprocess_seconds"] = round(stats["postprocess_seconds"], 2)
+    return stats